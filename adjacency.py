@@ -0,0 +1,210 @@
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from constants import ADJACENCY_TOLERANCE, DOOR_THICKNESS, DOOR_WIDTH
+
+if TYPE_CHECKING:
+    from models import Room
+
+
+class SharedWall(NamedTuple):
+    """
+    Trecho de parede compartilhado entre dois cômodos do mesmo andar.
+
+    Attributes:
+        room1 (int): Índice do cômodo à esquerda (parede vertical) ou acima (parede horizontal).
+        room2 (int): Índice do outro cômodo.
+        orientation (str): "vertical" (parede paralela ao eixo Y) ou "horizontal".
+        coordinate (float): Coordenada X (vertical) ou Y (horizontal) da parede.
+        start (float): Início do trecho compartilhado ao longo da parede.
+        end (float): Fim do trecho compartilhado ao longo da parede.
+    """
+
+    room1: int
+    room2: int
+    orientation: str
+    coordinate: float
+    start: float
+    end: float
+
+    @property
+    def length(self) -> float:
+        """Comprimento do trecho compartilhado."""
+        return self.end - self.start
+
+    def neighbor(self, index: int) -> int:
+        """Retorna o índice do cômodo do outro lado da parede."""
+        return self.room2 if index == self.room1 else self.room1
+
+
+def shared_wall_between(
+    room1: 'Room', room2: 'Room', tolerance: float = ADJACENCY_TOLERANCE
+) -> Optional[Tuple[str, float, float, float]]:
+    """
+    Calcula o trecho de parede compartilhado entre dois cômodos, com tolerância.
+
+    Args:
+        room1 (Room): Primeiro cômodo.
+        room2 (Room): Segundo cômodo.
+        tolerance (float): Distância máxima entre as paredes para considerá-las coincidentes.
+
+    Returns:
+        Optional[Tuple[str, float, float, float]]: Orientação, coordenada, início e fim do trecho
+            compartilhado, ou None se os cômodos não forem adjacentes.
+    """
+
+    if room1.floor != room2.floor:
+        return None
+
+    # Paredes verticais: direita de um cômodo contra a esquerda do outro
+    for left, right in ((room1, room2), (room2, room1)):
+        if abs(left.x + left.width - right.x) <= tolerance:
+            start = max(left.y, right.y)
+            end = min(left.y + left.length, right.y + right.length)
+            if end - start > tolerance:
+                return "vertical", (left.x + left.width + right.x) / 2, start, end
+
+    # Paredes horizontais: inferior de um cômodo contra a superior do outro
+    for top, bottom in ((room1, room2), (room2, room1)):
+        if abs(top.y + top.length - bottom.y) <= tolerance:
+            start = max(top.x, bottom.x)
+            end = min(top.x + top.width, bottom.x + bottom.width)
+            if end - start > tolerance:
+                return "horizontal", (top.y + top.length + bottom.y) / 2, start, end
+
+    return None
+
+
+def _sweep_walls(
+    rooms: Sequence['Room'], indices: List[int], orientation: str, tolerance: float
+) -> List[SharedWall]:
+    """
+    Encontra as paredes compartilhadas de uma orientação em um andar usando arestas ordenadas.
+
+    As arestas "de entrada" (esquerda/superior) são ordenadas pela coordenada; para cada aresta
+    "de saída" (direita/inferior), uma busca binária localiza apenas as arestas dentro da
+    tolerância, evitando a comparação de todos os pares.
+
+    Args:
+        rooms (Sequence[Room]): Todos os cômodos da planta.
+        indices (List[int]): Índices dos cômodos do andar.
+        orientation (str): "vertical" ou "horizontal".
+        tolerance (float): Tolerância de coincidência das paredes.
+
+    Returns:
+        List[SharedWall]: Paredes compartilhadas encontradas.
+    """
+
+    if orientation == "vertical":
+        def near(room: 'Room') -> float:
+            return room.x
+
+        def far(room: 'Room') -> float:
+            return room.x + room.width
+
+        def span(room: 'Room') -> Tuple[float, float]:
+            return room.y, room.y + room.length
+    else:
+        def near(room: 'Room') -> float:
+            return room.y
+
+        def far(room: 'Room') -> float:
+            return room.y + room.length
+
+        def span(room: 'Room') -> Tuple[float, float]:
+            return room.x, room.x + room.width
+
+    near_edges = sorted((near(rooms[i]), i) for i in indices)
+    near_coordinates = [coordinate for coordinate, _ in near_edges]
+
+    walls = []
+    for i in indices:
+        coordinate = far(rooms[i])
+        span_start, span_end = span(rooms[i])
+        low = bisect_left(near_coordinates, coordinate - tolerance)
+        high = bisect_right(near_coordinates, coordinate + tolerance)
+        for other_coordinate, j in near_edges[low:high]:
+            if j == i:
+                continue
+            other_start, other_end = span(rooms[j])
+            start = max(span_start, other_start)
+            end = min(span_end, other_end)
+            if end - start > tolerance:
+                walls.append(SharedWall(i, j, orientation, (coordinate + other_coordinate) / 2, start, end))
+
+    return walls
+
+
+def find_shared_walls(rooms: Sequence['Room'], tolerance: float = ADJACENCY_TOLERANCE) -> List[SharedWall]:
+    """
+    Encontra todas as paredes compartilhadas entre os cômodos, andar por andar, em O(n log n)
+    (mais o número de paredes encontradas).
+
+    Args:
+        rooms (Sequence[Room]): Cômodos da planta.
+        tolerance (float): Tolerância de coincidência das paredes.
+
+    Returns:
+        List[SharedWall]: Paredes compartilhadas, cada par de cômodos aparecendo uma única vez
+            por orientação.
+    """
+
+    floors: Dict[int, List[int]] = {}
+    for index, room in enumerate(rooms):
+        floors.setdefault(room.floor, []).append(index)
+
+    walls = []
+    for indices in floors.values():
+        walls.extend(_sweep_walls(rooms, indices, "vertical", tolerance))
+        walls.extend(_sweep_walls(rooms, indices, "horizontal", tolerance))
+
+    return walls
+
+
+def adjacency_graph(rooms: Sequence['Room'], tolerance: float = ADJACENCY_TOLERANCE) -> Dict[int, List[SharedWall]]:
+    """
+    Monta o grafo de adjacência dos cômodos (cômodos como vértices, paredes compartilhadas como arestas).
+
+    Args:
+        rooms (Sequence[Room]): Cômodos da planta.
+        tolerance (float): Tolerância de coincidência das paredes.
+
+    Returns:
+        Dict[int, List[SharedWall]]: Para cada índice de cômodo, as paredes que ele compartilha.
+    """
+
+    graph: Dict[int, List[SharedWall]] = {index: [] for index in range(len(rooms))}
+    for wall in find_shared_walls(rooms, tolerance):
+        graph[wall.room1].append(wall)
+        graph[wall.room2].append(wall)
+
+    return graph
+
+
+def door_position(
+    orientation: str, coordinate: float, start: float, end: float,
+    door_width: float = DOOR_WIDTH, thickness: float = DOOR_THICKNESS
+) -> Optional[Tuple[float, float, float, float]]:
+    """
+    Posiciona uma porta centralizada no trecho de parede compartilhado.
+
+    Args:
+        orientation (str): "vertical" ou "horizontal".
+        coordinate (float): Coordenada da parede.
+        start (float): Início do trecho compartilhado.
+        end (float): Fim do trecho compartilhado.
+        door_width (float): Largura da porta.
+        thickness (float): Espessura da porta.
+
+    Returns:
+        Optional[Tuple[float, float, float, float]]: Posição e dimensões da porta, ou None se o
+            trecho for menor que a porta.
+    """
+
+    if end - start < door_width:
+        return None
+
+    offset = (start + end) / 2 - door_width / 2
+    if orientation == "vertical":
+        return (coordinate, offset, thickness, door_width)
+    return (offset, coordinate, door_width, thickness)
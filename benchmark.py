@@ -0,0 +1,199 @@
+import argparse
+import math
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from differential import reference_graph_edges, reference_overlaps
+from diversity import distance_matrix
+from fitness import PlanGraph
+from genetic_algorithm import crossover
+from models import FloorPlan
+from profiles import EvaluationProfile, default_profile, house_type_label, load_profile, program_rooms
+from spatial_index import MIN_INDEXED_ROOMS
+from surrogate import plan_features
+
+# Cômodos por unidade dos programas gerados: quartos, banheiros e closets (mais cozinha, salas e área de serviço)
+UNIT_COUNTS = (3, 2, 1)
+
+# Cômodos por andar dos programas gerados
+ROOMS_PER_FLOOR = 40
+
+# Folga da área de cada andar sobre a área média dos cômodos que ele recebe
+AREA_SLACK = 1.6
+
+# Expoente de crescimento (tempo ~ cômodos^expoente) acima do qual uma etapa é considerada quadrática
+QUADRATIC_EXPONENT = 1.8
+
+
+def scaled_program(rooms: int, profile: EvaluationProfile) -> Tuple[float, Tuple[str, str, int, int, int]]:
+    """
+    Monta um programa de edifício com cerca de `rooms` cômodos: unidades de UNIT_COUNTS, um andar
+    a cada ROOMS_PER_FLOOR cômodos e área por andar suficiente para os cômodos com folga.
+
+    Args:
+        rooms (int): Número aproximado de cômodos.
+        profile (EvaluationProfile): Perfil (faixas de área dos cômodos).
+
+    Returns:
+        Tuple[float, Tuple[str, str, int, int, int]]: Área por andar e o programa.
+    """
+
+    bedrooms, bathrooms, closets = UNIT_COUNTS
+    units = max(round(rooms / (4 + bedrooms + bathrooms + closets)), 1)
+    floors = max(math.ceil(rooms / ROOMS_PER_FLOOR), 1)
+    program = (house_type_label(floors, units), "Escritório", bedrooms, bathrooms, closets)
+
+    room_area = sum(
+        quantity * sum(profile.room_ranges.get(room_type, (6, 10))) / 2
+        for room_type, quantity in program_rooms(*program).items()
+    )
+    return room_area * AREA_SLACK / floors, program
+
+
+def _timed(function: Callable[..., object], arguments: Sequence[tuple]) -> float:
+    """
+    Mede o tempo médio de uma função sobre vários argumentos.
+
+    Args:
+        function (Callable[..., object]): A função.
+        arguments (Sequence[tuple]): Argumentos de cada execução.
+
+    Returns:
+        float: Tempo médio por execução, em segundos.
+    """
+
+    start = time.perf_counter()
+    for argument in arguments:
+        function(*argument)
+    return (time.perf_counter() - start) / len(arguments)
+
+
+def measure(rooms: int, repeats: int = 5) -> Dict[str, float]:
+    """
+    Mede as etapas do motor em plantas de um programa com cerca de `rooms` cômodos: geração,
+    contagem de sobreposições (motor e referência com todos os pares), avaliação completa
+    (sobreposições, grafo de cômodos, separação de áreas e circulação), grafo do modo discreto
+    (motor e referência), cruzamento com reparo e, sobre o lote de plantas, as características do
+    modelo substituto e a matriz de distâncias da diversidade.
+
+    Args:
+        rooms (int): Número aproximado de cômodos.
+        repeats (int): Plantas (e execuções) por etapa.
+
+    Returns:
+        Dict[str, float]: Cômodos gerados e o tempo médio, em segundos, de cada etapa.
+    """
+
+    profile = default_profile()
+    area, program = scaled_program(rooms, profile)
+    discrete = load_profile(None, {"module": 0.5})
+
+    plans: List[FloorPlan] = []
+    generation = _timed(lambda: plans.append(FloorPlan(area, "norte", *program, evaluate=False)), [()] * repeats)
+    discrete_plans = [FloorPlan(area, "norte", *program, profile=discrete, evaluate=False) for _ in range(repeats)]
+
+    # Desloca alguns cômodos, para que também haja sobreposições a contar e separar
+    for plan in plans:
+        for room in random.sample(plan.rooms, len(plan.rooms) // 10):
+            room.x = random.uniform(0, plan.house_width - room.width)
+            room.y = random.uniform(0, plan.house_length - room.length)
+
+    single, discrete_single = [(plan,) for plan in plans], [(plan,) for plan in discrete_plans]
+    return {
+        "rooms": sum(len(plan.rooms) for plan in plans) / len(plans),
+        "generation": generation,
+        "overlaps": _timed(FloorPlan.count_overlaps, single),
+        "overlaps_reference": _timed(reference_overlaps, single),
+        "evaluation": _timed(FloorPlan.evaluate, single),
+        "graph_discrete": _timed(PlanGraph, discrete_single),
+        "graph_discrete_reference": _timed(reference_graph_edges, discrete_single),
+        "crossover": _timed(
+            lambda parent1, parent2: crossover(parent1, parent2, evaluate=False), list(zip(plans, plans[1:] + plans[:1]))
+        ),
+        "surrogate_features": _timed(plan_features, [(plans,)] * repeats),
+        "distance_matrix": _timed(distance_matrix, [(plans,)] * repeats),
+    }
+
+
+def growth_exponent(sizes: Sequence[float], seconds: Sequence[float]) -> float:
+    """
+    Estima o expoente de crescimento (tempo ~ tamanho^expoente) pela regressão em escala log-log.
+
+    Args:
+        sizes (Sequence[float]): Tamanhos medidos (número de cômodos).
+        seconds (Sequence[float]): Tempo de cada tamanho.
+
+    Returns:
+        float: O expoente (1 para crescimento linear, 2 para quadrático).
+    """
+
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(value, 1e-9)) for value in seconds]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if variance == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+
+def print_report(results: List[Dict[str, float]]) -> Dict[str, float]:
+    """
+    Exibe o tempo de cada etapa por tamanho de programa e o expoente de crescimento.
+
+    Args:
+        results (List[Dict[str, float]]): Resultados de measure, em ordem crescente de tamanho.
+
+    Returns:
+        Dict[str, float]: Expoente de crescimento de cada etapa.
+    """
+
+    stages = [key for key in results[0] if key != "rooms"]
+    sizes = [result["rooms"] for result in results]
+    print(f"{'etapa':<32}" + "".join(f"{size:>10.0f}" for size in sizes) + f"{'expoente':>10}")
+
+    exponents = {}
+    for stage in stages:
+        exponents[stage] = growth_exponent(sizes, [result[stage] for result in results])
+        times = "".join(f"{result[stage] * 1000:>10.1f}" for result in results)
+        print(f"{stage + ' (ms)':<32}{times}{exponents[stage]:>10.2f}")
+
+    return exponents
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Ponto de entrada: mede as etapas do motor em programas de tamanho crescente, até `--comodos`,
+    e retorna 1 se alguma etapa do motor (as referências não contam) crescer de forma quadrática.
+
+    Args:
+        argv (Optional[List[str]]): Argumentos da linha de comando (por padrão, os de sys.argv).
+
+    Returns:
+        int: Código de saída.
+    """
+
+    parser = argparse.ArgumentParser(description="Mede como o motor escala com o número de cômodos do programa.")
+    parser.add_argument("--comodos", type=int, default=200, help="Maior programa medido, em cômodos (padrão: 200).")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Plantas por etapa e tamanho (padrão: 5).")
+    parser.add_argument("--semente", type=int, help="Semente aleatória.")
+    args = parser.parse_args(argv)
+
+    random.seed(args.semente)
+    # Os tamanhos menores ficam acima de MIN_INDEXED_ROOMS, onde os pares passam a vir do índice espacial
+    sizes = [max(args.comodos // 4, MIN_INDEXED_ROOMS), max(args.comodos // 2, MIN_INDEXED_ROOMS), args.comodos]
+    results = [measure(size, args.repeticoes) for size in sizes]
+    exponents = print_report(results)
+
+    quadratic = [
+        stage for stage, exponent in exponents.items()
+        if not stage.endswith("_reference") and exponent >= QUADRATIC_EXPONENT
+    ]
+    if quadratic:
+        print(f"Crescimento quadrático: {', '.join(quadratic)}")
+    return 1 if quadratic else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
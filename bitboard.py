@@ -0,0 +1,262 @@
+from typing import TYPE_CHECKING, List, Tuple
+
+from spatial_index import MIN_INDEXED_ROOMS
+
+if TYPE_CHECKING:
+    from models import Room
+
+# Geometria de um cômodo: posição X, posição Y, largura e comprimento
+Geometry = Tuple[float, float, float, float]
+
+# Retângulo em células: coluna inicial, coluna final, linha inicial e linha final (finais exclusivas)
+CellRectangle = Tuple[int, int, int, int]
+
+
+def _popcount_fallback(mask: int) -> int:
+    """
+    Conta os bits ligados de uma máscara (para versões do Python sem int.bit_count).
+
+    Args:
+        mask (int): A máscara.
+
+    Returns:
+        int: Número de células ocupadas.
+    """
+
+    return bin(mask).count("1")
+
+
+# Contagem nativa (Python 3.10+), com a contagem por texto como alternativa
+popcount = int.bit_count if hasattr(int, "bit_count") else _popcount_fallback
+
+
+def count_overlapping(rectangles: List[CellRectangle]) -> int:
+    """
+    Conta os pares de retângulos (em células) com células em comum: todos os pares com poucos
+    retângulos, ou uma varredura ao longo das colunas a partir de MIN_INDEXED_ROOMS.
+
+    Args:
+        rectangles (List[CellRectangle]): Os retângulos (a lista pode ser reordenada).
+
+    Returns:
+        int: Número de pares sobrepostos.
+    """
+
+    overlaps = 0
+    if len(rectangles) < MIN_INDEXED_ROOMS:
+        for index, (column, column_end, row, row_end) in enumerate(rectangles):
+            for other_column, other_column_end, other_row, other_row_end in rectangles[index + 1:]:
+                if (
+                    column < other_column_end and other_column < column_end and
+                    row < other_row_end and other_row < row_end
+                ):
+                    overlaps += 1
+        return overlaps
+
+    # Retângulos ativos: os que começam antes da coluna corrente e ainda não terminaram
+    rectangles.sort()
+    active: List[CellRectangle] = []
+    for rectangle in rectangles:
+        column, _, row, row_end = rectangle
+        active = [other for other in active if other[1] > column]
+        for _, _, other_row, other_row_end in active:
+            if row < other_row_end and other_row < row_end:
+                overlaps += 1
+        active.append(rectangle)
+    return overlaps
+
+
+def count_overlapping_with(rectangle: CellRectangle, rectangles: List[CellRectangle]) -> int:
+    """
+    Conta os retângulos (em células) com células em comum com um retângulo.
+
+    Args:
+        rectangle (CellRectangle): O retângulo.
+        rectangles (List[CellRectangle]): Os demais retângulos.
+
+    Returns:
+        int: Número de retângulos sobrepostos.
+    """
+
+    column, column_end, row, row_end = rectangle
+    return sum(
+        1 for other_column, other_column_end, other_row, other_row_end in rectangles
+        if column < other_column_end and other_column < column_end and row < other_row_end and other_row < row_end
+    )
+
+
+class Bitboard:
+    def __init__(self, width: float, length: float, module: float):
+        """
+        Grade discreta de um andar com ocupação em bitset: cada célula de `module` x `module`
+        metros é um bit de um inteiro Python (linha a linha, da origem para fora), de modo que
+        sobreposição vira um E bit a bit, área ocupada uma contagem de bits e adjacência um
+        teste com a máscara deslocada de uma célula.
+
+        Args:
+            width (float): Largura da casa.
+            length (float): Comprimento da casa.
+            module (float): Lado da célula (em metros).
+        """
+
+        self.module: float = module
+        self.columns: int = max(int(width / module + 1e-9), 1)
+        self.rows: int = max(int(length / module + 1e-9), 1)
+        self.full: int = (1 << (self.columns * self.rows)) - 1
+
+        # Máscaras da primeira e da última coluna, usadas para impedir que os deslocamentos
+        # horizontais passem de uma linha para a seguinte
+        first_column = 0
+        for row in range(self.rows):
+            first_column |= 1 << (row * self.columns)
+        self.not_first_column: int = self.full & ~first_column
+        self.not_last_column: int = self.full & ~(first_column << (self.columns - 1))
+
+    def snap(self, x: float, y: float, width: float, length: float) -> Geometry:
+        """
+        Encaixa um retângulo na grade arredondando cada uma das suas bordas para o múltiplo mais
+        próximo do módulo (cômodos que não se sobrepõem continuam sem se sobrepor). As bordas são
+        recortadas aos limites da grade, para que um cômodo junto à parede não passe do contorno
+        quando as dimensões da planta não são múltiplas do módulo. Dimensões nulas viram uma célula.
+
+        Args:
+            x (float): Posição X.
+            y (float): Posição Y.
+            width (float): Largura.
+            length (float): Comprimento.
+
+        Returns:
+            Geometry: Posição e dimensões encaixadas.
+        """
+
+        module, columns, rows = self.module, self.columns, self.rows
+        x_start = min(max(round(x / module), 0), columns - 1)
+        x_end = min(max(round((x + width) / module), 0), columns)
+        y_start = min(max(round(y / module), 0), rows - 1)
+        y_end = min(max(round((y + length) / module), 0), rows)
+
+        return (
+            x_start * module, y_start * module,
+            max(x_end - x_start, 1) * module, max(y_end - y_start, 1) * module,
+        )
+
+    def rectangle(self, room: 'Room') -> CellRectangle:
+        """
+        Converte a geometria de um cômodo já encaixado (ver snap, que o mantém dentro da grade e
+        com pelo menos uma célula) em um retângulo de células, sem recorte.
+
+        Args:
+            room (Room): O cômodo.
+
+        Returns:
+            CellRectangle: Colunas e linhas inicial e final do cômodo.
+        """
+
+        module = self.module
+        return (
+            round(room.x / module), round((room.x + room.width) / module),
+            round(room.y / module), round((room.y + room.length) / module),
+        )
+
+    def cells(self, room: 'Room') -> Tuple[int, int, int, int]:
+        """
+        Converte a geometria (já encaixada) de um cômodo em células, recortada aos limites da grade.
+
+        Args:
+            room (Room): O cômodo.
+
+        Returns:
+            Tuple[int, int, int, int]: Coluna, linha, largura e comprimento em células.
+        """
+
+        module = self.module
+        column, row = round(room.x / module), round(room.y / module)
+        column_end, row_end = round((room.x + room.width) / module), round((room.y + room.length) / module)
+
+        column, row = max(column, 0), max(row, 0)
+        column_end, row_end = min(column_end, self.columns), min(row_end, self.rows)
+
+        return column, row, max(column_end - column, 0), max(row_end - row, 0)
+
+    def mask(self, room: 'Room') -> int:
+        """
+        Monta a máscara de ocupação de um cômodo.
+
+        Args:
+            room (Room): O cômodo.
+
+        Returns:
+            int: Bitset com as células do cômodo.
+        """
+
+        column, row, width, length = self.cells(room)
+        if width == 0 or length == 0:
+            return 0
+
+        # Repete a faixa de uma linha em `length` linhas: (2^(length*columns) - 1) / (2^columns - 1)
+        row_bits = ((1 << width) - 1) << column
+        repeat = ((1 << (length * self.columns)) - 1) // ((1 << self.columns) - 1)
+
+        return (row_bits * repeat) << (row * self.columns)
+
+    def overlaps(self, mask1: int, mask2: int) -> bool:
+        """
+        Verifica se duas máscaras têm células em comum.
+
+        Args:
+            mask1 (int): Primeira máscara.
+            mask2 (int): Segunda máscara.
+
+        Returns:
+            bool: True se houver sobreposição, False caso contrário.
+        """
+
+        return mask1 & mask2 != 0
+
+    def neighborhood(self, mask: int) -> int:
+        """
+        Monta a máscara das células vizinhas (à direita, à esquerda, acima ou abaixo) de uma máscara,
+        para ser reaproveitada em vários testes de adjacência.
+
+        Args:
+            mask (int): A máscara.
+
+        Returns:
+            int: Máscara das células vizinhas.
+        """
+
+        return (
+            ((mask << 1) & self.not_first_column) |
+            ((mask >> 1) & self.not_last_column) |
+            ((mask << self.columns) & self.full) |
+            (mask >> self.columns)
+        )
+
+    def shared_cells(self, mask1: int, mask2: int) -> int:
+        """
+        Mede, em células, o trecho de parede compartilhado entre duas máscaras que não se
+        sobrepõem: células de mask2 vizinhas de mask1.
+
+        Args:
+            mask1 (int): Primeira máscara.
+            mask2 (int): Segunda máscara.
+
+        Returns:
+            int: Comprimento da parede compartilhada, em módulos (0 se não forem adjacentes).
+        """
+
+        return popcount(self.neighborhood(mask1) & mask2)
+
+    def adjacent(self, mask1: int, mask2: int) -> bool:
+        """
+        Verifica se duas máscaras compartilham parede.
+
+        Args:
+            mask1 (int): Primeira máscara.
+            mask2 (int): Segunda máscara.
+
+        Returns:
+            bool: True se forem adjacentes, False caso contrário.
+        """
+
+        return self.shared_cells(mask1, mask2) > 0
@@ -83,3 +83,45 @@ FURNITURES: Dict[str, List[Tuple[str, float, float]]] = {
         ("Máquina de Pesos", 2.00, 2.00),
     ],
 }
+
+# Tolerância (em metros) para considerar que duas paredes coincidem
+ADJACENCY_TOLERANCE: float = 0.05
+
+# Dimensões das portas (largura da abertura e espessura da parede), em metros
+DOOR_WIDTH: float = 0.8
+DOOR_THICKNESS: float = 0.1
+
+# Perfil de avaliação padrão (pode ser substituído por um arquivo de perfil, ver profiles.py)
+# Peso de cada critério no fitness; critérios com peso zero não são avaliados
+OBJECTIVE_WEIGHTS: Dict[str, float] = {
+    "area_utilization": 1.0,
+    "area_separation": 1.0,
+    "circulation": 1.0,
+    "natural_light": 1.0,
+    "external_connections": 1.0,
+    "staircase_position": 1.0,
+}
+
+# Parâmetros internos dos critérios
+FITNESS_PARAMETERS: Dict[str, float] = {
+    "natural_light_reward": 20,  # Por cômodo próximo às paredes externas
+    "external_connection_reward": 30,  # Por sala/cozinha próxima às paredes externas
+    "staircase_radius": 10,  # Distância ao centro a partir da qual a escada não pontua
+    "staircase_reward": 10,  # Por metro de proximidade ao centro
+    "separation_reward": 10,  # Cômodo íntimo sem parede em comum com área social
+    "separation_penalty": 10,  # Cômodo íntimo encostado em área social
+    "circulation_reward": 50,  # Multiplicado pela fração de cômodos alcançáveis a partir da entrada
+    "circulation_depth_penalty": 5,  # Multiplicado pela profundidade média (em portas) a partir da entrada
+}
+
+# Penalidade por violação de restrição
+CONSTRAINT_PENALTIES: Dict[str, float] = {
+    "overlap": 1000,
+    "out_of_bounds": 1000,
+    "missing_room": 1000,
+}
+
+# Empacotamento de mobílias: resolução (em metros) usada para reaproveitar layouts entre
+# cômodos de dimensões próximas e profundidade da área livre mantida à frente de cada móvel
+FURNITURE_QUANTUM: float = 0.1
+FURNITURE_CLEARANCE: float = 0.6
@@ -0,0 +1,899 @@
+import argparse
+import math
+import random
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from itertools import product
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from adjacency import find_shared_walls, shared_wall_between
+from bitboard import Bitboard
+from constants import ADJACENCY_TOLERANCE
+from elite_library import adapt_plan
+from export import plan_to_dict
+from fitness import ENTRANCE_ROOMS, PRIVATE_AREAS, SOCIAL_AREAS, PlanGraph
+from fitness_cache import FitnessCache, get_fitness_cache, set_fitness_cache
+from local_search import IncrementalEvaluator
+from models import FloorPlan, Room
+from nsga2 import dominance_matrix
+from parallel_evaluation import ParallelEvaluator
+from profiles import EvaluationProfile, default_profile, house_type_label, house_units, load_profile, program_rooms
+from surrogate import FEATURES, plan_features
+from utils import HOUSE_TYPES, ROOM_COUNTS, SPECIAL_ROOMS
+
+# Tolerância relativa na comparação de valores de ponto flutuante
+TOLERANCE = 1e-9
+
+# Módulos (em metros) usados para as plantas do modo discreto; são exatos em binário, de modo
+# que as coordenadas encaixadas na grade são comparadas sem erro de arredondamento
+MODULES = (0.5, 0.25)
+
+ORIENTATIONS = ("norte", "sul", "leste", "oeste")
+
+# Programas grandes (edifícios de várias unidades e mais de dois andares), com 50 a 62 cômodos,
+# misturados aos programas derivados de nomes para exercitar os índices espaciais
+LARGE_PROGRAMS = (
+    ("4 andares e 6 unidades", "Escritório", 2, 1, 1),
+    ("3 andares e 10 unidades", "Sala de Jogos", 1, 1, 0),
+)
+
+
+def all_programs() -> List[tuple]:
+    """
+    Lista todos os programas de casa possíveis (ver utils.characteristics_to_program), mais os
+    programas grandes de LARGE_PROGRAMS.
+
+    Returns:
+        List[tuple]: Tipo de casa, cômodo especial, quartos, banheiros e closets de cada programa.
+    """
+
+    return [
+        (house_type, special_room, *counts)
+        for house_type, special_room, counts in product(HOUSE_TYPES, SPECIAL_ROOMS, ROOM_COUNTS)
+    ] + list(LARGE_PROGRAMS)
+
+
+def random_plans(
+    count: int, profile: Optional[EvaluationProfile] = None, perturbed: float = 0.5, perturb: float = 0.3,
+    shared_program: bool = False
+) -> List[FloorPlan]:
+    """
+    Gera plantas aleatórias (sem avaliação), percorrendo todos os programas, áreas e orientações.
+    Em parte das plantas, alguns cômodos são deslocados para posições aleatórias, para que também
+    apareçam sobreposições, cômodos fora dos limites (alguns em um andar que a casa não tem) e
+    cômodos encostados; as demais ficam como geradas (em sua maioria válidas, exercitando os
+    critérios de fitness).
+
+    Args:
+        count (int): Número de plantas.
+        profile (Optional[EvaluationProfile]): Perfil de avaliação (ex.: o do modo discreto).
+        perturbed (float): Fração das plantas com cômodos deslocados.
+        perturb (float): Probabilidade de cada cômodo de uma planta perturbada ser deslocado.
+        shared_program (bool): Se todas as plantas usam um mesmo programa, área e orientação,
+            sorteados (as dimensões da casa continuam variando).
+
+    Returns:
+        List[FloorPlan]: As plantas.
+    """
+
+    programs = all_programs()
+    if shared_program:
+        programs = [random.choice(programs)]
+        area, orientation = random.uniform(60, 300), random.choice(ORIENTATIONS)
+
+    plans = []
+    for index in range(count):
+        program = programs[index % len(programs)]
+        if not shared_program:
+            area, orientation = random.uniform(60, 300), random.choice(ORIENTATIONS)
+        plan = FloorPlan(area, orientation, *program, profile=profile, evaluate=False)
+        for room in plan.rooms if random.random() < perturbed else ():
+            if random.random() < perturb:
+                room.x = random.uniform(-1, plan.house_width - room.width / 2)
+                room.y = random.uniform(-1, plan.house_length - room.length / 2)
+                if random.random() < 0.1:
+                    room.floor = plan.max_floor
+        plan.snap_rooms()
+        plans.append(plan)
+
+    return plans
+
+
+def same(expected: Any, actual: Any) -> bool:
+    """
+    Compara dois resultados: números com tolerância relativa, sequências e dicionários item a item.
+
+    Args:
+        expected (Any): Resultado da implementação de referência.
+        actual (Any): Resultado do motor otimizado.
+
+    Returns:
+        bool: True se forem equivalentes.
+    """
+
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return expected.keys() == actual.keys() and all(same(expected[key], actual[key]) for key in expected)
+    if isinstance(expected, (list, tuple)) and isinstance(actual, (list, tuple)):
+        return len(expected) == len(actual) and all(same(a, b) for a, b in zip(expected, actual))
+    if isinstance(expected, (int, float, np.number)) and isinstance(actual, (int, float, np.number)):
+        return math.isclose(expected, actual, rel_tol=TOLERANCE, abs_tol=TOLERANCE)
+    return expected == actual
+
+
+# Implementações de referência: laços escalares sobre os cômodos, diretamente das definições
+
+def reference_overlaps(plan: FloorPlan) -> int:
+    """
+    Conta os pares de cômodos sobrepostos no mesmo andar (as escadas ocupam todos os andares).
+
+    Args:
+        plan (FloorPlan): A planta.
+
+    Returns:
+        int: Número de pares sobrepostos.
+    """
+
+    rooms = plan.rooms
+    return sum(
+        1
+        for i in range(len(rooms))
+        for j in range(i + 1, len(rooms))
+        if rooms[i].shares_floor(rooms[j]) and plan.check_overlap(rooms[i], rooms[j])
+    )
+
+
+def reference_violations(plan: FloorPlan) -> List[int]:
+    """
+    Sobreposições, cômodos fora dos limites (ou em andares inexistentes) e cômodos faltantes,
+    como em FloorPlan.evaluate.
+
+    Args:
+        plan (FloorPlan): A planta.
+
+    Returns:
+        List[int]: As três contagens.
+    """
+
+    out_of_bounds = sum(
+        1 for room in plan.rooms
+        if room.x < 0 or room.y < 0 or room.x + room.width > plan.house_width or room.y + room.length > plan.house_length
+        or room.type != "Escadas" and not 0 <= room.floor < plan.max_floor
+    )
+    return [reference_overlaps(plan), out_of_bounds, reference_missing_rooms(plan)]
+
+
+def reference_missing_rooms(plan: FloorPlan) -> int:
+    """
+    Cômodos obrigatórios do programa (ver profiles.program_rooms) que faltam na planta.
+
+    Args:
+        plan (FloorPlan): A planta.
+
+    Returns:
+        int: Número de cômodos faltantes.
+    """
+
+    present = Counter(room.type for room in plan.rooms)
+    required = program_rooms(plan.house_type, plan.special_room, plan.bedrooms, plan.bathrooms, plan.closets)
+    return sum(max(quantity - present[room_type], 0) for room_type, quantity in required.items())
+
+
+def reference_cell_range(bitboard: Bitboard, start: float, size: float, limit: int) -> range:
+    """
+    Células do módulo cobertas por um intervalo (já encaixado na grade), recortadas à grade.
+
+    Args:
+        bitboard (Bitboard): Grade da planta (apenas o módulo).
+        start (float): Início do intervalo, em metros.
+        size (float): Comprimento do intervalo, em metros.
+        limit (int): Número de colunas (ou linhas) da grade.
+
+    Returns:
+        range: Índices das células.
+    """
+
+    return range(max(round(start / bitboard.module), 0), min(round((start + size) / bitboard.module), limit))
+
+
+def reference_area_utilization(plan: FloorPlan) -> float:
+    """
+    Porcentagem da área dos andares coberta por cômodos, contando as células ocupadas de cada
+    andar em um conjunto: células de 1 m² marcadas da parte inteira do início à do fim do cômodo
+    no modo contínuo, células do módulo (recortadas à grade) no discreto. As escadas ocupam todos os andares.
+
+    Args:
+        plan (FloorPlan): A planta (válida).
+
+    Returns:
+        float: Porcentagem de área utilizada.
+    """
+
+    cells = set()
+    for room in plan.rooms:
+        if plan.bitboard is None:
+            columns = range(int(room.x), int(room.x + room.width))
+            rows = range(int(room.y), int(room.y + room.length))
+        else:
+            columns = reference_cell_range(plan.bitboard, room.x, room.width, plan.bitboard.columns)
+            rows = reference_cell_range(plan.bitboard, room.y, room.length, plan.bitboard.rows)
+        for floor in range(plan.max_floor) if room.type == "Escadas" else (room.floor,):
+            cells.update((floor, column, row) for column in columns for row in rows)
+
+    cell_area = 1 if plan.bitboard is None else plan.bitboard.module ** 2
+    return len(cells) * cell_area / (plan.house_width * plan.house_length * plan.max_floor) * 100
+
+
+def reference_distances(neighbors: List[List[int]], sources: List[int]) -> List[float]:
+    """
+    Distância (em arestas) de cada cômodo até a origem mais próxima, por busca em largura.
+
+    Args:
+        neighbors (List[List[int]]): Vizinhos de cada cômodo.
+        sources (List[int]): Índices das origens.
+
+    Returns:
+        List[float]: Distância de cada cômodo; infinito se não houver caminho.
+    """
+
+    distances = [math.inf] * len(neighbors)
+    frontier = list(sources)
+    for source in frontier:
+        distances[source] = 0
+    while frontier:
+        following = []
+        for current in frontier:
+            for neighbor in neighbors[current]:
+                if distances[neighbor] == math.inf:
+                    distances[neighbor] = distances[current] + 1
+                    following.append(neighbor)
+        frontier = following
+    return distances
+
+
+def reference_evaluation(plan: FloorPlan) -> Dict[str, Any]:
+    """
+    Avaliação completa, sem cache, recalculada pelas definições: violações por reference_violations,
+    grafo por reference_graph_edges com buscas em largura próprias, área por conjuntos de células
+    e os demais critérios pelas fórmulas, cômodo a cômodo.
+
+    Args:
+        plan (FloorPlan): A planta.
+
+    Returns:
+        Dict[str, Any]: Fitness, violações e critérios.
+    """
+
+    profile, rooms = plan.profile, plan.rooms
+    overlaps, out_of_bounds, missing = reference_violations(plan)
+    if overlaps or out_of_bounds or missing:
+        fitness = -(
+            overlaps * profile.overlap_penalty + out_of_bounds * profile.out_of_bounds_penalty +
+            missing * profile.missing_room_penalty
+        )
+        return {"fitness": fitness, "violations": overlaps + out_of_bounds + missing, "components": {}}
+
+    neighbors: List[List[int]] = [[] for _ in rooms]
+    for i, j in reference_graph_edges(plan):
+        neighbors[i].append(j)
+        neighbors[j].append(i)
+    parameters = profile.parameters
+
+    separation = 0.0
+    social = [index for index, room in enumerate(rooms) if room.type in SOCIAL_AREAS]
+    if social:
+        distances = reference_distances(neighbors, social)
+        for index, room in enumerate(rooms):
+            if room.type in PRIVATE_AREAS and distances[index] == 1:
+                separation -= parameters["separation_penalty"]
+            elif room.type in PRIVATE_AREAS and distances[index] != math.inf:
+                separation += parameters["separation_reward"]
+
+    circulation = 0.0
+    entrances = [index for index, room in enumerate(rooms) if room.type in ENTRANCE_ROOMS]
+    if entrances and len(rooms) >= 2:
+        reachable = [distance for distance in reference_distances(neighbors, entrances) if distance != math.inf]
+        circulation = (
+            parameters["circulation_reward"] * len(reachable) / len(rooms) -
+            parameters["circulation_depth_penalty"] * sum(reachable) / len(reachable)
+        )
+
+    # Cômodos a até 1 m de uma parede externa
+    external = [
+        room.x <= 1 or room.x + room.width >= plan.house_width - 1 or
+        room.y <= 1 or room.y + room.length >= plan.house_length - 1
+        for room in rooms
+    ]
+    staircase = sum(
+        max(0, parameters["staircase_radius"] - math.hypot(
+            room.x + room.width / 2 - plan.house_width / 2, room.y + room.length / 2 - plan.house_length / 2
+        )) * parameters["staircase_reward"]
+        for room in rooms if room.type == "Escadas"
+    )
+
+    values = {
+        "area_utilization": reference_area_utilization(plan),
+        "area_separation": separation,
+        "circulation": circulation,
+        "natural_light": parameters["natural_light_reward"] * sum(external),
+        "external_connections": parameters["external_connection_reward"] * sum(
+            1 for room, near in zip(rooms, external) if near and room.type in ("Sala de Estar", "Cozinha")
+        ),
+        "staircase_position": staircase,
+    }
+    components = {objective: values[objective] for objective in profile.objectives}
+    fitness = sum(profile.objective_weights[objective] * value for objective, value in components.items())
+    return {"fitness": fitness, "violations": 0, "components": components}
+
+
+def reference_walls(plan: FloorPlan) -> List[tuple]:
+    """
+    Paredes compartilhadas, testando todos os pares de cômodos com shared_wall_between.
+
+    Args:
+        plan (FloorPlan): A planta.
+
+    Returns:
+        List[tuple]: Par de cômodos (ordenado), orientação, coordenada, início e fim, em ordem.
+    """
+
+    walls = []
+    rooms = plan.rooms
+    for i in range(len(rooms)):
+        for j in range(i + 1, len(rooms)):
+            wall = shared_wall_between(rooms[i], rooms[j])
+            if wall is not None:
+                walls.append((i, j, *wall))
+    return sorted(walls)
+
+
+def reference_touching(room1: Room, room2: Room) -> bool:
+    """
+    Verifica, pela definição, se dois cômodos (em qualquer andar) compartilham parede: no modo
+    contínuo, bordas opostas a até ADJACENCY_TOLERANCE e trecho em comum maior que a tolerância;
+    no discreto, uma célula de um vizinha (na horizontal ou na vertical) de uma célula do outro.
+
+    Args:
+        room1 (Room): Primeiro cômodo.
+        room2 (Room): Segundo cômodo.
+
+    Returns:
+        bool: True se os cômodos compartilham parede.
+    """
+
+    tolerance = ADJACENCY_TOLERANCE
+    for first, second in ((room1, room2), (room2, room1)):
+        if (
+            abs(first.x + first.width - second.x) <= tolerance and
+            min(first.y + first.length, second.y + second.length) - max(first.y, second.y) > tolerance
+        ):
+            return True
+        if (
+            abs(first.y + first.length - second.y) <= tolerance and
+            min(first.x + first.width, second.x + second.width) - max(first.x, second.x) > tolerance
+        ):
+            return True
+    return False
+
+
+def reference_cells_touching(bitboard: Bitboard, room1: Room, room2: Room) -> bool:
+    """
+    Versão discreta de reference_touching: converte os cômodos em intervalos de colunas e linhas
+    (ver reference_cell_range) e procura um par de células a uma célula de distância na horizontal, com
+    linhas em comum, ou na vertical, com colunas em comum.
+
+    Args:
+        bitboard (Bitboard): Grade da planta (apenas o módulo e o número de colunas e linhas).
+        room1 (Room): Primeiro cômodo.
+        room2 (Room): Segundo cômodo.
+
+    Returns:
+        bool: True se os cômodos compartilham parede.
+    """
+
+    columns1 = reference_cell_range(bitboard, room1.x, room1.width, bitboard.columns)
+    rows1 = reference_cell_range(bitboard, room1.y, room1.length, bitboard.rows)
+    columns2 = reference_cell_range(bitboard, room2.x, room2.width, bitboard.columns)
+    rows2 = reference_cell_range(bitboard, room2.y, room2.length, bitboard.rows)
+    horizontal = any(abs(a - b) == 1 for a in columns1 for b in columns2) and set(rows1) & set(rows2)
+    vertical = any(abs(a - b) == 1 for a in rows1 for b in rows2) and set(columns1) & set(columns2)
+    return bool(horizontal or vertical)
+
+
+def reference_graph_edges(plan: FloorPlan) -> List[tuple]:
+    """
+    Arestas do grafo de cômodos, testando todos os pares pela definição: escadas de andares
+    diferentes se ligam, e os demais pares que disputam um andar (a projeção das escadas está em
+    todos) se ligam se compartilham parede (reference_touching ou reference_cells_touching).
+
+    Args:
+        plan (FloorPlan): A planta.
+
+    Returns:
+        List[tuple]: Pares de cômodos ligados, em ordem.
+    """
+
+    edges = []
+    rooms = plan.rooms
+    for i in range(len(rooms)):
+        for j in range(i + 1, len(rooms)):
+            room1, room2 = rooms[i], rooms[j]
+            if room1.type == "Escadas" and room2.type == "Escadas" and room1.floor != room2.floor:
+                edges.append((i, j))
+            elif room1.floor == room2.floor or "Escadas" in (room1.type, room2.type):
+                if plan.bitboard is None:
+                    touching = reference_touching(room1, room2)
+                else:
+                    touching = reference_cells_touching(plan.bitboard, room1, room2)
+                if touching:
+                    edges.append((i, j))
+    return edges
+
+
+def single_floor_program(plan: FloorPlan) -> tuple:
+    """
+    Programa da planta reduzido a um único andar (mesmas unidades e quantidades), para a
+    adaptação de plantas da biblioteca a pedidos com menos andares.
+
+    Args:
+        plan (FloorPlan): A planta.
+
+    Returns:
+        tuple: Tipo de casa, cômodo especial, quartos, banheiros e closets.
+    """
+
+    return (
+        house_type_label(1, house_units(plan.house_type)), plan.special_room, plan.bedrooms, plan.bathrooms,
+        plan.closets,
+    )
+
+
+def reference_adapted_rooms(plan: FloorPlan) -> List[tuple]:
+    """
+    Tipo e andar dos cômodos da planta adaptada a um único andar: os excedentes do programa saem,
+    na ordem da planta, e os demais passam para o térreo.
+
+    Args:
+        plan (FloorPlan): A planta.
+
+    Returns:
+        List[tuple]: Tipo e andar de cada cômodo mantido, em ordem.
+    """
+
+    limits = program_rooms(*single_floor_program(plan))
+    rooms = []
+    for room in plan.rooms:
+        if room.type == "Escadas":
+            continue  # Casas térreas não têm escada
+        if room.type in limits:
+            if limits[room.type] == 0:
+                continue
+            limits[room.type] -= 1
+        rooms.append((room.type, 0))
+    return sorted(rooms)
+
+
+def reference_dominance(plans: Sequence[FloorPlan]) -> List[List[bool]]:
+    """
+    Dominância com restrições entre todos os pares de plantas, pela definição de nsga2.dominance_matrix.
+
+    Args:
+        plans (Sequence[FloorPlan]): Plantas avaliadas.
+
+    Returns:
+        List[List[bool]]: [i][j] indica que a planta i domina a j.
+    """
+
+    objectives = [plan.objectives() for plan in plans]
+    violations = [plan.constraint_violation for plan in plans]
+    matrix = []
+    for i in range(len(plans)):
+        row = []
+        for j in range(len(plans)):
+            if violations[i] == 0 and violations[j] == 0:
+                row.append(
+                    all(a >= b for a, b in zip(objectives[i], objectives[j])) and
+                    any(a > b for a, b in zip(objectives[i], objectives[j]))
+                )
+            else:
+                row.append(violations[i] < violations[j])
+        matrix.append(row)
+    return matrix
+
+
+# Motores otimizados, cada um com a mesma saída da referência correspondente
+
+def engine_has_overlap(plan: FloorPlan) -> List[bool]:
+    """Sobreposição de cada cômodo com os demais, por FloorPlan.has_overlap."""
+    return [plan.has_overlap(room, plan.rooms[:i] + plan.rooms[i + 1:]) for i, room in enumerate(plan.rooms)]
+
+
+def reference_has_overlap(plan: FloorPlan) -> List[bool]:
+    """Sobreposição de cada cômodo com os demais, testando todos os pares."""
+    rooms = plan.rooms
+    return [
+        any(j != i and room.shares_floor(other) and plan.check_overlap(room, other) for j, other in enumerate(rooms))
+        for i, room in enumerate(rooms)
+    ]
+
+
+def engine_surrogate_violations(plans: Sequence[FloorPlan]) -> List[List[int]]:
+    """Contagens de violações calculadas em lote por surrogate.plan_features."""
+    columns = [FEATURES.index(name) for name in ("overlaps", "out_of_bounds", "missing_rooms")]
+    return plan_features(plans)[:, columns].astype(int).tolist()
+
+
+@contextmanager
+def warm_cache(plan: FloorPlan) -> Iterator[None]:
+    """Preparo de fitness/cache: a primeira avaliação (falta no cache) fica fora do tempo medido."""
+    plan.calculate_fitness()
+    yield None
+
+
+def engine_cached_evaluation(plan: FloorPlan, _: None) -> Dict[str, Any]:
+    """Avaliação por FloorPlan.calculate_fitness, respondida pelo cache (já preparado por warm_cache)."""
+    fitness = plan.calculate_fitness()
+    return {"fitness": fitness, "violations": plan.constraint_violation, "components": dict(plan.fitness_components)}
+
+
+def reference_batch_evaluation(plans: Sequence[FloorPlan]) -> List[Dict[str, Any]]:
+    """Avaliação completa, sem cache, de cada planta do lote."""
+    return [reference_evaluation(plan) for plan in plans]
+
+
+@contextmanager
+def parallel_evaluator(plans: Sequence[FloorPlan], workers: int = 2) -> Iterator[ParallelEvaluator]:
+    """
+    Preparo de fitness/parallel: cria o avaliador do programa do lote e faz uma primeira avaliação,
+    fora do tempo medido, para que os processos e a memória compartilhada já existam.
+    """
+    first = plans[0]
+    program = (first.area, first.orientation, first.house_type, first.special_room, first.bedrooms, first.bathrooms, first.closets)
+    evaluator = ParallelEvaluator(workers, program, first.profile)
+    try:
+        evaluator.evaluate(plans)
+        yield evaluator
+    finally:
+        evaluator.close()
+
+
+def engine_parallel_evaluation(plans: Sequence[FloorPlan], evaluator: ParallelEvaluator) -> List[Dict[str, Any]]:
+    """Avaliação do lote (de um único programa) por parallel_evaluation.ParallelEvaluator, com os processos já criados."""
+    evaluator.evaluate(plans)
+    return [
+        {"fitness": plan.fitness, "violations": plan.constraint_violation, "components": dict(plan.fitness_components)}
+        for plan in plans
+    ]
+
+
+def engine_incremental_evaluation(plan: FloorPlan) -> Dict[str, Any]:
+    """Fitness e critérios de uma planta válida pelo estado de local_search.IncrementalEvaluator."""
+    evaluator = IncrementalEvaluator(plan)
+    return {"fitness": evaluator.fitness, "violations": 0, "components": evaluator.components()}
+
+
+def engine_walls(plan: FloorPlan) -> List[tuple]:
+    """Paredes compartilhadas pela varredura de arestas ordenadas (adjacency.find_shared_walls)."""
+    walls = []
+    for wall in find_shared_walls(plan.rooms):
+        i, j = sorted((wall.room1, wall.room2))
+        # shared_wall_between devolve a primeira orientação encontrada para o par; a varredura, todas
+        walls.append((i, j, wall.orientation, wall.coordinate, wall.start, wall.end))
+    return _first_wall_per_pair(sorted(walls))
+
+
+def _first_wall_per_pair(walls: List[tuple]) -> List[tuple]:
+    """
+    Mantém, para cada par de cômodos, a parede vertical se houver (a que shared_wall_between testa primeiro).
+
+    Args:
+        walls (List[tuple]): Paredes ordenadas (o "horizontal" vem antes do "vertical").
+
+    Returns:
+        List[tuple]: Uma parede por par.
+    """
+
+    by_pair: Dict[tuple, tuple] = {}
+    for wall in walls:
+        if wall[:2] not in by_pair or wall[2] == "vertical":
+            by_pair[wall[:2]] = wall
+    return sorted(by_pair.values())
+
+
+def engine_graph_edges(plan: FloorPlan) -> List[tuple]:
+    """Arestas do grafo de cômodos montado por fitness.PlanGraph (pares próximos no índice espacial)."""
+    graph = PlanGraph(plan)
+    return sorted((i, j) for i, neighbors in enumerate(graph.neighbors) for j in neighbors if i < j)
+
+
+def engine_adapted_rooms(plan: FloorPlan) -> List[tuple]:
+    """Tipo e andar dos cômodos da planta adaptada a um único andar por elite_library.adapt_plan."""
+    program = single_floor_program(plan)
+    adapted = adapt_plan(plan_to_dict(plan), plan.area, plan.orientation, program, profile=plan.profile)
+    return sorted((room.type, room.floor) for room in adapted.rooms)
+
+
+def engine_dominance(plans: Sequence[FloorPlan]) -> List[List[bool]]:
+    """Dominância vetorizada por nsga2.dominance_matrix."""
+    objectives = np.array([plan.objectives() for plan in plans], dtype=float)
+    violations = np.array([plan.constraint_violation for plan in plans])
+    return dominance_matrix(objectives, violations).tolist()
+
+
+class Check:
+    def __init__(
+        self, name: str, reference: Callable, engine: Callable, batch: bool = False,
+        profile: Optional[Callable[[], EvaluationProfile]] = None, valid_only: bool = False,
+        evaluated: bool = False, cache: bool = False, shared_program: bool = False,
+        setup: Optional[Callable[[Any], ContextManager]] = None
+    ):
+        """
+        Comparação entre uma implementação de referência e um motor otimizado.
+
+        Args:
+            name (str): Nome da comparação.
+            reference (Callable): Implementação de referência.
+            engine (Callable): Motor otimizado.
+            batch (bool): Se as funções recebem o lote inteiro (e retornam um resultado por
+                planta, ou um único resultado) em vez de uma planta por vez.
+            profile (Optional[Callable[[], EvaluationProfile]]): Perfil das plantas geradas para a
+                comparação (por padrão, o perfil padrão).
+            valid_only (bool): Se apenas as plantas sem violações são comparadas.
+            evaluated (bool): Se as plantas precisam estar avaliadas antes da comparação.
+            cache (bool): Se o motor usa um cache de fitness novo (a referência roda sem cache).
+            shared_program (bool): Se as plantas geradas compartilham o programa (ver random_plans).
+            setup (Optional[Callable[[Any], ContextManager]]): Preparo do motor para cada argumento
+                (cache aquecido, processos criados), medido à parte do motor. O valor do gerenciador
+                de contexto é passado ao motor como segundo argumento.
+        """
+
+        self.name: str = name
+        self.reference: Callable = reference
+        self.engine: Callable = engine
+        self.batch: bool = batch
+        self.profile: Optional[Callable[[], EvaluationProfile]] = profile
+        self.valid_only: bool = valid_only
+        self.evaluated: bool = evaluated
+        self.cache: bool = cache
+        self.shared_program: bool = shared_program
+        self.setup: Optional[Callable[[Any], ContextManager]] = setup
+
+
+def _discrete_profile() -> EvaluationProfile:
+    """Perfil do modo discreto com um dos módulos de MODULES, sorteado."""
+    return load_profile(None, {"module": random.choice(MODULES)})
+
+
+CHECKS = (
+    Check("overlap/has_overlap", reference_has_overlap, engine_has_overlap),
+    Check("overlap/spatial", reference_overlaps, lambda plan: plan.count_overlaps()),
+    Check("overlap/bitboard", reference_overlaps, lambda plan: plan.count_overlaps(), profile=_discrete_profile),
+    Check(
+        "violations/surrogate", lambda plans: [reference_violations(plan) for plan in plans],
+        engine_surrogate_violations, batch=True,
+    ),
+    Check("fitness/cache", reference_evaluation, engine_cached_evaluation, cache=True, setup=warm_cache),
+    Check(
+        "fitness/parallel", reference_batch_evaluation, engine_parallel_evaluation, batch=True, shared_program=True,
+        setup=parallel_evaluator,
+    ),
+    Check("fitness/incremental", reference_evaluation, engine_incremental_evaluation, valid_only=True),
+    Check("adjacency/sweep", lambda plan: _first_wall_per_pair(reference_walls(plan)), engine_walls),
+    Check("adjacency/bitboard", reference_graph_edges, engine_graph_edges, profile=_discrete_profile),
+    Check("nsga2/dominance", reference_dominance, engine_dominance, batch=True, evaluated=True),
+    Check("library/floors", reference_adapted_rooms, engine_adapted_rooms, evaluated=True),
+)
+
+
+class CheckResult:
+    def __init__(self, name: str):
+        """
+        Resultado de uma comparação: casos comparados, divergências, tempo de cada lado e tempo de
+        preparo do motor (fora da aceleração).
+
+        Args:
+            name (str): Nome da comparação.
+        """
+
+        self.name: str = name
+        self.cases: int = 0
+        self.mismatches: List[str] = []
+        self.reference_seconds: float = 0.0
+        self.engine_seconds: float = 0.0
+        self.setup_seconds: float = 0.0
+
+    @property
+    def speedup(self) -> float:
+        """
+        Razão entre o tempo da referência e o do motor otimizado.
+
+        Returns:
+            float: Aceleração (maior que 1 se o motor for mais rápido).
+        """
+
+        return self.reference_seconds / self.engine_seconds if self.engine_seconds > 0 else math.inf
+
+
+def _timed(function: Callable, *arguments: Any) -> tuple:
+    """
+    Executa uma função e mede o tempo.
+
+    Args:
+        function (Callable): A função.
+        *arguments (Any): Os argumentos.
+
+    Returns:
+        tuple: Resultado e duração, em segundos.
+    """
+
+    start = time.perf_counter()
+    result = function(*arguments)
+    return result, time.perf_counter() - start
+
+
+def _run_engine(check: Check, argument: Any, result: 'CheckResult') -> Any:
+    """
+    Executa o motor de uma comparação, com o preparo (se houver) medido à parte.
+
+    Args:
+        check (Check): A comparação.
+        argument (Any): Planta ou lote.
+        result (CheckResult): Resultado em que os tempos são acumulados.
+
+    Returns:
+        Any: O resultado do motor.
+    """
+
+    if check.setup is None:
+        actual, seconds = _timed(check.engine, argument)
+        result.engine_seconds += seconds
+        return actual
+
+    start = time.perf_counter()
+    with check.setup(argument) as context:
+        result.setup_seconds += time.perf_counter() - start
+        actual, seconds = _timed(check.engine, argument, context)
+    result.engine_seconds += seconds
+    return actual
+
+
+def run_check(check: Check, plans: List[FloorPlan]) -> CheckResult:
+    """
+    Executa uma comparação sobre um lote de plantas.
+
+    Args:
+        check (Check): A comparação.
+        plans (List[FloorPlan]): Plantas (sem avaliação) geradas para ela.
+
+    Returns:
+        CheckResult: O resultado.
+    """
+
+    result = CheckResult(check.name)
+    previous_cache = get_fitness_cache()
+    set_fitness_cache(None)
+    try:
+        if check.evaluated or check.valid_only:
+            for plan in plans:
+                plan.fitness = plan.evaluate()
+        if check.valid_only:
+            plans = [plan for plan in plans if plan.constraint_violation == 0]
+        if not plans:
+            return result
+
+        if check.batch:
+            expected, result.reference_seconds = _timed(check.reference, plans)
+            if check.cache:
+                set_fitness_cache(FitnessCache())
+            actual = _run_engine(check, plans, result)
+            pairs = [(None, expected, actual)]
+            result.cases = len(plans)
+        else:
+            pairs = []
+            for index, plan in enumerate(plans):
+                set_fitness_cache(None)
+                expected, seconds = _timed(check.reference, plan)
+                result.reference_seconds += seconds
+                if check.cache:
+                    set_fitness_cache(FitnessCache())
+                actual = _run_engine(check, plan, result)
+                pairs.append((index, expected, actual))
+            result.cases = len(plans)
+
+        for index, expected, actual in pairs:
+            if not same(expected, actual):
+                where = "lote" if index is None else f"planta {index}"
+                result.mismatches.append(f"{where}: referência {expected!r}, motor {actual!r}")
+    finally:
+        set_fitness_cache(previous_cache)
+
+    return result
+
+
+def run_harness(cases: int, names: Optional[Sequence[str]] = None) -> List[CheckResult]:
+    """
+    Gera plantas aleatórias de todos os programas e executa as comparações.
+
+    Args:
+        cases (int): Plantas geradas para cada comparação.
+        names (Optional[Sequence[str]]): Comparações a executar (por padrão, todas de CHECKS).
+
+    Returns:
+        List[CheckResult]: O resultado de cada comparação.
+    """
+
+    results = []
+    for check in CHECKS:
+        if names and check.name not in names:
+            continue
+        profile = check.profile() if check.profile is not None else default_profile()
+        results.append(run_check(check, random_plans(cases, profile, shared_program=check.shared_program)))
+
+    return results
+
+
+def _format_speedup(result: CheckResult) -> str:
+    """Aceleração formatada para a tabela ("-" sem casos comparados)."""
+    return f"{result.speedup:.2f}x" if result.cases else "-"
+
+
+def print_report(results: List[CheckResult], max_mismatches: int = 5) -> None:
+    """
+    Exibe uma tabela com os casos, as divergências e a aceleração de cada comparação.
+
+    Args:
+        results (List[CheckResult]): Os resultados.
+        max_mismatches (int): Divergências exibidas por comparação.
+    """
+
+    print(
+        f"{'comparação':<24} {'casos':>6} {'diverg.':>8} {'ref. (ms)':>10} {'motor (ms)':>11} "
+        f"{'preparo (ms)':>13} {'aceleração':>11}"
+    )
+    for result in results:
+        print(
+            f"{result.name:<24} {result.cases:>6} {len(result.mismatches):>8} "
+            f"{result.reference_seconds * 1000:>10.1f} {result.engine_seconds * 1000:>11.1f} "
+            f"{result.setup_seconds * 1000:>13.1f} {_format_speedup(result):>11}"
+        )
+    for result in results:
+        for mismatch in result.mismatches[:max_mismatches]:
+            print(f"[{result.name}] {mismatch}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Ponto de entrada: executa as comparações e retorna 1 se houver divergências.
+
+    Args:
+        argv (Optional[List[str]]): Argumentos da linha de comando (por padrão, os de sys.argv).
+
+    Returns:
+        int: Código de saída.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Compara os motores otimizados com as implementações de referência em plantas aleatórias."
+    )
+    parser.add_argument("--casos", type=int, default=200, help="Plantas por comparação (padrão: 200).")
+    parser.add_argument("--semente", type=int, help="Semente aleatória (para reproduzir uma divergência).")
+    parser.add_argument(
+        "--comparacao", action="append", choices=[check.name for check in CHECKS],
+        help="Executa apenas esta comparação (pode ser repetido)."
+    )
+    args = parser.parse_args(argv)
+
+    seed = args.semente if args.semente is not None else random.randrange(2 ** 32)
+    random.seed(seed)
+    print(f"Semente: {seed}")
+
+    results = run_harness(args.casos, args.comparacao)
+    print_report(results)
+    return 1 if any(result.mismatches for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
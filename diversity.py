@@ -0,0 +1,143 @@
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models import FloorPlan
+
+# Limite de pares de posições (plantas x plantas x cômodos) comparados de uma vez em distance_matrix,
+# para que a memória intermediária não cresça com o quadrado da população
+BLOCK_PAIRS = 1 << 20
+
+
+def genome_arrays(population: List[FloorPlan]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Monta os arrays de genoma da população: para cada planta, os cômodos em ordem canônica
+    (tipo, andar, posição) com o centro normalizado pelo envelope e o andar.
+    Plantas com menos cômodos são completadas com posições vazias (tipo -1).
+
+    Args:
+        population (List[FloorPlan]): A população.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Array (plantas, cômodos, 3) com centro X, centro Y e andar,
+            e array (plantas, cômodos) com o id do tipo de cada posição.
+    """
+
+    max_rooms = max(len(plan.rooms) for plan in population)
+    genomes = np.zeros((len(population), max_rooms, 3))
+    types = np.full((len(population), max_rooms), -1, dtype=np.intp)
+
+    for index, plan in enumerate(population):
+        rooms = sorted(plan.rooms, key=lambda room: (room.type, room.floor, room.x, room.y))
+        for slot, room in enumerate(rooms):
+            genomes[index, slot] = (
+                (room.x + room.width / 2) / plan.house_width,
+                (room.y + room.length / 2) / plan.house_length,
+                room.floor,
+            )
+            types[index, slot] = plan.profile.type_id(room.type)
+
+    return genomes, types
+
+
+def distance_matrix(population: List[FloorPlan]) -> np.ndarray:
+    """
+    Calcula a distância entre os genomas de todos os pares de plantas: a média, sobre as posições
+    canônicas, da distância entre os centros normalizados (limitada a 1). Posições com tipos
+    diferentes (ou vazias em apenas uma das plantas) contam como distância 1. As linhas da matriz
+    são calculadas em blocos de até BLOCK_PAIRS pares de posições.
+
+    Args:
+        population (List[FloorPlan]): A população.
+
+    Returns:
+        np.ndarray: Matriz simétrica (plantas, plantas) com valores entre 0 e 1.
+    """
+
+    genomes, types = genome_arrays(population)
+    plans, rooms = types.shape
+    block = max(BLOCK_PAIRS // (plans * rooms), 1)
+
+    distances = np.empty((plans, plans))
+    for start in range(0, plans, block):
+        end = min(start + block, plans)
+        differences = np.linalg.norm(genomes[start:end, None] - genomes[None, :], axis=-1)
+        same_type = types[start:end, None] == types[None, :]
+        distances[start:end] = np.where(same_type, np.minimum(differences, 1.0), 1.0).mean(axis=-1)
+
+    return distances
+
+
+def subset_distances(distances: np.ndarray, population: List[FloorPlan], indices: Sequence[int]) -> np.ndarray:
+    """
+    Extrai de distance_matrix(population) a matriz de um subconjunto das plantas, sem recalcular
+    os genomas. Cada distância é uma média sobre as posições da maior planta do conjunto, e as
+    posições vazias nas duas plantas contam 0: basta reescalar pela razão entre o número de
+    posições do conjunto e o do subconjunto.
+
+    Args:
+        distances (np.ndarray): Matriz de distâncias da população.
+        population (List[FloorPlan]): A população.
+        indices (Sequence[int]): Índices das plantas do subconjunto, na ordem desejada.
+
+    Returns:
+        np.ndarray: Matriz igual a distance_matrix([population[i] for i in indices]).
+    """
+
+    rooms = max(len(plan.rooms) for plan in population)
+    subset_rooms = max(len(population[index].rooms) for index in indices)
+    return distances[np.ix_(indices, indices)] * (rooms / subset_rooms)
+
+
+def population_diversity(population: List[FloorPlan], distances: Optional[np.ndarray] = None) -> float:
+    """
+    Mede a diversidade da população como a distância média entre pares de plantas.
+
+    Args:
+        population (List[FloorPlan]): A população.
+        distances (Optional[np.ndarray]): Matriz de distâncias da população, se já calculada
+            (ver distance_matrix e subset_distances).
+
+    Returns:
+        float: Diversidade entre 0 (todas as plantas iguais) e 1.
+    """
+
+    if len(population) < 2:
+        return 0.0
+
+    if distances is None:
+        distances = distance_matrix(population)
+    upper = np.triu_indices(len(population), k=1)
+
+    return float(distances[upper].mean())
+
+
+def remove_duplicates(
+    population: List[FloorPlan], tolerance: float = 1e-3, distances: Optional[np.ndarray] = None
+) -> Tuple[List[FloorPlan], List[FloorPlan]]:
+    """
+    Separa as plantas únicas das duplicatas. Uma planta é considerada duplicata se estiver a
+    menos de `tolerance` de alguma planta anterior na lista, de modo que, com a população
+    ordenada por fitness, a melhor cópia de cada planta é mantida.
+
+    Args:
+        population (List[FloorPlan]): A população.
+        tolerance (float): Distância (ver distance_matrix) abaixo da qual duas plantas são iguais.
+        distances (Optional[np.ndarray]): Matriz de distâncias da população, se já calculada.
+
+    Returns:
+        Tuple[List[FloorPlan], List[FloorPlan]]: Plantas únicas e duplicatas, na ordem original.
+    """
+
+    if len(population) < 2:
+        return list(population), []
+
+    if distances is None:
+        distances = distance_matrix(population)
+    close = np.tril(distances < tolerance, k=-1)
+    duplicated = close.any(axis=1)
+
+    unique = [plan for plan, is_duplicate in zip(population, duplicated) if not is_duplicate]
+    duplicates = [plan for plan, is_duplicate in zip(population, duplicated) if is_duplicate]
+
+    return unique, duplicates
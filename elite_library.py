@@ -0,0 +1,252 @@
+import json
+import math
+import os
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+from export import plan_from_dict, plan_to_dict
+from models import FloorPlan
+from profiles import EvaluationProfile, house_floors, program_rooms
+
+Program = Tuple[str, str, int, int, int]
+
+
+def program_key(program: Program) -> str:
+    """
+    Monta a chave textual de um programa de casa.
+
+    Args:
+        program (Program): Tipo da casa, cômodo especial, quartos, banheiros e closets.
+
+    Returns:
+        str: Chave do programa.
+    """
+
+    return "|".join(str(value) for value in program)
+
+
+def program_distance(program1: Program, program2: Program) -> float:
+    """
+    Mede a diferença entre dois programas: diferença no número de quartos, banheiros e closets,
+    mais uma unidade por tipo de casa ou cômodo especial diferente.
+
+    Args:
+        program1 (Program): Primeiro programa.
+        program2 (Program): Segundo programa.
+
+    Returns:
+        float: Distância entre os programas (0 para programas idênticos).
+    """
+
+    house_type1, special_room1, *counts1 = program1
+    house_type2, special_room2, *counts2 = program2
+
+    distance = sum(abs(count1 - count2) for count1, count2 in zip(counts1, counts2))
+    distance += int(house_type1 != house_type2) + int(special_room1 != special_room2)
+
+    return distance
+
+
+class EliteLibrary:
+    def __init__(self, path: Optional[str] = None, max_per_program: int = 20):
+        """
+        Biblioteca de boas plantas já encontradas, agrupadas por programa, usada para iniciar
+        novas execuções a partir de soluções conhecidas (warm start).
+
+        Args:
+            path (Optional[str]): Arquivo JSON da biblioteca. Se existir, é carregado.
+            max_per_program (int): Número máximo de plantas guardadas por programa.
+        """
+
+        self.path: Optional[str] = path
+        self.max_per_program: int = max_per_program
+        self.programs: Dict[str, List[Dict[str, Any]]] = {}
+
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def load(self, path: str) -> None:
+        """
+        Carrega a biblioteca de um arquivo JSON.
+
+        Args:
+            path (str): Caminho do arquivo.
+        """
+
+        with open(path, encoding="utf-8") as file:
+            self.programs = json.load(file)["programs"]
+
+    def save(self, path: Optional[str] = None) -> None:
+        """
+        Salva a biblioteca em um arquivo JSON.
+
+        Args:
+            path (Optional[str]): Caminho do arquivo (por padrão, o informado na criação).
+        """
+
+        path = path or self.path
+        if path is None:
+            raise ValueError("Nenhum arquivo definido para salvar a biblioteca")
+
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"version": 1, "programs": self.programs}, file, ensure_ascii=False)
+
+    def add(self, plan: FloorPlan) -> bool:
+        """
+        Adiciona uma planta válida à biblioteca, mantendo apenas as melhores de cada programa.
+
+        Args:
+            plan (FloorPlan): A planta.
+
+        Returns:
+            bool: True se a planta foi guardada, False caso contrário.
+        """
+
+        if plan.constraint_violation > 0:
+            return False
+
+        program = (plan.house_type, plan.special_room, plan.bedrooms, plan.bathrooms, plan.closets)
+        entries = self.programs.setdefault(program_key(program), [])
+        new_entry = plan_to_dict(plan)
+        if any(entry["rooms"] == new_entry["rooms"] for entry in entries):
+            return False  # Planta já guardada
+
+        entries.append(new_entry)
+        entries.sort(key=lambda entry: entry["fitness"], reverse=True)
+        del entries[self.max_per_program:]
+
+        return any(entry is new_entry for entry in entries)
+
+    def candidates(self, program: Program, max_distance: float = 2) -> List[Dict[str, Any]]:
+        """
+        Retorna as plantas do mesmo programa ou de programas semelhantes, das mais próximas
+        (e, em seguida, de maior fitness) para as mais distantes.
+
+        Args:
+            program (Program): Programa desejado.
+            max_distance (float): Distância máxima entre programas (ver program_distance).
+
+        Returns:
+            List[Dict[str, Any]]: Plantas no formato de export.plan_to_dict.
+        """
+
+        ranked = []
+        for entries in self.programs.values():
+            if not entries:
+                continue
+            first = entries[0]
+            stored_program = (
+                first["house_type"], first["special_room"], first["bedrooms"], first["bathrooms"], first["closets"]
+            )
+            distance = program_distance(program, stored_program)
+            if distance <= max_distance:
+                ranked.extend((distance, -entry["fitness"], index, entry) for index, entry in enumerate(entries))
+
+        ranked.sort(key=lambda item: item[:3])
+        return [entry for *_, entry in ranked]
+
+
+def adapt_plan(
+    data: Dict[str, Any], area: float, orientation: str, program: Program,
+    dimensions: Optional[Tuple[float, float]] = None, profile: Optional[EvaluationProfile] = None
+) -> FloorPlan:
+    """
+    Adapta uma planta da biblioteca a um novo pedido: escala as posições e dimensões dos
+    cômodos para a nova área (mantendo a proporção da planta original, ou para o envelope
+    informado) e ajusta o programa (tipo da casa, cômodo especial e quantidades). Cômodos de
+    andares que o novo tipo de casa não tem passam para o último andar (as sobreposições que
+    surgirem ficam a cargo do reparo).
+
+    Args:
+        data (Dict[str, Any]): Planta no formato de export.plan_to_dict.
+        area (float): Nova área.
+        orientation (str): Nova orientação.
+        program (Program): Novo programa.
+        dimensions (Optional[Tuple[float, float]]): Novo envelope (largura e comprimento).
+        profile (Optional[EvaluationProfile]): Perfil de avaliação.
+
+    Returns:
+        FloorPlan: A planta adaptada (avaliada com o novo programa).
+    """
+
+    if dimensions is None:
+        factor = math.sqrt(area / data["area"])
+        dimensions = (data["house_width"] * factor, data["house_length"] * factor)
+
+    scale_x = dimensions[0] / data["house_width"]
+    scale_y = dimensions[1] / data["house_length"]
+    house_type, special_room, bedrooms, bathrooms, closets = program
+    top_floor = house_floors(house_type) - 1
+
+    rooms = []
+    for room in data["rooms"]:
+        room = dict(room, doors=[])
+        room.pop("furnitures", None)  # Regeradas para as novas dimensões
+        room["x"] *= scale_x
+        room["width"] *= scale_x
+        room["y"] *= scale_y
+        room["length"] *= scale_y
+        room["floor"] = min(room["floor"], top_floor)
+        if room["type"] == data["special_room"]:
+            room["type"] = special_room
+        rooms.append(room)
+
+    # Remove os cômodos excedentes do programa anterior (os faltantes ficam a cargo da evolução)
+    limits = program_rooms(*program)
+    limits.setdefault("Escadas", 0)
+    kept = []
+    for room in rooms:
+        limit = limits.get(room["type"])
+        if limit is not None:
+            if limit <= 0:
+                continue
+            limits[room["type"]] = limit - 1
+        kept.append(room)
+
+    return plan_from_dict(
+        dict(
+            data, area=area, orientation=orientation, house_type=house_type, special_room=special_room,
+            bedrooms=bedrooms, bathrooms=bathrooms, closets=closets,
+            house_width=dimensions[0], house_length=dimensions[1], rooms=kept,
+        ),
+        profile,
+    )
+
+
+def seed_population(
+    library: EliteLibrary, size: int, area: float, orientation: str, program: Program,
+    profile: Optional[EvaluationProfile] = None
+) -> List[FloorPlan]:
+    """
+    Gera até `size` plantas iniciais a partir da biblioteca, priorizando programas idênticos.
+    Quando há menos plantas que o pedido, as existentes são reaproveitadas com pequenas variações
+    de envelope (proporção sorteada em torno da original).
+
+    Args:
+        library (EliteLibrary): A biblioteca.
+        size (int): Número máximo de plantas.
+        area (float): Área do novo pedido.
+        orientation (str): Orientação do novo pedido.
+        program (Program): Programa do novo pedido.
+        profile (Optional[EvaluationProfile]): Perfil de avaliação.
+
+    Returns:
+        List[FloorPlan]: Plantas adaptadas ao novo pedido.
+    """
+
+    candidates = library.candidates(program)
+    if not candidates:
+        return []
+
+    seeded = []
+    for index in range(size):
+        data = candidates[index % len(candidates)]
+        dimensions = None
+        if index >= len(candidates):
+            # Repetições recebem um envelope ligeiramente diferente, para manter a diversidade
+            factor = math.sqrt(area / data["area"])
+            stretch = random.uniform(0.9, 1.1)
+            dimensions = (data["house_width"] * factor * stretch, data["house_length"] * factor / stretch)
+        seeded.append(adapt_plan(data, area, orientation, program, dimensions, profile))
+
+    return seeded
@@ -0,0 +1,406 @@
+import json
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+from models import FloorPlan, Room
+from profiles import EvaluationProfile
+
+
+def room_to_dict(room: Room) -> Dict[str, Any]:
+    """
+    Converte um cômodo em um dicionário serializável em JSON.
+
+    Args:
+        room (Room): O cômodo.
+
+    Returns:
+        Dict[str, Any]: Dados do cômodo.
+    """
+
+    return {
+        "type": room.type,
+        "floor": room.floor,
+        "x": room.x,
+        "y": room.y,
+        "width": room.width,
+        "length": room.length,
+        "windows": room.windows,
+        "doors": [list(door) for door in room.door_positions],
+        "furnitures": [
+            {
+                "type": furniture["type"],
+                "width": furniture["width"],
+                "length": furniture["length"],
+                "position": list(furniture["position"]),
+            }
+            for furniture in room.furnitures
+        ],
+    }
+
+
+def room_from_dict(data: Dict[str, Any]) -> Room:
+    """
+    Reconstrói um cômodo a partir do dicionário gerado por room_to_dict.
+
+    Args:
+        data (Dict[str, Any]): Dados do cômodo.
+
+    Returns:
+        Room: O cômodo reconstruído.
+    """
+
+    room = Room(data["type"], data["floor"], data["x"], data["y"], data["width"], data["length"])
+    room.windows = data.get("windows", room.windows)
+    room.door_positions = [tuple(door) for door in data.get("doors", [])]
+    if "furnitures" in data:
+        room.furnitures = [
+            {
+                "type": furniture["type"],
+                "width": furniture["width"],
+                "length": furniture["length"],
+                "position": tuple(furniture["position"]),
+            }
+            for furniture in data["furnitures"]
+        ]
+
+    return room
+
+
+def plan_to_dict(plan: FloorPlan) -> Dict[str, Any]:
+    """
+    Converte uma planta em um dicionário serializável em JSON, incluindo o detalhamento do fitness.
+
+    Args:
+        plan (FloorPlan): A planta.
+
+    Returns:
+        Dict[str, Any]: Dados da planta.
+    """
+
+    return {
+        "area": plan.area,
+        "orientation": plan.orientation,
+        "house_type": plan.house_type,
+        "special_room": plan.special_room,
+        "bedrooms": plan.bedrooms,
+        "bathrooms": plan.bathrooms,
+        "closets": plan.closets,
+        "house_width": plan.house_width,
+        "house_length": plan.house_length,
+        "floors": plan.max_floor,
+        "profile": plan.profile.name,
+        "fitness": plan.fitness,
+        "fitness_components": dict(plan.fitness_components),
+        "constraint_violation": plan.constraint_violation,
+        "rooms": [room_to_dict(room) for room in plan.rooms],
+    }
+
+
+def plan_from_dict(data: Dict[str, Any], profile: Optional[EvaluationProfile] = None) -> FloorPlan:
+    """
+    Reconstrói uma planta a partir do dicionário gerado por plan_to_dict. O fitness é
+    recalculado com o perfil informado (ou o padrão).
+
+    Args:
+        data (Dict[str, Any]): Dados da planta.
+        profile (Optional[EvaluationProfile]): Perfil de avaliação.
+
+    Returns:
+        FloorPlan: A planta reconstruída.
+    """
+
+    return FloorPlan(
+        area=data["area"],
+        orientation=data["orientation"],
+        house_type=data["house_type"],
+        special_room=data["special_room"],
+        bedrooms=data["bedrooms"],
+        bathrooms=data["bathrooms"],
+        closets=data["closets"],
+        rooms=[room_from_dict(room) for room in data["rooms"]],
+        dimensions=(data["house_width"], data["house_length"]),
+        profile=profile,
+    )
+
+
+def _rectangle(x: float, y: float, width: float, length: float) -> Dict[str, Any]:
+    """
+    Monta a geometria GeoJSON (Polygon) de um retângulo, em metros no sistema local da planta.
+
+    Args:
+        x (float): Posição X.
+        y (float): Posição Y.
+        width (float): Largura.
+        length (float): Comprimento.
+
+    Returns:
+        Dict[str, Any]: Geometria GeoJSON.
+    """
+
+    return {
+        "type": "Polygon",
+        "coordinates": [[[x, y], [x + width, y], [x + width, y + length], [x, y + length], [x, y]]],
+    }
+
+
+def plan_to_features(plan: FloorPlan, plan_id: int) -> List[Dict[str, Any]]:
+    """
+    Converte uma planta em features GeoJSON: o contorno da casa (com os dados da planta),
+    os cômodos, as portas e as mobílias. As coordenadas são em metros no sistema local da planta.
+
+    Args:
+        plan (FloorPlan): A planta.
+        plan_id (int): Identificador da planta no arquivo.
+
+    Returns:
+        List[Dict[str, Any]]: Features GeoJSON da planta.
+    """
+
+    data = plan_to_dict(plan)
+    rooms = data.pop("rooms")
+
+    features = [{
+        "type": "Feature",
+        "geometry": _rectangle(0, 0, plan.house_width, plan.house_length),
+        "properties": {"kind": "plan", "plan": plan_id, **data},
+    }]
+
+    for index, room in enumerate(rooms):
+        features.append({
+            "type": "Feature",
+            "geometry": _rectangle(room["x"], room["y"], room["width"], room["length"]),
+            "properties": {
+                "kind": "room", "plan": plan_id, "room": index,
+                "type": room["type"], "floor": room["floor"], "windows": room["windows"],
+                "width": room["width"], "length": room["length"],
+            },
+        })
+        for door in room["doors"]:
+            features.append({
+                "type": "Feature",
+                "geometry": _rectangle(*door),
+                "properties": {
+                    "kind": "door", "plan": plan_id, "room": index, "floor": room["floor"],
+                    "width": door[2], "length": door[3],
+                },
+            })
+        for furniture in room["furnitures"]:
+            features.append({
+                "type": "Feature",
+                "geometry": _rectangle(
+                    room["x"] + furniture["position"][0], room["y"] + furniture["position"][1],
+                    furniture["width"], furniture["length"]
+                ),
+                "properties": {
+                    "kind": "furniture", "plan": plan_id, "room": index, "floor": room["floor"],
+                    "type": furniture["type"], "width": furniture["width"], "length": furniture["length"],
+                },
+            })
+
+    return features
+
+
+def _bounds(feature: Dict[str, Any]) -> Tuple[float, float, float, float]:
+    """
+    Extrai posição e dimensões do retângulo de uma feature. As dimensões vêm das propriedades
+    "width" e "length", quando presentes, porque recalculá-las pela diferença das coordenadas
+    não devolve exatamente os valores originais.
+
+    Args:
+        feature (Dict[str, Any]): Feature GeoJSON gerada por plan_to_features.
+
+    Returns:
+        Tuple[float, float, float, float]: Posição X, posição Y, largura e comprimento.
+    """
+
+    ring = feature["geometry"]["coordinates"][0]
+    (x, y), (x_end, _), (_, y_end) = ring[0], ring[1], ring[2]
+    properties = feature["properties"]
+    return x, y, properties.get("width", x_end - x), properties.get("length", y_end - y)
+
+
+def features_to_plan_dict(features: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Reagrupa as features de uma planta no dicionário de plan_to_dict.
+
+    Args:
+        features (List[Dict[str, Any]]): Features de uma única planta.
+
+    Returns:
+        Dict[str, Any]: Dados da planta.
+    """
+
+    data: Dict[str, Any] = {}
+    rooms: Dict[int, Dict[str, Any]] = {}
+
+    for feature in features:
+        properties = dict(feature["properties"])
+        kind = properties.pop("kind")
+        if kind == "plan":
+            properties.pop("plan")
+            data.update(properties)
+        elif kind == "room":
+            x, y, width, length = _bounds(feature)
+            rooms[properties["room"]] = {
+                "type": properties["type"], "floor": properties["floor"], "windows": properties["windows"],
+                "x": x, "y": y, "width": width, "length": length, "doors": [], "furnitures": [],
+            }
+        elif kind == "door":
+            rooms[properties["room"]]["doors"].append(list(_bounds(feature)))
+        elif kind == "furniture":
+            room = rooms[properties["room"]]
+            x, y, width, length = _bounds(feature)
+            room["furnitures"].append({
+                "type": properties["type"], "width": width, "length": length,
+                "position": [round(x - room["x"], 6), round(y - room["y"], 6)],
+            })
+
+    data["rooms"] = [rooms[index] for index in sorted(rooms)]
+    return data
+
+
+class PlanWriter:
+    def __init__(self, path: str, file_format: str = "json"):
+        """
+        Escritor incremental de plantas em JSON (lista de plantas) ou GeoJSON (FeatureCollection).
+
+        Cada planta (ou feature) é escrita em uma única linha assim que recebida, de modo que
+        lotes com dezenas de milhares de plantas nunca precisam ficar inteiros em memória.
+        O arquivo resultante é JSON válido e pode ser lido de volta de forma incremental
+        com read_plans.
+
+        Args:
+            path (str): Caminho do arquivo de saída.
+            file_format (str): "json" ou "geojson".
+        """
+
+        if file_format not in ("json", "geojson"):
+            raise ValueError(f"Formato de exportação desconhecido: {file_format}")
+
+        self.path: str = path
+        self.file_format: str = file_format
+        self.count: int = 0
+        self._file: Optional[IO[str]] = None
+        self._first_line: bool = True
+
+    def __enter__(self) -> 'PlanWriter':
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """
+        Abre o arquivo e escreve o cabeçalho.
+        """
+
+        self._file = open(self.path, "w", encoding="utf-8")
+        if self.file_format == "json":
+            self._file.write("[\n")
+        else:
+            self._file.write('{"type": "FeatureCollection", "features": [\n')
+
+    def _write_line(self, item: Dict[str, Any]) -> None:
+        """
+        Escreve um item da lista em uma linha própria.
+
+        Args:
+            item (Dict[str, Any]): Item a ser escrito.
+        """
+
+        if not self._first_line:
+            self._file.write(",\n")
+        self._file.write(json.dumps(item, ensure_ascii=False))
+        self._first_line = False
+
+    def write(self, plan: FloorPlan) -> None:
+        """
+        Escreve uma planta no arquivo.
+
+        Args:
+            plan (FloorPlan): A planta.
+        """
+
+        if self.file_format == "json":
+            self._write_line(plan_to_dict(plan))
+        else:
+            for feature in plan_to_features(plan, self.count):
+                self._write_line(feature)
+        self.count += 1
+
+    def close(self) -> None:
+        """
+        Escreve o rodapé e fecha o arquivo.
+        """
+
+        if self._file is None:
+            return
+
+        self._file.write("\n]\n" if self.file_format == "json" else "\n]}\n")
+        self._file.close()
+        self._file = None
+
+
+def _iter_items(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Lê, linha a linha, os itens da lista de um arquivo escrito por PlanWriter.
+
+    Args:
+        path (str): Caminho do arquivo.
+
+    Returns:
+        Iterator[Dict[str, Any]]: Itens (plantas ou features) na ordem do arquivo.
+    """
+
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            line = line.strip().rstrip(",")
+            if line.startswith("{") and not line.startswith('{"type": "FeatureCollection"'):
+                yield json.loads(line)
+
+
+def iter_plan_dicts(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Lê de forma incremental os dicionários das plantas de um arquivo JSON ou GeoJSON escrito por PlanWriter.
+
+    Args:
+        path (str): Caminho do arquivo.
+
+    Returns:
+        Iterator[Dict[str, Any]]: Dados de cada planta, no formato de plan_to_dict.
+    """
+
+    current_id = None
+    features: List[Dict[str, Any]] = []
+
+    for item in _iter_items(path):
+        if item.get("type") != "Feature":
+            yield item
+            continue
+
+        # As features de uma planta são escritas de forma contígua
+        plan_id = item["properties"]["plan"]
+        if plan_id != current_id and features:
+            yield features_to_plan_dict(features)
+            features = []
+        current_id = plan_id
+        features.append(item)
+
+    if features:
+        yield features_to_plan_dict(features)
+
+
+def read_plans(path: str, profile: Optional[EvaluationProfile] = None) -> Iterator[FloorPlan]:
+    """
+    Lê de forma incremental as plantas de um arquivo JSON ou GeoJSON escrito por PlanWriter.
+
+    Args:
+        path (str): Caminho do arquivo.
+        profile (Optional[EvaluationProfile]): Perfil usado para recalcular o fitness.
+
+    Returns:
+        Iterator[FloorPlan]: Plantas reconstruídas.
+    """
+
+    for data in iter_plan_dicts(path):
+        yield plan_from_dict(data, profile)
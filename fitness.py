@@ -0,0 +1,267 @@
+from collections import deque
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, List
+
+from adjacency import find_shared_walls, shared_wall_between
+from constants import FITNESS_PARAMETERS
+from spatial_index import nearby_pairs
+
+if TYPE_CHECKING:
+    from models import FloorPlan
+
+SOCIAL_AREAS = ("Sala de Estar", "Sala de Jantar", "Cozinha")
+PRIVATE_AREAS = ("Quarto", "Banheiro", "Closet")
+ENTRANCE_ROOMS = ("Sala de Estar",)
+
+UNREACHABLE = float('inf')
+
+# Critérios de avaliação, na ordem usada como objetivos na otimização multiobjetivo
+OBJECTIVES = (
+    "area_utilization",
+    "area_separation",
+    "circulation",
+    "natural_light",
+    "external_connections",
+    "staircase_position",
+)
+
+
+class PlanGraph:
+    def __init__(self, plan: 'FloorPlan'):
+        """
+        Grafo de cômodos de uma planta: cômodos são vértices, paredes compartilhadas são arestas
+        e as escadas ligam os andares. É montado uma única vez por avaliação e reutilizado por
+        todos os termos de fitness; as buscas em largura também ficam em cache.
+
+        Args:
+            plan (FloorPlan): A planta a ser representada.
+        """
+
+        self.rooms = plan.rooms
+        self.neighbors: List[List[int]] = [[] for _ in self.rooms]
+        self._distances: Dict[FrozenSet[int], List[float]] = {}
+
+        # No modo discreto, a adjacência é testada com as máscaras de ocupação deslocadas
+        self.bitboard = plan.bitboard
+        self.masks: List[int] = list(plan.room_masks()) if self.bitboard is not None else []
+        # Vizinhança de cada máscara, montada uma única vez: a adjacência vira um único E bit a bit
+        self.neighborhoods: List[int] = [self.bitboard.neighborhood(mask) for mask in self.masks]
+
+        if self.bitboard is None:
+            for wall in find_shared_walls(self.rooms):
+                self.link(wall.room1, wall.room2)
+            self.link_staircases()
+        else:
+            # Só os pares próximos (a até um módulo) no índice espacial podem ser adjacentes; as
+            # escadas de andares diferentes são ligadas entre si em qualquer posição
+            for index1, index2 in nearby_pairs(self.rooms, self.bitboard.module):
+                if self.connected(index1, index2):
+                    self.link(index1, index2)
+            staircases = self.indices_of(("Escadas",))
+            for position, index1 in enumerate(staircases):
+                for index2 in staircases[position + 1:]:
+                    if self.connected(index1, index2):
+                        self.link(index1, index2)
+
+    def link(self, index1: int, index2: int) -> None:
+        """
+        Adiciona uma aresta entre dois cômodos, se ainda não existir.
+
+        Args:
+            index1 (int): Índice do primeiro cômodo.
+            index2 (int): Índice do segundo cômodo.
+        """
+
+        if index2 not in self.neighbors[index1]:
+            self.neighbors[index1].append(index2)
+            self.neighbors[index2].append(index1)
+
+    def link_staircases(self) -> None:
+        """
+        Liga as escadas entre andares: escadas de andares diferentes são conectadas entre si,
+        e, como a projeção da escada é reservada em todos os andares, cada escada é conectada
+        aos cômodos de outros andares que compartilham parede com essa projeção.
+        """
+
+        staircases = self.indices_of(("Escadas",))
+        for position, stair_index in enumerate(staircases):
+            stair = self.rooms[stair_index]
+            for other_stair in staircases[position + 1:]:
+                if self.rooms[other_stair].floor != stair.floor:
+                    self.link(stair_index, other_stair)
+
+            projection = stair.copy()
+            for index, room in enumerate(self.rooms):
+                if room.floor == stair.floor or room.type == "Escadas":
+                    continue
+                projection.floor = room.floor
+                if shared_wall_between(projection, room) is not None:
+                    self.link(stair_index, index)
+
+    def connected(self, index1: int, index2: int) -> bool:
+        """
+        Verifica se dois cômodos devem estar ligados no grafo (mesma regra de find_shared_walls e
+        link_staircases, aplicada a um único par).
+
+        Args:
+            index1 (int): Índice do primeiro cômodo.
+            index2 (int): Índice do segundo cômodo.
+
+        Returns:
+            bool: True se os cômodos compartilham parede (diretamente ou pela projeção de uma escada).
+        """
+
+        room1, room2 = self.rooms[index1], self.rooms[index2]
+        if self.bitboard is not None:
+            if room1.floor != room2.floor and room1.type == "Escadas" and room2.type == "Escadas":
+                return True
+            return self.neighborhoods[index1] & self.masks[index2] != 0 and room1.shares_floor(room2)
+
+        if shared_wall_between(room1, room2) is not None:
+            return True
+        if room1.floor == room2.floor:
+            return False
+
+        stair, other = (room1, room2) if room1.type == "Escadas" else (room2, room1)
+        if stair.type != "Escadas":
+            return False
+        if other.type == "Escadas":
+            return True
+
+        projection = stair.copy()
+        projection.floor = other.floor
+        return shared_wall_between(projection, other) is not None
+
+    def relink(self, index: int) -> None:
+        """
+        Refaz as arestas de um cômodo após ele ser movido ou redimensionado, sem remontar o grafo
+        inteiro, e descarta as buscas em largura em cache.
+
+        Args:
+            index (int): Índice do cômodo alterado.
+        """
+
+        for neighbor in self.neighbors[index]:
+            self.neighbors[neighbor].remove(index)
+        self.neighbors[index] = []
+
+        if self.bitboard is not None:
+            self.masks[index] = self.bitboard.mask(self.rooms[index])
+            self.neighborhoods[index] = self.bitboard.neighborhood(self.masks[index])
+
+        for other in range(len(self.rooms)):
+            if other != index and self.connected(index, other):
+                self.link(index, other)
+
+        self._distances.clear()
+
+    def indices_of(self, room_types: Iterable[str]) -> List[int]:
+        """
+        Retorna os índices dos cômodos de determinados tipos.
+
+        Args:
+            room_types (Iterable[str]): Tipos de cômodo.
+
+        Returns:
+            List[int]: Índices dos cômodos encontrados.
+        """
+
+        room_types = set(room_types)
+        return [index for index, room in enumerate(self.rooms) if room.type in room_types]
+
+    def distances_from(self, sources: Iterable[int]) -> List[float]:
+        """
+        Calcula, por busca em largura a partir de várias origens, o número de passagens entre
+        cada cômodo e a origem mais próxima. O resultado fica em cache para o mesmo conjunto de origens.
+
+        Args:
+            sources (Iterable[int]): Índices dos cômodos de origem.
+
+        Returns:
+            List[float]: Distância (em arestas) de cada cômodo; UNREACHABLE se não houver caminho.
+        """
+
+        key = frozenset(sources)
+        if key in self._distances:
+            return self._distances[key]
+
+        distances = [UNREACHABLE] * len(self.rooms)
+        queue = deque()
+        for source in key:
+            distances[source] = 0
+            queue.append(source)
+
+        while queue:
+            current = queue.popleft()
+            for neighbor in self.neighbors[current]:
+                if distances[neighbor] == UNREACHABLE:
+                    distances[neighbor] = distances[current] + 1
+                    queue.append(neighbor)
+
+        self._distances[key] = distances
+        return distances
+
+
+def area_separation_score(
+    graph: PlanGraph,
+    reward: float = FITNESS_PARAMETERS["separation_reward"],
+    penalty: float = FITNESS_PARAMETERS["separation_penalty"]
+) -> float:
+    """
+    Pontua a separação entre áreas sociais e íntimas pela distância no grafo: cômodos íntimos
+    que compartilham parede com uma área social são penalizados, e os que estão a duas ou mais
+    passagens de distância são valorizados.
+
+    Args:
+        graph (PlanGraph): Grafo da planta.
+        reward (float): Pontuação de cada cômodo íntimo afastado das áreas sociais.
+        penalty (float): Penalidade de cada cômodo íntimo encostado em uma área social.
+
+    Returns:
+        float: Pontuação da separação de áreas.
+    """
+
+    social = graph.indices_of(SOCIAL_AREAS)
+    if not social:
+        return 0
+
+    distances = graph.distances_from(social)
+
+    score = 0
+    for index in graph.indices_of(PRIVATE_AREAS):
+        if distances[index] == 1:
+            score -= penalty
+        elif distances[index] != UNREACHABLE:
+            score += reward
+
+    return score
+
+
+def circulation_score(
+    graph: PlanGraph,
+    reward: float = FITNESS_PARAMETERS["circulation_reward"],
+    depth_penalty: float = FITNESS_PARAMETERS["circulation_depth_penalty"]
+) -> float:
+    """
+    Pontua a circulação a partir da entrada: valoriza a fração de cômodos alcançáveis e
+    penaliza a profundidade média dos caminhos.
+
+    Args:
+        graph (PlanGraph): Grafo da planta.
+        reward (float): Pontuação máxima, multiplicada pela fração de cômodos alcançáveis.
+        depth_penalty (float): Penalidade por passagem de profundidade média.
+
+    Returns:
+        float: Pontuação da circulação.
+    """
+
+    entrances = graph.indices_of(ENTRANCE_ROOMS)
+    if not entrances or len(graph.rooms) < 2:
+        return 0
+
+    distances = graph.distances_from(entrances)
+    reachable = [distance for distance in distances if distance != UNREACHABLE]
+
+    reachable_fraction = len(reachable) / len(distances)
+    mean_depth = sum(reachable) / len(reachable)
+
+    return reward * reachable_fraction - depth_penalty * mean_depth
@@ -0,0 +1,159 @@
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from models import FloorPlan
+
+# Resultado memorizado: fitness, número de violações e valor de cada critério
+CachedEvaluation = Tuple[float, int, Dict[str, float]]
+
+# Genoma canônico usado como chave do cache (ver FitnessCache.key)
+CacheKey = Tuple[Any, ...]
+
+
+class FitnessCache:
+    def __init__(self, max_size: int = 20000, quantum: float = 0.001):
+        """
+        Cache LRU de avaliações de fitness, indexado pelo genoma canônico da planta.
+
+        O genoma é representado pelo programa, pelo perfil de avaliação, pelo envelope e pela
+        lista ordenada de cômodos (tipo, andar, posição e dimensões arredondadas para `quantum`).
+        A ordenação torna a chave independente da ordem dos cômodos, de modo que cópias e
+        permutações de uma mesma planta compartilham a avaliação. A chave é a própria tupla,
+        comparada por igualdade no dicionário: uma colisão de hash nunca devolve a avaliação
+        de outra planta.
+
+        Args:
+            max_size (int): Número máximo de avaliações guardadas.
+            quantum (float): Resolução (em metros) usada ao arredondar as coordenadas.
+        """
+
+        self.max_size: int = max_size
+        self.quantum: float = quantum
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: "OrderedDict[CacheKey, CachedEvaluation]" = OrderedDict()
+
+    def key(self, plan: 'FloorPlan') -> CacheKey:
+        """
+        Calcula o genoma canônico da planta.
+
+        Args:
+            plan (FloorPlan): A planta.
+
+        Returns:
+            CacheKey: Genoma canônico.
+        """
+
+        scale = 1 / self.quantum
+        rooms = sorted(
+            (room.type, room.floor, round(room.x * scale), round(room.y * scale),
+             round(room.width * scale), round(room.length * scale))
+            for room in plan.rooms
+        )
+
+        return (
+            plan.profile.fingerprint, plan.house_type, plan.special_room, plan.bedrooms, plan.bathrooms, plan.closets,
+            round(plan.house_width * scale), round(plan.house_length * scale), tuple(rooms),
+        )
+
+    def get(self, key: CacheKey) -> Optional[CachedEvaluation]:
+        """
+        Busca uma avaliação no cache, atualizando os contadores de acertos e falhas.
+
+        Args:
+            key (CacheKey): Genoma canônico.
+
+        Returns:
+            Optional[CachedEvaluation]: A avaliação memorizada ou None.
+        """
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: CacheKey, evaluation: CachedEvaluation) -> None:
+        """
+        Guarda uma avaliação, descartando a menos usada recentemente se o cache estiver cheio.
+
+        Args:
+            key (CacheKey): Genoma canônico.
+            evaluation (CachedEvaluation): A avaliação.
+        """
+
+        self._entries[key] = evaluation
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Esvazia o cache e zera os contadores.
+        """
+
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def counters(self) -> Tuple[int, int]:
+        """
+        Contadores acumulados desde a criação (ou o último clear()) do cache.
+
+        Returns:
+            Tuple[int, int]: Acertos e falhas.
+        """
+
+        return self.hits, self.misses
+
+    def stats(self, counters: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
+        """
+        Estatísticas do cache. O cache é compartilhado por todas as execuções do processo
+        (ver get_fitness_cache); para relatar apenas uma execução, passe os acertos e falhas
+        contados durante ela (diferenças de counters()).
+
+        Args:
+            counters (Optional[Tuple[int, int]]): Acertos e falhas relatados; por padrão, os acumulados.
+
+        Returns:
+            Dict[str, Any]: Acertos, falhas, taxa de acerto e tamanho atual.
+        """
+
+        hits, misses = counters if counters is not None else self.counters()
+        lookups = hits + misses
+        return {
+            "cache_hits": hits,
+            "cache_misses": misses,
+            "cache_hit_rate": hits / lookups if lookups else 0.0,
+            "cache_size": len(self._entries),
+        }
+
+
+_CACHE: Optional[FitnessCache] = FitnessCache()
+
+
+def get_fitness_cache() -> Optional[FitnessCache]:
+    """
+    Retorna o cache usado por FloorPlan.calculate_fitness (None se desativado).
+
+    Returns:
+        Optional[FitnessCache]: O cache atual.
+    """
+
+    return _CACHE
+
+
+def set_fitness_cache(cache: Optional[FitnessCache]) -> None:
+    """
+    Substitui (ou desativa, com None) o cache usado por FloorPlan.calculate_fitness.
+
+    Args:
+        cache (Optional[FitnessCache]): O novo cache.
+    """
+
+    global _CACHE
+    _CACHE = cache
@@ -0,0 +1,174 @@
+from functools import lru_cache
+from typing import List, Tuple
+
+from constants import FURNITURE_CLEARANCE, FURNITURE_QUANTUM, FURNITURES
+
+Rectangle = Tuple[float, float, float, float]
+
+
+def _overlaps(rectangle: Rectangle, occupied: List[Rectangle]) -> bool:
+    """
+    Verifica se um retângulo sobrepõe algum dos retângulos ocupados.
+
+    Args:
+        rectangle (Rectangle): Retângulo (x, y, largura, comprimento).
+        occupied (List[Rectangle]): Retângulos já ocupados.
+
+    Returns:
+        bool: True se houver sobreposição, False caso contrário.
+    """
+
+    x, y, width, length = rectangle
+    for (x_occ, y_occ, width_occ, length_occ) in occupied:
+        if x < x_occ + width_occ and x + width > x_occ and y < y_occ + length_occ and y + length > y_occ:
+            return True
+    return False
+
+
+def _wall_placements(
+    wall: str, room_width: float, room_length: float, depth: float, span: float,
+    clearance: float, offset: float
+) -> Tuple[Rectangle, Rectangle]:
+    """
+    Calcula a área ocupada por um móvel encostado em uma parede e a área livre à sua frente.
+
+    Args:
+        wall (str): "bottom" (y = 0), "top", "left" (x = 0) ou "right".
+        room_width (float): Largura do cômodo.
+        room_length (float): Comprimento do cômodo.
+        depth (float): Profundidade do móvel (perpendicular à parede).
+        span (float): Extensão do móvel ao longo da parede.
+        clearance (float): Profundidade da área livre.
+        offset (float): Posição do móvel ao longo da parede.
+
+    Returns:
+        Tuple[Rectangle, Rectangle]: Área do móvel e área livre à frente.
+    """
+
+    if wall == "bottom":
+        return (offset, 0.0, span, depth), (offset, depth, span, clearance)
+    if wall == "top":
+        return (offset, room_length - depth, span, depth), (offset, room_length - depth - clearance, span, clearance)
+    if wall == "left":
+        return (0.0, offset, depth, span), (depth, offset, clearance, span)
+    return (room_width - depth, offset, depth, span), (room_width - depth - clearance, offset, clearance, span)
+
+
+def pack_furnitures(room_type: str, width: float, length: float, clearance: float = FURNITURE_CLEARANCE) -> List[dict]:
+    """
+    Posiciona as mobílias do cômodo em faixas ao longo das paredes, de forma determinística.
+
+    Os móveis são colocados do maior para o menor, sempre com o lado maior encostado na parede.
+    Cada móvel reserva uma área livre à sua frente (clearance), que não pode ser ocupada por
+    outros móveis. As posições candidatas em cada parede são o início da parede e o fim de
+    cada área já ocupada; o primeiro encaixe válido é usado.
+
+    Args:
+        room_type (str): Tipo do cômodo.
+        width (float): Largura do cômodo.
+        length (float): Comprimento do cômodo.
+        clearance (float): Profundidade da área livre à frente de cada móvel.
+
+    Returns:
+        List[dict]: Lista de mobílias com seus tipos, dimensões e posições (relativas ao cômodo).
+    """
+
+    items = sorted(FURNITURES.get(room_type, []), key=lambda item: item[1] * item[2], reverse=True)
+
+    furnitures = []
+    footprints: List[Rectangle] = []  # Área dos móveis
+    clearances: List[Rectangle] = []  # Área livre à frente dos móveis
+
+    for furniture_type, furniture_width, furniture_length in items:
+        depth, span = min(furniture_width, furniture_length), max(furniture_width, furniture_length)
+
+        for wall in ("bottom", "top", "left", "right"):
+            wall_length = width if wall in ("bottom", "top") else length
+            wall_depth = length if wall in ("bottom", "top") else width
+            if span > wall_length or depth + clearance > wall_depth:
+                continue
+
+            # Posições candidatas: início da parede e fim de cada área ocupada, projetado na parede
+            axis = 0 if wall in ("bottom", "top") else 1
+            offsets = sorted({0.0} | {rect[axis] + rect[axis + 2] for rect in footprints + clearances})
+
+            placed = False
+            for offset in offsets:
+                if offset + span > wall_length:
+                    continue
+                footprint, free_area = _wall_placements(wall, width, length, depth, span, clearance, offset)
+                if _overlaps(footprint, footprints + clearances) or _overlaps(free_area, footprints):
+                    continue
+
+                footprints.append(footprint)
+                clearances.append(free_area)
+                furnitures.append({
+                    "type": furniture_type,
+                    "width": footprint[2],
+                    "length": footprint[3],
+                    "position": (round(footprint[0], 3), round(footprint[1], 3)),
+                })
+                placed = True
+                break
+
+            if placed:
+                break
+
+    return furnitures
+
+
+@lru_cache(maxsize=4096)
+def _cached_layout(room_type: str, width_units: int, length_units: int) -> Tuple[Tuple[str, float, float, Tuple[float, float]], ...]:
+    """
+    Layout memorizado para um tipo de cômodo e dimensões quantizadas.
+
+    Args:
+        room_type (str): Tipo do cômodo.
+        width_units (int): Largura em múltiplos de FURNITURE_QUANTUM.
+        length_units (int): Comprimento em múltiplos de FURNITURE_QUANTUM.
+
+    Returns:
+        Tuple[Tuple[str, float, float, Tuple[float, float]], ...]: Mobílias (tipo, largura, comprimento, posição).
+    """
+
+    layout = pack_furnitures(room_type, width_units * FURNITURE_QUANTUM, length_units * FURNITURE_QUANTUM)
+    return tuple((item["type"], item["width"], item["length"], item["position"]) for item in layout)
+
+
+def furnish_room(room_type: str, width: float, length: float) -> List[dict]:
+    """
+    Retorna as mobílias de um cômodo, reaproveitando o layout de cômodos do mesmo tipo e de
+    dimensões equivalentes (arredondadas para baixo em FURNITURE_QUANTUM, de modo que o
+    layout sempre cabe no cômodo real).
+
+    Args:
+        room_type (str): Tipo do cômodo.
+        width (float): Largura do cômodo.
+        length (float): Comprimento do cômodo.
+
+    Returns:
+        List[dict]: Lista de mobílias com seus tipos, dimensões e posições.
+    """
+
+    if room_type not in FURNITURES:
+        return []
+
+    # Pequena folga evita que erros de ponto flutuante reduzam uma unidade
+    width_units = int(width / FURNITURE_QUANTUM + 1e-9)
+    length_units = int(length / FURNITURE_QUANTUM + 1e-9)
+
+    return [
+        {"type": furniture_type, "width": furniture_width, "length": furniture_length, "position": position}
+        for furniture_type, furniture_width, furniture_length, position in _cached_layout(room_type, width_units, length_units)
+    ]
+
+
+def layout_cache_info():
+    """
+    Estatísticas do cache de layouts (acertos, falhas e tamanho).
+
+    Returns:
+        CacheInfo: Estatísticas retornadas por functools.lru_cache.
+    """
+
+    return _cached_layout.cache_info()
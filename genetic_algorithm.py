@@ -1,7 +1,20 @@
+import pickle
 import random
-from typing import List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
+import numpy as np
+
+from diversity import distance_matrix, population_diversity, remove_duplicates, subset_distances
+from elite_library import EliteLibrary, seed_population
+from fitness_cache import get_fitness_cache
+from local_search import anneal
 from models import FloorPlan, Room
+from parallel_evaluation import ParallelEvaluator, evaluate_population
+from plan_archive import PlanArchive
+from profiles import EvaluationProfile, default_profile
+from spatial_index import SpatialIndex
+from surrogate import SurrogateScreen
+from nsga2 import fast_non_dominated_sort, rank_population
 
 
 def selection(population: List[FloorPlan]) -> Tuple[FloorPlan, FloorPlan]:
@@ -15,20 +28,100 @@ def selection(population: List[FloorPlan]) -> Tuple[FloorPlan, FloorPlan]:
         Tuple[FloorPlan, FloorPlan]: Dois indivíduos selecionados para reprodução.
     """
 
-    total_fitness = sum(plan.fitness for plan in population)
-    selection_probabilities = [plan.fitness / total_fitness for plan in population]
+    # Desloca os valores de fitness para que sejam todos positivos (plantas inválidas têm fitness negativo)
+    min_fitness = min(plan.fitness for plan in population)
+    weights = [plan.fitness - min_fitness + 1 for plan in population]
+    total_fitness = sum(weights)
+    selection_probabilities = [weight / total_fitness for weight in weights]
 
     return random.choices(population, weights=selection_probabilities, k=2)
 
 
-def crossover(parent1: FloorPlan, parent2: FloorPlan) -> FloorPlan:
+def tournament_selection(population: List[FloorPlan]) -> Tuple[FloorPlan, FloorPlan]:
+    """
+    Seleciona dois indivíduos por torneio binário em uma população já ordenada do melhor
+    para o pior (usada no modo multiobjetivo, em que a ordem vem do NSGA-II).
+
+    Args:
+        population (List[FloorPlan]): A população ordenada.
+
+    Returns:
+        Tuple[FloorPlan, FloorPlan]: Dois indivíduos selecionados para reprodução.
+    """
+
+    winners = [min(random.sample(range(len(population)), min(2, len(population)))) for _ in range(2)]
+    return population[winners[0]], population[winners[1]]
+
+
+def _objective_arrays(population: List[FloorPlan]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Monta as matrizes de objetivos e de violações de restrição da população.
+
+    Args:
+        population (List[FloorPlan]): A população.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Objetivos (n, m) e violações (n,).
+    """
+
+    objectives = np.array([plan.objectives() for plan in population], dtype=float)
+    violations = np.array([plan.constraint_violation for plan in population], dtype=float)
+    return objectives, violations
+
+
+def pareto_survivors(population: List[FloorPlan], population_size: int) -> List[FloorPlan]:
+    """
+    Seleciona os sobreviventes pelo NSGA-II (frentes de não-dominância e distância de aglomeração).
+
+    Args:
+        population (List[FloorPlan]): População combinada (pais e filhos).
+        population_size (int): Número de sobreviventes.
+
+    Returns:
+        List[FloorPlan]: Sobreviventes, ordenados do melhor para o pior.
+    """
+
+    ranking = rank_population(*_objective_arrays(population))
+    return [population[index] for index in ranking[:population_size]]
+
+
+def pareto_front(population: List[FloorPlan]) -> List[FloorPlan]:
+    """
+    Retorna as plantas da primeira frente de não-dominância da população.
+
+    Args:
+        population (List[FloorPlan]): A população.
+
+    Returns:
+        List[FloorPlan]: Plantas não dominadas.
+    """
+
+    fronts = fast_non_dominated_sort(*_objective_arrays(population))
+    return [population[index] for index in fronts[0]]
+
+
+# Tentativas de posicionamento aleatório de cada cômodo herdado no crossover
+CROSSOVER_ATTEMPTS = 20
+
+
+def crossover(
+    parent1: FloorPlan, parent2: FloorPlan, repair_stats: Optional['RepairStats'] = None,
+    attempts: int = CROSSOVER_ATTEMPTS, evaluate: bool = True
+) -> FloorPlan:
     """
     Realiza o crossover entre dois indivíduos (pais) para gerar um novo indivíduo (filho).
-    Garante que o filho tenha arranjos de cômodos válidos.
+    Cômodos que não encontram posição livre em `attempts` tentativas e cômodos faltantes
+    ficam a cargo do reparo (repair_plan), aplicado antes da avaliação do filho.
 
     Args:
         parent1 (FloorPlan): O primeiro pai.
         parent2 (FloorPlan): O segundo pai.
+        repair_stats (Optional[RepairStats]): Contadores do reparo a serem atualizados. Com
+            evaluate=False, o reparo do filho fica pendente até RepairStats.settle, chamado após
+            a avaliação do lote.
+        attempts (int): Tentativas de posicionamento aleatório de cada cômodo herdado.
+        evaluate (bool): Se False, o filho é criado sem avaliação, para ser avaliado em lote
+            (ver parallel_evaluation.evaluate_population).
 
     Returns:
         FloorPlan: O novo indivíduo gerado a partir do crossover.
@@ -36,11 +129,11 @@ def crossover(parent1: FloorPlan, parent2: FloorPlan) -> FloorPlan:
 
     # Seleciona um ponto de corte aleatório
     cut = random.randint(1, min(len(parent1.rooms), len(parent2.rooms)) - 1)
-    # Combina os cômodos dos pais
-    child_rooms = parent1.rooms[:cut] + parent2.rooms[cut:]
+    # Combina os cômodos dos pais (cópias, para não alterar os pais)
+    child_rooms = [room.copy() for room in parent1.rooms[:cut] + parent2.rooms[cut:]]
 
     # Ajusta os cômodos para evitar sobreposições e fora dos limites
-    temporary_plan = FloorPlan(
+    child = FloorPlan(
         area=parent1.area,
         orientation=parent1.orientation,
         house_type=parent1.house_type,
@@ -48,124 +141,1315 @@ def crossover(parent1: FloorPlan, parent2: FloorPlan) -> FloorPlan:
         bedrooms=parent1.bedrooms,
         bathrooms=parent1.bathrooms,
         closets=parent1.closets,
-        rooms=[]
+        rooms=[],
+        dimensions=(parent1.house_width, parent1.house_length),
+        profile=parent1.profile,
+        evaluate=False
     )
 
     valid_rooms = []
+    placed = SpatialIndex()  # Cômodos já posicionados, para comparar cada tentativa só com os próximos
     for room in child_rooms:
-        for _ in range(100):
+        for attempt in range(attempts):
             # Verifica se o cômodo está dentro dos limites
-            if room.width > temporary_plan.house_width or room.length > temporary_plan.house_length:
+            if room.width > child.house_width or room.length > child.house_length:
                 # Ajusta as dimensões
-                room.width, room.length = temporary_plan.generate_room_dimensions(room.type)
+                room.width, room.length = child.generate_room_dimensions(room.type)
 
-            # Posiciona o cômodo aleatoriamente
-            room.x = random.uniform(0, temporary_plan.house_width - room.width)
-            room.y = random.uniform(0, temporary_plan.house_length - room.length)
+            # Na primeira tentativa mantém a posição herdada, se couber na planta
+            inherited_fits = (
+                0 <= room.x <= child.house_width - room.width and
+                0 <= room.y <= child.house_length - room.length
+            )
+            if attempt > 0 or not inherited_fits:
+                # Posiciona o cômodo aleatoriamente
+                room.x = random.uniform(0, child.house_width - room.width)
+                room.y = random.uniform(0, child.house_length - room.length)
 
             # Verifica se o cômodo não se sobrepõe com outros
-            if not temporary_plan.has_overlap(room, valid_rooms):
-                valid_rooms.append(room)
+            if not placed.overlaps(room):
                 break
-        else:
-            # Não foi possível posicionar o cômodo, ignora
-            pass
+        # Se não foi possível posicionar o cômodo, mantém a última posição e deixa a separação para o reparo
+        valid_rooms.append(room)
+        placed.add(room)
 
-    child = FloorPlan(
-        area=parent1.area,
-        orientation=parent1.orientation,
-        house_type=parent1.house_type,
-        special_room=parent1.special_room,
-        bedrooms=parent1.bedrooms,
-        bathrooms=parent1.bathrooms,
-        closets=parent1.closets,
-        rooms=valid_rooms
-    )
+    # Separa sobreposições, reinsere cômodos faltantes, alinha a escada e equilibra os andares; as violações
+    # que restarem são contadas pela avaliação do filho (ver RepairStats.settle)
+    child.rooms = valid_rooms
+    repair_plan(child, repair_stats, deferred=True)
+    child.snap_rooms()
+    if evaluate:
+        child.fitness = child.calculate_fitness()
+        if repair_stats is not None:
+            repair_stats.settle([child])
 
     return child
 
 
-def mutation(plan: FloorPlan) -> None:
+def _other_rooms(plan: FloorPlan, *rooms: Room) -> List[Room]:
     """
-    Realiza mutação em um indivíduo, ajustando a posição, dimensões ou andar de um cômodo.
-    Garante que o cômodo mutado esteja dentro dos limites e não sobreponha outros.
+    Retorna os cômodos da planta, exceto os informados.
 
     Args:
-        plan (FloorPlan): O indivíduo a ser mutado.
+        plan (FloorPlan): A planta.
+        *rooms (Room): Cômodos a serem excluídos.
+
+    Returns:
+        List[Room]: Demais cômodos da planta.
     """
 
-    # Seleciona um cômodo aleatório para mutar
-    rooms = plan.rooms.copy()
-    room = random.choice(rooms)
+    excluded = {id(room) for room in rooms}
+    return [r for r in plan.rooms if id(r) not in excluded]
 
-    # Salva o cômodo original para restauração em caso de falha
-    original_room = Room(room.type, room.floor, room.x, room.y, room.width, room.length)
 
-    # Escolhe aleatoriamente o atributo a ser mutado
-    attribute = random.choice(['position', 'dimension', 'floor'])
+def _fits(plan: FloorPlan, room: Room) -> bool:
+    """
+    Verifica se o cômodo está dentro dos limites da planta.
 
-    # Tenta mutar o cômodo
-    if attribute == 'position':
-        for _ in range(100):
-            room.x = random.uniform(0, plan.house_width - room.width)
-            room.y = random.uniform(0, plan.house_length - room.length)
-            if not plan.has_overlap(room, [r for r in rooms if r != room]):
-                break
+    Args:
+        plan (FloorPlan): A planta.
+        room (Room): O cômodo a ser verificado.
+
+    Returns:
+        bool: True se o cômodo estiver dentro dos limites, False caso contrário.
+    """
+
+    return (
+        room.x >= 0 and room.y >= 0 and
+        room.x + room.width <= plan.house_width and
+        room.y + room.length <= plan.house_length
+    )
+
+
+def _clamp(plan: FloorPlan, room: Room) -> None:
+    """
+    Traz o cômodo para dentro dos limites da planta, sem alterar suas dimensões. Um cômodo em
+    andar inexistente vai para o andar válido mais próximo.
+
+    Args:
+        plan (FloorPlan): A planta.
+        room (Room): O cômodo a ser ajustado.
+    """
+
+    room.x = min(max(room.x, 0), max(plan.house_width - room.width, 0))
+    room.y = min(max(room.y, 0), max(plan.house_length - room.length, 0))
+    if not plan.on_valid_floor(room):
+        room.floor = min(max(room.floor, 0), plan.max_floor - 1)
+
+
+def _relocate(plan: FloorPlan, room: Room, floors: List[int], attempts: int = 50) -> bool:
+    """
+    Procura uma posição livre para o cômodo, tentando os andares na ordem informada.
+    Se não encontrar, o cômodo volta à posição original.
+
+    Args:
+        plan (FloorPlan): A planta.
+        room (Room): O cômodo a ser reposicionado.
+        floors (List[int]): Andares candidatos, em ordem de preferência.
+        attempts (int): Número de posições sorteadas por andar.
+
+    Returns:
+        bool: True se o cômodo foi reposicionado, False caso contrário.
+    """
+
+    original = (room.floor, room.x, room.y)
+    others = _other_rooms(plan, room)
+
+    for floor in floors:
+        room.floor = floor
+        for attempt in range(attempts):
+            if attempt > 0:
+                room.x = random.uniform(0, max(plan.house_width - room.width, 0))
+                room.y = random.uniform(0, max(plan.house_length - room.length, 0))
+            if _fits(plan, room) and not plan.has_overlap(room, others):
+                return True
+
+    room.floor, room.x, room.y = original
+    return False
+
+
+def repair_floors(plan: FloorPlan, tolerance: float = 0.1) -> bool:
+    """
+    Reparo para casas de mais de um andar: fixa a escada no térreo (sua projeção é reservada em
+    todos os andares), retira da projeção os cômodos de outros andares e move cômodos do andar
+    mais ocupado para o menos ocupado enquanto a diferença de área for maior que `tolerance`
+    da área total dos cômodos.
+
+    Args:
+        plan (FloorPlan): A planta (alterada no lugar, sem recalcular o fitness).
+        tolerance (float): Diferença de área aceitável entre os andares, como fração da área total.
+
+    Returns:
+        bool: True se a planta foi alterada, False caso contrário.
+    """
+
+    if plan.max_floor < 2:
+        return False
+
+    changed = False
+    staircases = [room for room in plan.rooms if room.spans_floors]
+    for staircase in staircases:
+        if staircase.floor != 0:
+            staircase.floor = 0
+            changed = True
+
+    # Libera a projeção das escadas nos demais andares
+    for room in plan.rooms:
+        if not room.spans_floors and any(plan.check_overlap(room, staircase) for staircase in staircases):
+            other_floors = [floor for floor in range(plan.max_floor) if floor != room.floor]
+            changed |= _relocate(plan, room, [room.floor] + other_floors)
+
+    # Equilibra a área entre os andares
+    areas = plan.floor_areas()
+    limit = tolerance * sum(areas)
+    blocked: List[Room] = []
+    while True:
+        heavy = max(range(plan.max_floor), key=lambda floor: areas[floor])
+        light = min(range(plan.max_floor), key=lambda floor: areas[floor])
+        gap = areas[heavy] - areas[light]
+        if gap <= limit:
+            break
+
+        # Só ajudam os cômodos menores que a diferença; prefere o mais próximo de metade dela
+        candidates = [
+            room for room in plan.rooms
+            if room.floor == heavy and not room.spans_floors and room.width * room.length < gap
+            and all(room is not other for other in blocked)
+        ]
+        if not candidates:
+            break
+
+        room = min(candidates, key=lambda r: abs(r.width * r.length - gap / 2))
+        if _relocate(plan, room, [light]):
+            areas[heavy] -= room.width * room.length
+            areas[light] += room.width * room.length
+            changed = True
         else:
-            room.x = original_room.x
-            room.y = original_room.y
-    elif attribute == 'dimension':
-        for _ in range(100):
-            width, length = plan.generate_room_dimensions(room.type)
-            room.width = width
-            room.length = length
-            if room.x + room.width <= plan.house_width and room.y + room.length <= plan.house_length:
-                if not plan.has_overlap(room, [r for r in rooms if r != room]):
+            blocked.append(room)
+
+    return changed
+
+
+class RepairStats:
+    def __init__(self):
+        """
+        Contadores do reparo de plantas (ver repair_plan).
+        """
+
+        self.repaired: int = 0  # Plantas que passaram pelo reparo
+        self.infeasible: int = 0  # Plantas que chegaram ao reparo com violações
+        self.rescued: int = 0  # Plantas que saíram do reparo sem violações
+        # Plantas reparadas à espera da avaliação, com as violações anteriores ao reparo
+        self.pending: List[Tuple[FloorPlan, int]] = []
+
+    def record(self, violations_before: int, violations_after: int) -> None:
+        """
+        Registra o resultado de um reparo.
+
+        Args:
+            violations_before (int): Violações antes do reparo.
+            violations_after (int): Violações depois do reparo.
+        """
+
+        self.repaired += 1
+        if violations_before > 0:
+            self.infeasible += 1
+            if violations_after == 0:
+                self.rescued += 1
+
+    def settle(self, evaluated: List[FloorPlan]) -> None:
+        """
+        Registra os reparos pendentes (ver repair_plan com deferred=True): as violações das plantas
+        avaliadas vêm da avaliação; as das demais (descartadas sem avaliação) são contadas aqui.
+
+        Args:
+            evaluated (List[FloorPlan]): Plantas recém-avaliadas.
+        """
+
+        evaluated_ids = {id(plan) for plan in evaluated}
+        for plan, violations_before in self.pending:
+            violations_after = plan.constraint_violation if id(plan) in evaluated_ids else _violations(plan)
+            self.record(violations_before, violations_after)
+        self.pending = []
+
+    def as_dict(self) -> Dict[str, float]:
+        """
+        Estatísticas do reparo.
+
+        Returns:
+            Dict[str, float]: Plantas reparadas, inválidas, resgatadas e a fração resgatada das inválidas.
+        """
+
+        return {
+            "repaired": self.repaired,
+            "repair_infeasible": self.infeasible,
+            "repair_rescued": self.rescued,
+            "repair_rescue_rate": self.rescued / self.infeasible if self.infeasible else 0.0,
+        }
+
+
+def _violations(plan: FloorPlan) -> int:
+    """
+    Conta as violações de restrição da planta (sobreposições, cômodos fora dos limites e faltantes).
+
+    Args:
+        plan (FloorPlan): A planta.
+
+    Returns:
+        int: Número de violações.
+    """
+
+    return plan.count_overlaps() + plan.count_out_of_bounds() + plan.check_all_rooms_present()
+
+
+def _overlapping_pairs(plan: FloorPlan) -> List[Tuple[Room, Room]]:
+    """
+    Lista os pares de cômodos que se sobrepõem, na ordem das posições X (o segundo cômodo de
+    cada par é o de maior X).
+
+    Args:
+        plan (FloorPlan): A planta.
+
+    Returns:
+        List[Tuple[Room, Room]]: Pares sobrepostos.
+    """
+
+    rooms = sorted(plan.rooms, key=lambda room: room.x)
+
+    # Cômodos (posições na ordem X) de cada andar; as escadas disputam espaço em todos os andares
+    spanning = [index for index, room in enumerate(rooms) if room.spans_floors]
+    by_floor: Dict[int, List[int]] = {}
+    for index, room in enumerate(rooms):
+        if not room.spans_floors:
+            by_floor.setdefault(room.floor, []).append(index)
+    groups = [sorted(indices + spanning) for indices in by_floor.values()] or [spanning]
+
+    # Varredura pelas posições X em cada andar: só são comparados cômodos cujas faixas em X se cruzam
+    found = set()  # Pares de escadas aparecem em todos os andares
+    for group in groups:
+        for position, index1 in enumerate(group):
+            room1 = rooms[index1]
+            x_end = room1.x + room1.width
+            for index2 in group[position + 1:]:
+                room2 = rooms[index2]
+                if room2.x >= x_end:
                     break
+                if room1.y < room2.y + room2.length and room2.y < room1.y + room1.length:
+                    found.add((index1, index2))
+
+    return [(rooms[index1], rooms[index2]) for index1, index2 in sorted(found)]
+
+
+def _push_apart(plan: FloorPlan, room1: Room, room2: Room) -> None:
+    """
+    Separa dois cômodos sobrepostos deslocando um deles ao longo do eixo de menor penetração.
+    A escada, que reserva espaço em todos os andares, só é movida se os dois cômodos forem escadas.
+
+    Args:
+        plan (FloorPlan): A planta.
+        room1 (Room): Primeiro cômodo.
+        room2 (Room): Segundo cômodo (o que é movido, salvo se for escada).
+    """
+
+    if room2.spans_floors and not room1.spans_floors:
+        room1, room2 = room2, room1
+
+    # Deslocamentos mínimos de room2 para cada lado
+    right = room1.x + room1.width - room2.x
+    left = room2.x + room2.width - room1.x
+    up = room1.y + room1.length - room2.y
+    down = room2.y + room2.length - room1.y
+
+    dx = right if right < left else -left
+    dy = up if up < down else -down
+    if abs(dx) <= abs(dy):
+        room2.x += dx
+    else:
+        room2.y += dy
+
+    _clamp(plan, room2)
+
+
+def _first_free_corner(
+    xs: List[float], ys: List[float], width: float, length: float, blocking: List[Room]
+) -> Optional[Tuple[float, float]]:
+    """
+    Procura o primeiro canto candidato (pelas linhas ys e, em cada linha, pelas colunas xs, em
+    ordem crescente) em que um retângulo não sobrepõe nenhum dos cômodos que bloqueiam. Todos os
+    cantos são testados de uma vez: um canto está bloqueado se algum cômodo cruza tanto a faixa
+    da sua linha quanto a da sua coluna, o que é um produto de matrizes (linhas x cômodos por
+    cômodos x colunas), com o mesmo critério de spatial_index.overlap.
+
+    Args:
+        xs (List[float]): Posições X candidatas, em ordem crescente.
+        ys (List[float]): Posições Y candidatas, em ordem crescente.
+        width (float): Largura do retângulo.
+        length (float): Comprimento do retângulo.
+        blocking (List[Room]): Cômodos que disputam espaço com o retângulo.
+
+    Returns:
+        Optional[Tuple[float, float]]: O canto livre (x, y), ou None se não houver.
+    """
+
+    if not xs or not ys:
+        return None
+    if not blocking:
+        return xs[0], ys[0]
+
+    geometry = np.array([(other.x, other.y, other.x + other.width, other.y + other.length) for other in blocking])
+    x, y = np.array(xs)[:, None], np.array(ys)[:, None]
+    columns = (x < geometry[:, 2]) & (geometry[:, 0] < x + width)
+    rows = (y < geometry[:, 3]) & (geometry[:, 1] < y + length)
+    blocked = rows.astype(np.float32) @ columns.T.astype(np.float32)
+
+    free = np.flatnonzero(blocked.ravel() == 0)
+    if not len(free):
+        return None
+    row, column = divmod(int(free[0]), len(xs))
+    return xs[column], ys[row]
+
+
+def _free_position(plan: FloorPlan, room: Room, floors: List[int]) -> bool:
+    """
+    Busca uma posição livre para o cômodo entre os cantos formados pelas paredes externas e
+    pelas faces dos demais cômodos (busca em espaço livre, do canto inferior esquerdo para fora),
+    tentando os andares na ordem informada. Se não encontrar, o cômodo volta à posição original.
+
+    Args:
+        plan (FloorPlan): A planta.
+        room (Room): O cômodo a ser posicionado.
+        floors (List[int]): Andares candidatos, em ordem de preferência.
+
+    Returns:
+        bool: True se o cômodo foi posicionado, False caso contrário.
+    """
+
+    original = (room.floor, room.x, room.y)
+
+    # Demais cômodos de cada andar, separados uma única vez (as escadas disputam espaço em todos os andares)
+    others: List[Room] = []
+    spanning: List[Room] = []
+    by_floor: Dict[int, List[Room]] = {}
+    for other in plan.rooms:
+        if other is room:
+            continue
+        others.append(other)
+        if other.spans_floors:
+            spanning.append(other)
         else:
-            room.width = original_room.width
-            room.length = original_room.length
-    elif attribute == 'floor':
-        room.floor = random.randint(0, plan.max_floor - 1)
+            by_floor.setdefault(other.floor, []).append(other)
+
+    for floor in floors:
+        room.floor = floor
+        blocking = others if room.spans_floors else by_floor.get(floor, []) + spanning
+        xs = {0.0, plan.house_width - room.width}
+        ys = {0.0, plan.house_length - room.length}
+        for other in blocking:
+            xs.update((other.x + other.width, other.x - room.width))
+            ys.update((other.y + other.length, other.y - room.length))
+
+        xs = sorted(x for x in xs if 0 <= x <= plan.house_width - room.width)
+        ys = sorted(y for y in ys if 0 <= y <= plan.house_length - room.length)
+        position = _first_free_corner(xs, ys, room.width, room.length, blocking)
+        if position is not None:
+            room.x, room.y = position
+            return True
+
+    room.floor, room.x, room.y = original
+    return False
+
+
+def _floors_by_load(plan: FloorPlan) -> List[int]:
+    """
+    Ordena os andares do menos para o mais ocupado.
+
+    Args:
+        plan (FloorPlan): A planta.
+
+    Returns:
+        List[int]: Andares ordenados.
+    """
+
+    areas = plan.floor_areas()
+    return sorted(range(plan.max_floor), key=lambda floor: areas[floor])
+
+
+def _missing_room_types(plan: FloorPlan) -> List[str]:
+    """
+    Lista os cômodos obrigatórios que faltam na planta (um item por cômodo faltante).
+
+    Args:
+        plan (FloorPlan): A planta.
+
+    Returns:
+        List[str]: Tipos dos cômodos faltantes.
+    """
+
+    present: Dict[str, int] = {}
+    for room in plan.rooms:
+        present[room.type] = present.get(room.type, 0) + 1
+
+    missing = []
+    for room_type, type_id in plan.profile.type_ids.items():
+        missing.extend([room_type] * max(int(plan.required_counts[type_id]) - present.get(room_type, 0), 0))
+
+    return missing
 
-    plan.rooms = rooms
-    plan.fitness = plan.calculate_fitness()
 
+def repair_plan(
+    plan: FloorPlan, stats: Optional[RepairStats] = None, passes: int = 10, deferred: bool = False
+) -> Optional[bool]:
+    """
+    Converte, quando possível, uma planta inválida em válida antes da avaliação:
+    traz os cômodos para dentro dos limites, separa as sobreposições ao longo do eixo de menor
+    penetração, reposiciona (busca em espaço livre) os cômodos que continuam sobrepostos,
+    alinha a escada e equilibra os andares (repair_floors) e reinsere os cômodos obrigatórios
+    faltantes. Cômodos que não cabem em lugar nenhum são descartados. Plantas que já chegam
+    sem violações só passam por repair_floors, que as mantém válidas.
+
+    Args:
+        plan (FloorPlan): A planta (alterada no lugar, sem recalcular o fitness).
+        stats (Optional[RepairStats]): Contadores a serem atualizados.
+        passes (int): Número máximo de passadas de separação das sobreposições.
+        deferred (bool): Se True, as violações após o reparo não são contadas: a avaliação
+            seguinte as calcula de qualquer forma, e a planta fica pendente em `stats` até
+            RepairStats.settle.
+
+    Returns:
+        Optional[bool]: True se a planta ficou sem violações, False caso contrário (None se a
+            contagem foi adiada).
+    """
+
+    violations_before = _violations(plan)
+
+    # Caminho rápido: sem sobreposições, cômodos fora dos limites ou faltantes, só resta equilibrar os andares
+    if violations_before == 0:
+        repair_floors(plan)
+        if stats is not None:
+            stats.record(0, 0)
+        return True
+
+    # Limites: reduz cômodos maiores que a planta e traz os demais para dentro
+    for room in plan.rooms:
+        room.width = min(room.width, plan.house_width)
+        room.length = min(room.length, plan.house_length)
+        _clamp(plan, room)
+
+    # Separação das sobreposições pelo eixo de menor penetração
+    for _ in range(passes):
+        pairs = _overlapping_pairs(plan)
+        if not pairs:
+            break
+        for room1, room2 in pairs:
+            if plan.check_overlap(room1, room2):
+                _push_apart(plan, room1, room2)
+
+    # Cômodos ainda sobrepostos são reposicionados no espaço livre ou descartados
+    for room1, room2 in _overlapping_pairs(plan):
+        if not all(any(room is other for other in plan.rooms) for room in (room1, room2)):
+            continue  # Um dos cômodos já foi descartado
+        if not (room1.shares_floor(room2) and plan.check_overlap(room1, room2)):
+            continue  # Resolvido ao reposicionar outro cômodo
+        mover = room1 if room2.spans_floors else room2
+        if not _free_position(plan, mover, _floors_by_load(plan)):
+            plan.rooms = _other_rooms(plan, mover)
+
+    repair_floors(plan)
+
+    # Reinsere os cômodos obrigatórios faltantes, do maior para o menor
+    missing = _missing_room_types(plan)
+    missing.sort(key=lambda room_type: -plan.profile.room_ranges.get(room_type, (6, 10))[1])
+    for room_type in missing:
+        for _ in range(3):
+            width, length = plan.generate_room_dimensions(room_type)
+            room = Room(room_type, 0, 0.0, 0.0, min(width, plan.house_width), min(length, plan.house_length))
+            plan.rooms.append(room)
+            floors = [0] if room.spans_floors else _floors_by_load(plan)
+            if _free_position(plan, room, floors):
+                break
+            plan.rooms.pop()
+
+    if deferred:
+        if stats is not None:
+            stats.pending.append((plan, violations_before))
+        return None
+
+    violations_after = _violations(plan)
+    if stats is not None:
+        stats.record(violations_before, violations_after)
+
+    return violations_after == 0
 
-def mutate_rooms(rooms: List[Room]) -> List[Room]:
+
+def mutate_position(plan: FloorPlan) -> bool:
     """
-    Aplica mutação a uma lista de cômodos durante o crossover.
+    Reposiciona um cômodo aleatório em qualquer ponto livre da planta.
 
     Args:
-        rooms (List[Room]): A lista de cômodos a ser mutada.
+        plan (FloorPlan): O indivíduo a ser mutado.
 
     Returns:
-        List[Room]: A lista de cômodos após a mutação.
+        bool: True se a planta foi alterada, False caso contrário.
     """
 
-    # Seleciona um cômodo aleatório para mutar
-    mutated_rooms = rooms.copy()
-    room = random.choice(mutated_rooms)
+    room = random.choice(plan.rooms)
+    original_x, original_y = room.x, room.y
 
-    # Escolhe aleatoriamente o atributo a ser mutado
-    attribute = random.choice(['position', 'dimension', 'floor'])
+    for _ in range(100):
+        room.x = random.uniform(0, plan.house_width - room.width)
+        room.y = random.uniform(0, plan.house_length - room.length)
+        if not plan.has_overlap(room, _other_rooms(plan, room)):
+            return True
 
-    if attribute == 'position':
-        room.x = random.uniform(0, room.width)
-        room.y = random.uniform(0, room.length)
-    elif attribute == 'dimension':
-        room.width += random.uniform(-1, 1)
-        room.length += random.uniform(-1, 1)
-    elif attribute == 'floor':
-        room.floor = 1 - room.floor  # Alterna entre 0 e 1
+    room.x, room.y = original_x, original_y
+    return False
 
-    return mutated_rooms
+
+def mutate_dimension(plan: FloorPlan) -> bool:
+    """
+    Gera novas dimensões para um cômodo aleatório, mantendo sua posição.
+
+    Args:
+        plan (FloorPlan): O indivíduo a ser mutado.
+
+    Returns:
+        bool: True se a planta foi alterada, False caso contrário.
+    """
+
+    room = random.choice(plan.rooms)
+    original_width, original_length = room.width, room.length
+
+    for _ in range(100):
+        room.width, room.length = plan.generate_room_dimensions(room.type)
+        if _fits(plan, room) and not plan.has_overlap(room, _other_rooms(plan, room)):
+            return True
+
+    room.width, room.length = original_width, original_length
+    return False
+
+
+def mutate_floor(plan: FloorPlan) -> bool:
+    """
+    Move um cômodo aleatório (exceto a escada, presente em todos os andares) para outro andar,
+    se não houver sobreposição no destino.
+
+    Args:
+        plan (FloorPlan): O indivíduo a ser mutado.
+
+    Returns:
+        bool: True se a planta foi alterada, False caso contrário.
+    """
+
+    movable = [room for room in plan.rooms if not room.spans_floors]
+    if plan.max_floor < 2 or not movable:
+        return False
+
+    room = random.choice(movable)
+    original_floor = room.floor
+    room.floor = random.choice([floor for floor in range(plan.max_floor) if floor != original_floor])
+
+    if plan.has_overlap(room, _other_rooms(plan, room)):
+        room.floor = original_floor
+        return False
+    return True
+
+
+def mutate_nudge(plan: FloorPlan, sigma: float = 0.5) -> bool:
+    """
+    Desloca um cômodo aleatório com um pequeno passo gaussiano (busca local).
+
+    Args:
+        plan (FloorPlan): O indivíduo a ser mutado.
+        sigma (float): Desvio padrão do deslocamento, em metros.
+
+    Returns:
+        bool: True se a planta foi alterada, False caso contrário.
+    """
+
+    room = random.choice(plan.rooms)
+    original_x, original_y = room.x, room.y
+
+    for _ in range(10):
+        room.x = original_x + random.gauss(0, sigma)
+        room.y = original_y + random.gauss(0, sigma)
+        _clamp(plan, room)
+        if not plan.has_overlap(room, _other_rooms(plan, room)):
+            return True
+
+    room.x, room.y = original_x, original_y
+    return False
+
+
+def mutate_snap_to_wall(plan: FloorPlan) -> bool:
+    """
+    Encosta um cômodo aleatório na parede mais próxima de um vizinho do mesmo andar
+    (ou na parede externa), de forma que as paredes passem a coincidir.
+
+    Args:
+        plan (FloorPlan): O indivíduo a ser mutado.
+
+    Returns:
+        bool: True se a planta foi alterada, False caso contrário.
+    """
+
+    room = random.choice(plan.rooms)
+    others = _other_rooms(plan, room)
+    original_x, original_y = room.x, room.y
+
+    # Candidatos: paredes externas e as quatro faces de cada vizinho do mesmo andar
+    candidates = [
+        (0.0, original_y),
+        (plan.house_width - room.width, original_y),
+        (original_x, 0.0),
+        (original_x, plan.house_length - room.length),
+    ]
+    for other in others:
+        if other.floor != room.floor:
+            continue
+        candidates.extend([
+            (other.x + other.width, original_y),
+            (other.x - room.width, original_y),
+            (original_x, other.y + other.length),
+            (original_x, other.y - room.length),
+        ])
+
+    # Testa os candidatos do menor para o maior deslocamento
+    candidates.sort(key=lambda position: abs(position[0] - original_x) + abs(position[1] - original_y))
+    for x, y in candidates:
+        if x == original_x and y == original_y:
+            continue
+        room.x, room.y = x, y
+        if _fits(plan, room) and not plan.has_overlap(room, others):
+            return True
+
+    room.x, room.y = original_x, original_y
+    return False
+
+
+def mutate_swap(plan: FloorPlan) -> bool:
+    """
+    Troca a posição (e o andar) de dois cômodos aleatórios, mantendo suas dimensões.
+
+    Args:
+        plan (FloorPlan): O indivíduo a ser mutado.
+
+    Returns:
+        bool: True se a planta foi alterada, False caso contrário.
+    """
+
+    if len(plan.rooms) < 2:
+        return False
+
+    room1, room2 = random.sample(plan.rooms, 2)
+    original1 = (room1.floor, room1.x, room1.y)
+    original2 = (room2.floor, room2.x, room2.y)
+
+    room1.floor, room1.x, room1.y = original2
+    room2.floor, room2.x, room2.y = original1
+    _clamp(plan, room1)
+    _clamp(plan, room2)
+
+    others = _other_rooms(plan, room1, room2)
+    if (
+        not (room1.floor == room2.floor and plan.check_overlap(room1, room2)) and
+        not plan.has_overlap(room1, others) and
+        not plan.has_overlap(room2, others)
+    ):
+        return True
+
+    room1.floor, room1.x, room1.y = original1
+    room2.floor, room2.x, room2.y = original2
+    return False
+
+
+def mutate_compact(plan: FloorPlan) -> bool:
+    """
+    Desliza um cômodo aleatório em direção à origem (canto superior esquerdo), primeiro
+    no eixo X e depois no eixo Y, até encostar em outro cômodo ou na parede externa.
+
+    Args:
+        plan (FloorPlan): O indivíduo a ser mutado.
+
+    Returns:
+        bool: True se a planta foi alterada, False caso contrário.
+    """
+
+    room = random.choice(plan.rooms)
+    others = [r for r in _other_rooms(plan, room) if r.floor == room.floor]
+    original_x, original_y = room.x, room.y
+
+    # Desliza no eixo X até o obstáculo mais próximo à esquerda
+    room.x = max(
+        [0.0] + [
+            other.x + other.width for other in others
+            if other.x + other.width <= original_x and
+            other.y < room.y + room.length and room.y < other.y + other.length
+        ]
+    )
+
+    # Desliza no eixo Y até o obstáculo mais próximo acima
+    room.y = max(
+        [0.0] + [
+            other.y + other.length for other in others
+            if other.y + other.length <= original_y and
+            other.x < room.x + room.width and room.x < other.x + other.width
+        ]
+    )
+
+    if (room.x, room.y) != (original_x, original_y) and not plan.has_overlap(room, others):
+        return True
+
+    room.x, room.y = original_x, original_y
+    return False
+
+
+MUTATION_OPERATORS: Dict[str, Callable[[FloorPlan], bool]] = {
+    "position": mutate_position,
+    "dimension": mutate_dimension,
+    "floor": mutate_floor,
+    "nudge": mutate_nudge,
+    "snap_to_wall": mutate_snap_to_wall,
+    "swap": mutate_swap,
+    "compact": mutate_compact,
+}
+
+
+class AdaptiveMutation:
+    def __init__(
+        self,
+        operators: Optional[Dict[str, Callable[[FloorPlan], bool]]] = None,
+        min_probability: float = 0.05,
+        learning_rate: float = 0.2
+    ):
+        """
+        Seleção adaptativa de operadores de mutação (probability matching).
+
+        Cada operador mantém uma estimativa da sua taxa de sucesso recente (mutações que
+        melhoraram o fitness). A probabilidade de aplicação é proporcional a essa estimativa,
+        com um piso mínimo para que nenhum operador deixe de ser experimentado.
+
+        Args:
+            operators (Optional[Dict[str, Callable[[FloorPlan], bool]]]): Operadores disponíveis.
+                Por padrão, usa MUTATION_OPERATORS.
+            min_probability (float): Probabilidade mínima de cada operador.
+            learning_rate (float): Peso das observações recentes na estimativa de sucesso.
+        """
+
+        self.operators: Dict[str, Callable[[FloorPlan], bool]] = dict(operators or MUTATION_OPERATORS)
+        self.min_probability: float = min(min_probability, 1 / len(self.operators))
+        self.learning_rate: float = learning_rate
+        self.quality: Dict[str, float] = {name: 1.0 for name in self.operators}
+        self.applications: Dict[str, int] = {name: 0 for name in self.operators}
+        self.successes: Dict[str, int] = {name: 0 for name in self.operators}
+
+    def probabilities(self) -> Dict[str, float]:
+        """
+        Calcula a probabilidade atual de aplicação de cada operador.
+
+        Returns:
+            Dict[str, float]: Probabilidade de cada operador.
+        """
+
+        total_quality = sum(self.quality.values())
+        free_mass = 1 - len(self.operators) * self.min_probability
+
+        if total_quality <= 0:
+            return {name: 1 / len(self.operators) for name in self.operators}
+
+        return {
+            name: self.min_probability + free_mass * quality / total_quality
+            for name, quality in self.quality.items()
+        }
+
+    def select(self) -> str:
+        """
+        Sorteia um operador de acordo com as probabilidades atuais.
+
+        Returns:
+            str: Nome do operador escolhido.
+        """
+
+        probabilities = self.probabilities()
+        return random.choices(list(probabilities), weights=list(probabilities.values()), k=1)[0]
+
+    def update(self, name: str, success: bool) -> None:
+        """
+        Atualiza a estimativa de sucesso de um operador.
+
+        Args:
+            name (str): Nome do operador aplicado.
+            success (bool): Se a mutação melhorou o fitness.
+        """
+
+        reward = 1.0 if success else 0.0
+        self.quality[name] += self.learning_rate * (reward - self.quality[name])
+        self.applications[name] += 1
+        self.successes[name] += int(success)
+
+
+def mutation(
+    plan: FloorPlan, adaptive: Optional[AdaptiveMutation] = None, evaluate: bool = True
+) -> Optional[Tuple[str, float]]:
+    """
+    Realiza mutação em um indivíduo aplicando um dos operadores de MUTATION_OPERATORS.
+    Garante que o cômodo mutado esteja dentro dos limites e não sobreponha outros.
+
+    Args:
+        plan (FloorPlan): O indivíduo a ser mutado.
+        adaptive (Optional[AdaptiveMutation]): Seletor adaptativo de operadores. Quando omitido,
+            o operador é escolhido uniformemente.
+        evaluate (bool): Se False, a planta alterada fica com o fitness pendente (None), para ser
+            avaliada em lote, e o crédito do operador fica a cargo de quem chamou.
+
+    Returns:
+        Optional[Tuple[str, float]]: Com evaluate=False e a planta alterada, o nome do operador e o
+            fitness anterior, para AdaptiveMutation.update após a avaliação; None caso contrário.
+    """
+
+    if not plan.rooms:
+        return None
+
+    if adaptive is not None:
+        name = adaptive.select()
+        operator = adaptive.operators[name]
+    else:
+        name = random.choice(list(MUTATION_OPERATORS))
+        operator = MUTATION_OPERATORS[name]
+
+    previous_fitness = plan.fitness
+    changed = operator(plan)
+    if changed:
+        plan.snap_rooms()
+    if changed and not evaluate:
+        plan.fitness = None
+        return name, previous_fitness
+    if changed:
+        plan.fitness = plan.calculate_fitness()
+
+    if adaptive is not None:
+        adaptive.update(name, changed and plan.fitness > previous_fitness)
+
+    return None
+
+
+def survivors(
+    population: List[FloorPlan], population_size: int, mode: str = "weighted", distances: Optional[np.ndarray] = None
+) -> List[FloorPlan]:
+    """
+    Seleciona os sobreviventes da população combinada (pais e filhos), descartando antes as
+    cópias de uma mesma planta. Duplicatas só voltam à população se faltarem plantas únicas.
+
+    Args:
+        population (List[FloorPlan]): População combinada.
+        population_size (int): Número de sobreviventes.
+        mode (str): "weighted" (ordenação por fitness) ou "pareto" (NSGA-II).
+        distances (Optional[np.ndarray]): Matriz de distâncias da população combinada, se já
+            calculada (ver diversity.distance_matrix).
+
+    Returns:
+        List[FloorPlan]: Sobreviventes, ordenados do melhor para o pior.
+    """
+
+    if mode == "pareto":
+        unique, duplicates = remove_duplicates(population, distances=distances)
+        selected = pareto_survivors(unique, population_size)
+    else:
+        # Ordenar antes garante que a cópia mantida de cada planta é a de maior fitness
+        order = sorted(range(len(population)), key=lambda index: population[index].fitness, reverse=True)
+        unique, duplicates = remove_duplicates(
+            [population[index] for index in order],
+            distances=distances[np.ix_(order, order)] if distances is not None else None,
+        )
+        selected = unique[:population_size]
+
+    return selected + duplicates[:population_size - len(selected)]
+
+
+def generation_stats(population: List[FloorPlan], diversity: Optional[float] = None) -> Dict[str, float]:
+    """
+    Calcula as estatísticas de uma geração.
+
+    Args:
+        population (List[FloorPlan]): A população após a seleção dos sobreviventes.
+        diversity (Optional[float]): Diversidade já calculada da população (ver diversity.population_diversity).
+
+    Returns:
+        Dict[str, float]: Melhor fitness, fitness médio, fração de plantas válidas e diversidade.
+    """
+
+    fitnesses = [plan.fitness for plan in population]
+    valid = sum(1 for plan in population if plan.constraint_violation == 0)
+
+    stats = {
+        "best_fitness": max(fitnesses),
+        "mean_fitness": sum(fitnesses) / len(fitnesses),
+        "valid_fraction": valid / len(population),
+        "diversity": population_diversity(population) if diversity is None else diversity,
+    }
+
+    return stats
+
+
+def cache_lookups() -> Tuple[int, int]:
+    """
+    Lê os contadores do cache de fitness do processo.
+
+    Returns:
+        Tuple[int, int]: Acertos e falhas acumulados ((0, 0) se o cache estiver desativado).
+    """
+
+    cache = get_fitness_cache()
+    return cache.counters() if cache is not None else (0, 0)
+
+
+class Evolution:
+    def __init__(
+        self, population_size: int, area: float, orientation: str, house_type: str,
+        special_room: str, bedrooms: int, bathrooms: int, closets: int, mutation_rate: float = 0.1,
+        mode: str = "weighted", profile: Optional[EvaluationProfile] = None,
+        elite_library: Optional[EliteLibrary] = None, seed_fraction: float = 0.5,
+        diversity_threshold: float = 0.05, immigrant_fraction: float = 0.25,
+        polish_iterations: int = 0, polish_every: int = 0, workers: int = 1,
+        archive: Optional[PlanArchive] = None, surrogate_fraction: float = 1.0
+    ):
+        """
+        Estado do ciclo evolutivo, avançado uma geração por vez (ver evolutionary_cycle, que
+        documenta os argumentos). Entre duas gerações o estado pode ser salvo com checkpoint() e
+        retomado com Evolution.restore(), inclusive em outro processo, o que permite interromper
+        uma execução em uma fronteira de geração e continuá-la depois.
+
+        Cria e avalia a população inicial.
+        """
+
+        if mode not in ("weighted", "pareto"):
+            raise ValueError(f"Modo de otimização desconhecido: {mode}")
+        lookups = cache_lookups()
+
+        self.program: Tuple[float, str, str, str, int, int, int] = (
+            area, orientation, house_type, special_room, bedrooms, bathrooms, closets
+        )
+        self.population_size: int = population_size
+        self.mutation_rate: float = mutation_rate
+        self.mode: str = mode
+        self.profile: Optional[EvaluationProfile] = profile
+        self.elite_library: Optional[EliteLibrary] = elite_library
+        self.diversity_threshold: float = diversity_threshold
+        self.immigrant_fraction: float = immigrant_fraction
+        self.polish_iterations: int = polish_iterations
+        self.polish_every: int = polish_every
+        self.workers: int = workers
+        self.archive: Optional[PlanArchive] = archive
+        self.surrogate: Optional[SurrogateScreen] = (
+            SurrogateScreen(surrogate_fraction, mode=mode) if surrogate_fraction < 1 else None
+        )
+        self.generation: int = 0  # Gerações já executadas
+        self.evaluations: int = 0  # Plantas avaliadas (inclusive as respondidas pelo cache)
+        self.cache_lookups: Tuple[int, int] = (0, 0)  # Acertos e falhas do cache de fitness nesta execução
+        self._evaluator: Optional[ParallelEvaluator] = None
+
+        # O avaliador paralelo é criado na primeira avaliação: uma exceção (ou interrupção) ao montar a
+        # população inicial não deve deixar os seus processos abertos
+        try:
+            # Gera a população inicial, semeada com plantas da biblioteca (se houver) e completada com
+            # plantas aleatórias
+            population = []
+            if elite_library is not None:
+                population = seed_population(
+                    elite_library, int(population_size * seed_fraction), area, orientation, self.program[2:], profile
+                )
+            population.extend(self._random_plan() for _ in range(population_size - len(population)))
+            unevaluated = [plan for plan in population if plan.fitness is None]
+            evaluate_population(unevaluated, self.evaluator)
+            self.evaluations += len(unevaluated)
+            if self.surrogate is not None:
+                self.surrogate.model.observe(population)
+            if archive is not None:
+                archive.record(population, -1, "initial")
+
+            # Plantas iniciais inválidas (cômodos que não couberam, sementes adaptadas com sobreposições)
+            # passam pelo reparo
+            self.repair_stats = RepairStats()
+            infeasible = [plan for plan in population if plan.constraint_violation > 0]
+            for plan in infeasible:
+                repair_plan(plan, self.repair_stats, deferred=True)
+                plan.snap_rooms()
+            self._evaluate(infeasible, -1, "repaired")
+
+            if mode == "pareto":
+                population = pareto_survivors(population, population_size)
+            self.population: List[FloorPlan] = population
+        except BaseException:
+            self.close()
+            raise
+
+        # Seletor adaptativo de operadores de mutação, compartilhado por todas as gerações
+        self.adaptive = AdaptiveMutation()
+        self._count_lookups(lookups)
+
+    @property
+    def evaluator(self) -> Optional[ParallelEvaluator]:
+        """
+        Avaliador paralelo (criado sob demanda se workers > 1, inclusive após restore()).
+
+        Returns:
+            Optional[ParallelEvaluator]: O avaliador, ou None para avaliar no próprio processo.
+        """
+
+        if self._evaluator is None and self.workers > 1:
+            profile = self.profile if self.profile is not None else default_profile()
+            self._evaluator = ParallelEvaluator(self.workers, self.program, profile)
+        return self._evaluator
+
+    def _random_plan(self) -> FloorPlan:
+        """
+        Cria uma planta aleatória do programa, sem avaliação.
+
+        Returns:
+            FloorPlan: A planta.
+        """
+
+        return FloorPlan(*self.program, profile=self.profile, evaluate=False)
+
+    def _count_lookups(self, start: Tuple[int, int]) -> None:
+        """
+        Soma aos contadores da execução os acertos e falhas do cache desde `start`. O cache é
+        compartilhado pelo processo (outras execuções, jobs do servidor), então as estatísticas
+        relatadas são as diferenças contadas durante esta execução, e não os totais do cache.
+
+        Args:
+            start (Tuple[int, int]): Contadores lidos no início do trecho (ver cache_lookups).
+        """
+
+        hits, misses = cache_lookups()
+        self.cache_lookups = (
+            self.cache_lookups[0] + hits - start[0], self.cache_lookups[1] + misses - start[1]
+        )
+
+    def _evaluate(
+        self, plans: List[FloorPlan], generation: int, origin: str, features: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Avalia um lote de plantas (em paralelo, se houver avaliador), registra os reparos pendentes
+        (ver RepairStats.settle), o registra no histórico e o usa para treinar o modelo substituto, se houver.
+
+        Args:
+            plans (List[FloorPlan]): As plantas.
+            generation (int): Geração corrente (-1 para a população inicial).
+            origin (str): Origem das plantas (ver plan_archive.ORIGINS).
+            features (Optional[np.ndarray]): Características das plantas já calculadas na triagem
+                (ver SurrogateScreen.select), para não recalculá-las no treino do modelo.
+        """
+
+        evaluate_population(plans, self.evaluator)
+        self.evaluations += len(plans)
+        self.repair_stats.settle(plans)
+        if self.archive is not None:
+            self.archive.record(plans, generation, origin)
+        if self.surrogate is not None:
+            self.surrogate.model.observe(plans, features)
+
+    def step(self) -> Dict[str, float]:
+        """
+        Executa uma geração: seleção, cruzamento, mutação, sobreviventes, refinamento periódico
+        e imigração.
+
+        Returns:
+            Dict[str, float]: Estatísticas da população (ver generation_stats), acrescidas dos
+                contadores de RepairStats, dos contadores do cache de fitness nesta execução
+                (ver FitnessCache.stats), se ativo, e, com triagem, de SurrogateScreen.last_stats.
+        """
+
+        lookups = cache_lookups()
+        generation = self.generation
+        population = self.population
+        population_size = self.population_size
+        new_population = []
+
+        for _ in range(population_size // 2):
+            # Seleção
+            parents = tournament_selection(population) if self.mode == "pareto" else selection(population)
+            parent1, parent2 = parents[0], parents[1]
+
+            # Cruzamento (a avaliação dos filhos é feita em lote)
+            child1 = crossover(parent1, parent2, self.repair_stats, evaluate=False)
+            child2 = crossover(parent2, parent1, self.repair_stats, evaluate=False)
+
+            new_population.extend([child1, child2])
+
+        # Triagem pelo modelo substituto: só os filhos mais promissores recebem a avaliação completa
+        if self.surrogate is not None:
+            candidates = len(new_population)
+            new_population, predicted, features = self.surrogate.select(new_population, random)
+            self._evaluate(new_population, generation, "offspring", features)
+            self.surrogate.record(new_population, candidates, predicted)
+        else:
+            self._evaluate(new_population, generation, "offspring")
+
+        # Mutação: os filhos alterados são reavaliados em um segundo lote e só então os operadores são creditados
+        mutated, credits = [], []
+        for child in new_population:
+            if random.random() < self.mutation_rate:
+                credit = mutation(child, self.adaptive, evaluate=False)
+                if credit is not None:
+                    mutated.append(child)
+                    credits.append(credit)
+        self._evaluate(mutated, generation, "mutant")
+        for child, (name, previous_fitness) in zip(mutated, credits):
+            self.adaptive.update(name, child.fitness > previous_fitness)
+
+        # Combina as populações e seleciona os melhores indivíduos, sem cópias; a matriz de distâncias
+        # da população combinada é calculada uma única vez e serve também para a diversidade
+        combined = population + new_population
+        distances = distance_matrix(combined)
+        population = survivors(combined, population_size, self.mode, distances)
+        positions = {id(plan): index for index, plan in enumerate(combined)}
+
+        # Refinamento periódico da melhor planta por busca local
+        if (
+            self.mode == "weighted" and self.polish_iterations > 0 and self.polish_every > 0 and
+            (generation + 1) % self.polish_every == 0
+        ):
+            polished = anneal(population[0], self.polish_iterations)
+            if self.archive is not None and polished is not population[0]:
+                self.archive.record([polished], generation, "polished")
+            population[0] = polished
+
+        # Se a população colapsou em poucas plantas, substitui as piores por imigrantes aleatórios.
+        # A diversidade sai da matriz da população combinada, a menos que o refinamento tenha trocado a melhor planta
+        if all(id(plan) in positions for plan in population):
+            indices = [positions[id(plan)] for plan in population]
+            diversity = population_diversity(population, subset_distances(distances, combined, indices))
+        else:
+            diversity = population_diversity(population)
+        if diversity < self.diversity_threshold:
+            immigrants = max(1, int(population_size * self.immigrant_fraction))
+            population[-immigrants:] = [self._random_plan() for _ in range(immigrants)]
+            self._evaluate(population[-immigrants:], generation, "immigrant")
+            if self.mode == "weighted":
+                population.sort(key=lambda p: p.fitness, reverse=True)
+            diversity = population_diversity(population)
+
+        self.population = population
+        self.generation += 1
+
+        stats = generation_stats(population, diversity)
+        stats.update(self.repair_stats.as_dict())
+        self._count_lookups(lookups)
+        cache = get_fitness_cache()
+        if cache is not None:
+            stats.update(cache.stats(self.cache_lookups))
+        if self.surrogate is not None:
+            stats.update(self.surrogate.last_stats)
+        return stats
+
+    def best(self) -> Union[FloorPlan, List[FloorPlan]]:
+        """
+        Melhor resultado até o momento, sem refinamento: a melhor planta (modo "weighted") ou
+        o conjunto de plantas não dominadas (modo "pareto").
+
+        Returns:
+            Union[FloorPlan, List[FloorPlan]]: O resultado parcial.
+        """
+
+        if self.mode == "pareto":
+            return pareto_front(self.population)
+        return self.population[0]
+
+    def finish(self) -> Union[FloorPlan, List[FloorPlan]]:
+        """
+        Encerra o ciclo: libera o avaliador paralelo, grava o histórico, refina a melhor planta
+        e posiciona portas e mobílias.
+
+        Returns:
+            Union[FloorPlan, List[FloorPlan]]: A melhor planta encontrada (modo "weighted") ou o
+                conjunto de plantas não dominadas (modo "pareto").
+        """
+
+        self.close()
+
+        if self.mode == "pareto":
+            if self.archive is not None:
+                self.archive.flush()
+
+            # Retorna as alternativas não dominadas, com as portas e mobílias posicionadas
+            front = pareto_front(self.population)
+            for plan in front:
+                plan.place_doors()
+                plan.furnish()
+                if self.elite_library is not None:
+                    self.elite_library.add(plan)
+            return front
+
+        # Retorna a melhor planta (refinada por busca local), com as portas posicionadas nas paredes
+        # compartilhadas e as mobílias atualizadas
+        best_plan = anneal(self.population[0], self.polish_iterations)
+        if self.archive is not None:
+            if best_plan is not self.population[0]:
+                self.archive.record([best_plan], self.generation, "polished")
+            self.archive.flush()
+        best_plan.place_doors()
+        best_plan.furnish()
+        if self.elite_library is not None:
+            self.elite_library.add(best_plan)
+
+        return best_plan
+
+    def close(self) -> None:
+        """
+        Encerra os processos de avaliação paralela, se houver (são recriados se o ciclo continuar).
+        """
+
+        if self._evaluator is not None:
+            self._evaluator.close()
+            self._evaluator = None
+
+    def checkpoint(self) -> bytes:
+        """
+        Salva o estado do ciclo, incluindo o estado do gerador aleatório, para ser retomado com
+        Evolution.restore(). O avaliador paralelo é encerrado e o histórico (arquivos abertos)
+        não faz parte do estado: após a retomada, reatribua-o a `archive` se necessário.
+
+        Returns:
+            bytes: Estado serializado (pickle).
+        """
+
+        self.close()
+        if self.archive is not None:
+            self.archive.flush()
+
+        state = dict(self.__dict__, archive=None, _evaluator=None)
+        return pickle.dumps((state, random.getstate()))
+
+    @classmethod
+    def restore(cls, data: bytes) -> 'Evolution':
+        """
+        Retoma um ciclo salvo com checkpoint(), restaurando também o gerador aleatório do processo.
+
+        Args:
+            data (bytes): Estado serializado.
+
+        Returns:
+            Evolution: O ciclo, pronto para continuar com step().
+        """
+
+        state, random_state = pickle.loads(data)
+        evolution = cls.__new__(cls)
+        evolution.__dict__.update(state)
+        random.setstate(random_state)
+
+        return evolution
 
 
 def evolutionary_cycle(
     generations: int, population_size: int, area: float, orientation: str, house_type: str,
-    special_room: str, bedrooms: int, bathrooms: int, closets: int
-) -> FloorPlan:
+    special_room: str, bedrooms: int, bathrooms: int, closets: int, mutation_rate: float = 0.1,
+    mode: str = "weighted", profile: Optional[EvaluationProfile] = None,
+    on_generation: Optional[Callable[[int, Dict[str, float]], Optional[bool]]] = None,
+    elite_library: Optional[EliteLibrary] = None, seed_fraction: float = 0.5,
+    diversity_threshold: float = 0.05, immigrant_fraction: float = 0.25,
+    polish_iterations: int = 0, polish_every: int = 0, workers: int = 1,
+    archive: Optional[PlanArchive] = None, surrogate_fraction: float = 1.0
+) -> Union[FloorPlan, List[FloorPlan]]:
     """
     Executa o ciclo evolutivo do algoritmo genético.
 
@@ -179,40 +1463,58 @@ def evolutionary_cycle(
         bedrooms (int): O número de quartos.
         bathrooms (int): O número de banheiros.
         closets (int): O número de closets.
+        mutation_rate (float): Probabilidade de mutação de cada filho.
+        mode (str): "weighted" para somar os critérios em um único fitness, ou "pareto" para
+            tratá-los como objetivos separados (NSGA-II).
+        profile (Optional[EvaluationProfile]): Perfil de avaliação. Quando omitido, usa o perfil padrão.
+        on_generation (Optional[Callable[[int, Dict[str, float]], Optional[bool]]]): Função chamada
+            ao fim de cada geração com o número da geração e as estatísticas da população
+            (ver Evolution.step). Se retornar False,
+            o ciclo é interrompido e o melhor resultado até o momento é retornado.
+        elite_library (Optional[EliteLibrary]): Biblioteca de plantas já encontradas. Quando
+            informada, até seed_fraction da população inicial é semeada com plantas do mesmo
+            programa (ou de programas semelhantes) adaptadas à nova área, e o resultado final é
+            adicionado à biblioteca.
+        seed_fraction (float): Fração máxima da população inicial vinda da biblioteca.
+        diversity_threshold (float): Diversidade (ver diversity.population_diversity) abaixo da
+            qual a população é considerada colapsada.
+        immigrant_fraction (float): Fração da população (as piores plantas) substituída por
+            plantas aleatórias quando a diversidade colapsa.
+        polish_iterations (int): Movimentos de recozimento simulado (local_search.anneal) usados para
+            refinar a melhor planta ao fim do ciclo (0 desativa). Apenas no modo "weighted".
+        polish_every (int): Se positivo, a melhor planta também é refinada a cada polish_every gerações.
+        workers (int): Processos que avaliam o fitness de cada geração em paralelo, com a população
+            em memória compartilhada (ver parallel_evaluation.ParallelEvaluator); 1 avalia no próprio processo.
+        archive (Optional[PlanArchive]): Histórico em que cada planta avaliada é registrada, com a
+            geração e a origem da avaliação (aberto no primeiro registro, se preciso). As linhas
+            pendentes são gravadas ao fim do ciclo.
+        surrogate_fraction (float): Fração dos filhos que recebe a avaliação completa a cada geração;
+            abaixo de 1, um modelo substituto (surrogate.SurrogateModel), treinado com as avaliações
+            já feitas, escolhe os filhos mais promissores e descarta os demais, exceto uma pequena
+            amostra de auditoria. 1 avalia todos os filhos.
 
     Returns:
-        FloorPlan: A melhor planta encontrada após o ciclo evolutivo.
+        Union[FloorPlan, List[FloorPlan]]: A melhor planta encontrada (modo "weighted") ou o
+            conjunto de plantas não dominadas (modo "pareto").
     """
 
-    # Gera a população inicial
-    population = [
-        FloorPlan(area, orientation, house_type, special_room, bedrooms, bathrooms, closets)
-        for _ in range(population_size)
-    ]
-
-    for _ in range(generations):
-        new_population = []
-
-        for _ in range(population_size // 2):
-            # Seleção
-            parents = selection(population)
-            parent1, parent2 = parents[0], parents[1]
-
-            # Cruzamento
-            child1 = crossover(parent1, parent2)
-            child2 = crossover(parent2, parent1)
-
-            # Mutação
-            if random.random() < 0.1:
-                mutation(child1)
-            if random.random() < 0.1:
-                mutation(child2)
-
-            new_population.extend([child1, child2])
+    evolution = Evolution(
+        population_size, area, orientation, house_type, special_room, bedrooms, bathrooms, closets,
+        mutation_rate=mutation_rate, mode=mode, profile=profile, elite_library=elite_library,
+        seed_fraction=seed_fraction, diversity_threshold=diversity_threshold,
+        immigrant_fraction=immigrant_fraction, polish_iterations=polish_iterations,
+        polish_every=polish_every, workers=workers, archive=archive,
+        surrogate_fraction=surrogate_fraction,
+    )
 
-        # Combina as populações e seleciona os melhores indivíduos
-        population.extend(new_population)
-        population = sorted(population, key=lambda p: p.fitness, reverse=True)[:population_size]
+    # Uma exceção (ou interrupção) no meio do ciclo não deve deixar os processos de avaliação abertos
+    try:
+        for generation in range(generations):
+            stats = evolution.step()
+            if on_generation is not None and on_generation(generation, stats) is False:
+                break
+    except BaseException:
+        evolution.close()
+        raise
 
-    # Retorna a melhor planta
-    return population[0]
+    return evolution.finish()
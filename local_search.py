@@ -0,0 +1,276 @@
+import math
+import random
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from fitness import PlanGraph, area_separation_score, circulation_score
+from models import FloorPlan, Room
+
+# Geometria de um cômodo: posição X, posição Y, largura e comprimento
+Geometry = Tuple[float, float, float, float]
+
+
+class IncrementalEvaluator:
+    def __init__(self, plan: FloorPlan):
+        """
+        Avaliador incremental de uma planta válida: mantém a grade de ocupação, o grafo de cômodos
+        e os termos por cômodo (iluminação, conexões externas e escadas), de modo que mover ou
+        redimensionar um cômodo custa O(n) em vez de uma reavaliação completa.
+        O resultado é igual ao de FloorPlan.evaluate para a mesma geometria.
+
+        Args:
+            plan (FloorPlan): Planta válida (sem violações), alterada no lugar pelos movimentos.
+        """
+
+        self.plan = plan
+        self.graph = PlanGraph(plan)
+        # No modo discreto, a área ocupada vem da contagem de bits (ver FloorPlan.evaluate_area_utilization)
+        self.discrete: bool = plan.bitboard is not None
+        self.cells = np.zeros(
+            (plan.max_floor, math.ceil(plan.house_length), math.ceil(plan.house_width)), dtype=np.int16
+        )
+        for room in plan.rooms:
+            self._mark(room, 1)
+
+        self.room_scores: List[Tuple[float, float, float]] = [self._room_scores(room) for room in plan.rooms]
+        self.fitness: float = self.total()
+
+    def _mark(self, room: Room, value: int) -> None:
+        """
+        Marca (ou desmarca, com value=-1) as células ocupadas pelo cômodo, como em FloorPlan.mark_grid.
+
+        Args:
+            room (Room): O cômodo.
+            value (int): 1 para marcar, -1 para desmarcar.
+        """
+
+        if self.discrete:
+            return
+
+        floors = slice(None) if room.spans_floors else room.floor
+        self.cells[floors, int(room.y):int(room.y + room.length), int(room.x):int(room.x + room.width)] += value
+
+    def _room_scores(self, room: Room) -> Tuple[float, float, float]:
+        """
+        Calcula a contribuição do cômodo para a iluminação natural, as conexões externas e a posição das escadas.
+
+        Args:
+            room (Room): O cômodo.
+
+        Returns:
+            Tuple[float, float, float]: Contribuição para cada um dos três critérios.
+        """
+
+        plan = self.plan
+        parameters = plan.profile.parameters
+        near = plan.is_near_external_walls(room)
+
+        light = parameters["natural_light_reward"] if near else 0
+        external = parameters["external_connection_reward"] if near and room.type in ("Sala de Estar", "Cozinha") else 0
+        staircase = 0
+        if room.type == "Escadas":
+            distance = plan.calculate_distance_to_center(room, plan.house_width / 2, plan.house_length / 2)
+            staircase = max(0, parameters["staircase_radius"] - distance) * parameters["staircase_reward"]
+
+        return light, external, staircase
+
+    def components(self) -> Dict[str, float]:
+        """
+        Calcula os critérios ativos do perfil a partir do estado incremental.
+
+        Returns:
+            Dict[str, float]: Valor de cada critério ativo.
+        """
+
+        plan = self.plan
+        parameters = plan.profile.parameters
+        evaluators = {
+            "area_utilization": lambda: (
+                plan.evaluate_area_utilization() if self.discrete else
+                np.count_nonzero(self.cells) / (plan.house_width * plan.house_length * plan.max_floor) * 100
+            ),
+            "area_separation": lambda: area_separation_score(
+                self.graph, parameters["separation_reward"], parameters["separation_penalty"]
+            ),
+            "circulation": lambda: circulation_score(
+                self.graph, parameters["circulation_reward"], parameters["circulation_depth_penalty"]
+            ),
+            "natural_light": lambda: sum(scores[0] for scores in self.room_scores),
+            "external_connections": lambda: sum(scores[1] for scores in self.room_scores),
+            "staircase_position": lambda: sum(scores[2] for scores in self.room_scores),
+        }
+
+        return {objective: evaluators[objective]() for objective in plan.profile.objectives}
+
+    def total(self) -> float:
+        """
+        Calcula o fitness ponderado a partir do estado incremental.
+
+        Returns:
+            float: Fitness da planta.
+        """
+
+        weights = self.plan.profile.objective_weights
+        fitness = 0
+        for objective, value in self.components().items():
+            fitness += weights[objective] * value
+        return fitness
+
+    def is_valid(self, index: int, geometry: Geometry) -> bool:
+        """
+        Verifica, em O(n), se o cômodo pode assumir a nova geometria sem sair da planta nem sobrepor outro.
+
+        Args:
+            index (int): Índice do cômodo.
+            geometry (Geometry): Nova posição e dimensões.
+
+        Returns:
+            bool: True se a geometria é válida, False caso contrário.
+        """
+
+        plan = self.plan
+        x, y, width, length = geometry
+        if x < 0 or y < 0 or x + width > plan.house_width or y + length > plan.house_length:
+            return False
+
+        room = plan.rooms[index]
+        candidate = Room.__new__(Room)
+        candidate.__dict__.update(room.__dict__)
+        candidate.x, candidate.y, candidate.width, candidate.length = geometry
+
+        return not plan.has_overlap(candidate, plan.rooms[:index] + plan.rooms[index + 1:])
+
+    def apply(self, index: int, geometry: Geometry) -> float:
+        """
+        Aplica a nova geometria a um cômodo e atualiza o fitness incrementalmente.
+
+        Args:
+            index (int): Índice do cômodo.
+            geometry (Geometry): Nova posição e dimensões (já validadas com is_valid).
+
+        Returns:
+            float: Novo fitness da planta.
+        """
+
+        room = self.plan.rooms[index]
+        self._mark(room, -1)
+        room.x, room.y, room.width, room.length = geometry
+        self._mark(room, 1)
+
+        self.room_scores[index] = self._room_scores(room)
+        self.graph.relink(index)
+        self.fitness = self.total()
+
+        return self.fitness
+
+
+def _propose(plan: FloorPlan, room: Room, step: float) -> Geometry:
+    """
+    Sorteia uma nova geometria para o cômodo: deslocamento gaussiano, mudança de proporção
+    (mantendo a área) ou encaixe em uma parede externa ou de um vizinho.
+
+    Args:
+        plan (FloorPlan): A planta.
+        room (Room): O cômodo.
+        step (float): Desvio padrão do deslocamento, em metros.
+
+    Returns:
+        Geometry: Nova posição e dimensões.
+    """
+
+    move = random.random()
+    if move < 0.6:
+        return room.x + random.gauss(0, step), room.y + random.gauss(0, step), room.width, room.length
+
+    if move < 0.8:
+        area = room.width * room.length
+        width = room.width * random.uniform(0.9, 1.1)
+        length = area / width
+        if not 0.5 <= length / width <= 2.0:
+            width, length = room.width, room.length
+        return room.x, room.y, width, length
+
+    candidates = [(0.0, room.y), (plan.house_width - room.width, room.y), (room.x, 0.0), (room.x, plan.house_length - room.length)]
+    for other in plan.rooms:
+        if other is not room and other.shares_floor(room):
+            candidates.extend([
+                (other.x + other.width, room.y), (other.x - room.width, room.y),
+                (room.x, other.y + other.length), (room.x, other.y - room.length),
+            ])
+    x, y = random.choice(candidates)
+    return x, y, room.width, room.length
+
+
+def anneal(
+    plan: FloorPlan, iterations: int = 500, initial_temperature: float = 10.0,
+    final_temperature: float = 0.05, step: float = 0.5
+) -> FloorPlan:
+    """
+    Refina uma planta válida com recozimento simulado (simulated annealing) sobre as posições e
+    proporções dos cômodos, usando avaliação incremental. Movimentos que tornariam a planta
+    inválida são descartados antes da avaliação. A planta original não é alterada.
+
+    Args:
+        plan (FloorPlan): A planta a ser refinada.
+        iterations (int): Número de movimentos propostos.
+        initial_temperature (float): Temperatura inicial (em unidades de fitness).
+        final_temperature (float): Temperatura final; o resfriamento é geométrico.
+        step (float): Desvio padrão dos deslocamentos na temperatura inicial, em metros.
+
+    Returns:
+        FloorPlan: A melhor planta encontrada (a própria planta, se for inválida ou não melhorar).
+    """
+
+    if plan.constraint_violation > 0 or iterations <= 0:
+        return plan
+
+    polished = FloorPlan(
+        area=plan.area,
+        orientation=plan.orientation,
+        house_type=plan.house_type,
+        special_room=plan.special_room,
+        bedrooms=plan.bedrooms,
+        bathrooms=plan.bathrooms,
+        closets=plan.closets,
+        rooms=[room.copy() for room in plan.rooms],
+        dimensions=(plan.house_width, plan.house_length),
+        profile=plan.profile,
+    )
+    evaluator = IncrementalEvaluator(polished)
+
+    best_fitness = evaluator.fitness
+    best_geometry = [(room.x, room.y, room.width, room.length) for room in polished.rooms]
+    cooling = (final_temperature / initial_temperature) ** (1 / iterations)
+    temperature = initial_temperature
+
+    for _ in range(iterations):
+        index = random.randrange(len(polished.rooms))
+        room = polished.rooms[index]
+        # O passo diminui junto com a temperatura
+        geometry = _propose(polished, room, step * temperature / initial_temperature + 0.05)
+        if polished.bitboard is not None:
+            geometry = polished.bitboard.snap(*geometry)
+
+        if evaluator.is_valid(index, geometry):
+            previous = (room.x, room.y, room.width, room.length)
+            current_fitness = evaluator.fitness
+            fitness = evaluator.apply(index, geometry)
+            delta = fitness - current_fitness
+            if delta < 0 and random.random() >= math.exp(delta / temperature):
+                evaluator.apply(index, previous)  # Rejeita o movimento
+            elif fitness > best_fitness:
+                best_fitness = fitness
+                best_geometry = [(room.x, room.y, room.width, room.length) for room in polished.rooms]
+
+        temperature *= cooling
+
+    if best_fitness <= plan.fitness:
+        return plan
+
+    for room, geometry in zip(polished.rooms, best_geometry):
+        room.x, room.y, room.width, room.length = geometry
+        room.furnitures = room.generate_furnitures()
+    polished.fitness = polished.calculate_fitness()
+
+    return polished
@@ -1,221 +1,330 @@
+import argparse
 import random
-import numpy as np
-import matplotlib.pyplot as plt
+import sys
+from typing import List, Optional
 
-from matplotlib.patches import Rectangle
+from utils import calculate_characteristics, characteristics_to_program
 
-from utils import calculate_characteristics
-from genetic_algorithm import evolutionary_cycle
+# numpy, matplotlib e o algoritmo genético são importados apenas quando necessários,
+# para que invocações por script (ex.: --help, validação de argumentos) iniciem rapidamente
 
-from constants import ROOMS
 
-
-def draw_floor_plan(house_plan) -> None:
+def draw_floor_plan(house_plan, output: Optional[str] = None) -> None:
     """
-    Desenha a planta da casa, incluindo cômodos, portas, janelas e mobílias.
+    Desenha a planta da casa, incluindo cômodos, portas, janelas e mobílias (ver render.py).
 
     Args:
         house_plan: Objeto contendo os detalhes da planta da casa.
+        output (Optional[str]): Arquivo de saída (o formato é definido pela extensão, ex.: .png, .svg).
+            Quando omitido, a planta é exibida em uma janela.
 
     Returns:
         None
     """
 
-    # Cria uma figura para cada andar da casa
-    num_floors = house_plan.max_floor
-    # Ajusta o tamanho da figura com base no número de andares
-    fig, axes = plt.subplots(1, num_floors, figsize=(10 * num_floors, 10))
-
-    if num_floors == 1:
-        axes = [axes]
-
-    titles = [f"Planta do Andar {floor}" for floor in range(num_floors)]
-
-    for ax, title in zip(axes, titles):
-        ax.set_title(title)
-        ax.set_xlim(0, house_plan.house_width)
-        ax.set_ylim(0, house_plan.house_length)
-        ax.set_aspect("equal")
-        ax.invert_yaxis()
-
-    # Define as cores para cada tipo de cômodo
-    colors = plt.cm.Set3(np.linspace(0, 1, len(ROOMS)))
-    color_map = dict(zip(ROOMS.keys(), colors))
-
-    # Desenha os cômodos, portas, janelas e mobílias
-    for room in house_plan.rooms:
-        ax = axes[room.floor]
-
-        # Adiciona um retângulo representando o cômodo
-        rectangle = Rectangle(
-            (room.x, room.y),
-            room.width,
-            room.length,
-            fill=True,
-            facecolor=color_map.get(room.type, "gray"),
-            edgecolor="black",
-            linewidth=2,
-        )
-        ax.add_patch(rectangle)
-
-        # Adiciona o texto com o tipo do cômodo no centro
-        ax.text(
-            room.x + room.width / 2,
-            room.y + room.length / 2,
-            room.type,
-            ha="center",
-            va="center",
-            wrap=True,
-            fontsize=8,
-        )
-
-        # Desenha as portas do cômodo
-        for door in room.door_positions:
-            door_x, door_y, door_width, door_height = door
-            door_rect = Rectangle(
-                (door_x, door_y),
-                door_width,
-                door_height,
-                fill=True,
-                facecolor="brown",
-                edgecolor="black",
-            )
-            ax.add_patch(door_rect)
-
-        # Desenha as janelas do cômodo
-        for _ in range(room.windows):
-            # Escolhe uma parede aleatória para adicionar a janela
-            wall = random.choice(['left', 'right', 'bottom', 'top'])
-
-            # Define a posição e tamanho da janela com base na parede escolhida
-            if wall == 'left':
-                window_x = room.x
-                window_y = room.y + random.uniform(0, room.length - 1)
-                window_width, window_height = 0.1, 1
-            elif wall == 'right':
-                window_x = room.x + room.width - 0.1
-                window_y = room.y + random.uniform(0, room.length - 1)
-                window_width, window_height = 0.1, 1
-            elif wall == 'bottom':
-                window_x = room.x + random.uniform(0, room.width - 1)
-                window_y = room.y
-                window_width, window_height = 1, 0.1
-            else:  # top
-                window_x = room.x + random.uniform(0, room.width - 1)
-                window_y = room.y + room.length - 0.1
-                window_width, window_height = 1, 0.1
-
-            window = Rectangle(
-                (window_x, window_y),
-                window_width,
-                window_height,
-                fill=True,
-                facecolor="lightblue",
-                edgecolor="black",
-            )
-            ax.add_patch(window)
+    from render import draw_floor_plans
 
-        # Desenha a mobília do cômodo
-        for furniture in room.furnitures:
-            furn_x = room.x + furniture["position"][0]
-            furn_y = room.y + furniture["position"][1]
-            furn_rect = Rectangle(
-                (furn_x, furn_y),
-                furniture["width"],
-                furniture["length"],
-                fill=True,
-                facecolor="gray",
-                edgecolor="black",
-                alpha=0.5,
-            )
-            ax.add_patch(furn_rect)
-            ax.text(
-                furn_x + furniture["width"] / 2,
-                furn_y + furniture["length"] / 2,
-                furniture["type"],
-                ha="center",
-                va="center",
-                fontsize=6,
-                wrap=True,
-            )
+    draw_floor_plans([house_plan], output)
 
-    # Adiciona a orientação da casa
-    orientation_text = f"N\n^\n|\n \n{house_plan.orientation.capitalize()}"
 
-    # Adiciona o texto de orientação em cada figura
-    for ax in axes:
-        ax.text(
-            1.02, 0.5, orientation_text, transform=ax.transAxes, va="center", ha="left"
-        )
+def positive_int(text: str) -> int:
+    """
+    Tipo de argumento (argparse) para inteiros positivos.
 
-    plt.tight_layout()
-    plt.show()
+    Args:
+        text (str): Valor informado na linha de comando.
 
+    Returns:
+        int: O valor convertido.
+    """
 
-# Ponto de entrada do programa
-if __name__ == "__main__":
-    # Solicitar entrada do usuário
-    full_name = input("Digite o nome completo do membro com o maior número de caracteres: ")
-    area = float(input("Digite a área da casa em m²: "))
-    orientation = input("Digite a orientação da casa (norte, sul, leste, oeste): ").lower()
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"inteiro inválido: {text!r}")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"deve ser um inteiro positivo: {value}")
+    return value
+
+
+def positive_float(text: str) -> float:
+    """
+    Tipo de argumento (argparse) para números reais positivos.
+
+    Args:
+        text (str): Valor informado na linha de comando.
+
+    Returns:
+        float: O valor convertido.
+    """
+
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"número inválido: {text!r}")
+    if not value > 0 or value == float("inf"):
+        raise argparse.ArgumentTypeError(f"deve ser um número positivo: {text}")
+    return value
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Lê os argumentos da linha de comando.
+
+    Args:
+        argv (Optional[List[str]]): Argumentos (por padrão, os de sys.argv).
+
+    Returns:
+        argparse.Namespace: Argumentos lidos.
+    """
+
+    parser = argparse.ArgumentParser(description="Gera plantas baixas com um algoritmo genético.")
+    parser.add_argument("--nome", help="Nome completo do membro com o maior número de caracteres.")
+    parser.add_argument("--area", type=positive_float, help="Área da casa em m².")
+    parser.add_argument("--orientacao", choices=["norte", "sul", "leste", "oeste"], help="Orientação da casa.")
+    parser.add_argument(
+        "--andares", type=positive_int,
+        help="Número de andares; substitui o do tipo de casa definido pelo nome (ex.: prédios de vários andares)."
+    )
+    parser.add_argument(
+        "--unidades", type=positive_int, default=1,
+        help="Número de unidades (apartamentos), cada uma com cozinha, salas, área de serviço, quartos, "
+             "banheiros e closets (padrão: 1)."
+    )
+    parser.add_argument("--quartos", type=int, help="Quartos por unidade; substitui o número definido pelo nome.")
+    parser.add_argument("--banheiros", type=int, help="Banheiros por unidade; substitui o número definido pelo nome.")
+    parser.add_argument("--closets", type=int, help="Closets por unidade; substitui o número definido pelo nome.")
+    parser.add_argument("--geracoes", type=positive_int, default=1000, help="Número de gerações (padrão: 1000).")
+    parser.add_argument("--populacao", type=positive_int, default=200, help="Tamanho da população (padrão: 200).")
+    parser.add_argument(
+        "--polimento", type=int, default=500,
+        help="Movimentos de recozimento simulado para refinar a melhor planta ao final; 0 desativa (padrão: 500)."
+    )
+    parser.add_argument("--semente", type=int, help="Semente do gerador aleatório, para execuções reprodutíveis.")
+    parser.add_argument("--modo", choices=["weighted", "pareto"], default="weighted", help="Modo de otimização.")
+    parser.add_argument("--perfil", help="Arquivo de perfil de avaliação (JSON).")
+    parser.add_argument(
+        "--modulo", type=positive_float,
+        help="Módulo da grade (em metros) do modo discreto: os cômodos são encaixados na grade e "
+             "avaliados com bitsets (padrão: o do perfil; contínuo se não houver)."
+    )
+    parser.add_argument(
+        "--biblioteca",
+        help="Biblioteca de plantas (JSON) usada para semear a população inicial; o resultado é adicionado a ela."
+    )
+    parser.add_argument(
+        "--formato", choices=["janela", "png", "svg", "miniatura", "json", "geojson", "texto"], default="janela",
+        help="Saída da planta: janela interativa, arquivo PNG/SVG, miniatura PNG (sem matplotlib), "
+             "JSON/GeoJSON ou apenas texto (padrão: janela)."
+    )
+    parser.add_argument("--saida", default="planta", help="Nome base dos arquivos gerados (padrão: planta).")
+    parser.add_argument(
+        "--historico",
+        help="Diretório do histórico colunar de todas as plantas avaliadas (ver plan_archive.py); "
+             "com --processos, cada execução usa o seu próprio diretório (sufixo -1, -2, ...)."
+    )
+    parser.add_argument(
+        "--processos", "--workers", type=int, default=1,
+        help="Número de execuções independentes em paralelo; a melhor é mantida (padrão: 1)."
+    )
+    parser.add_argument(
+        "--avaliadores", type=int, default=1,
+        help="Processos que avaliam o fitness de cada geração em paralelo, com a população em "
+             "memória compartilhada (padrão: 1, avaliação no próprio processo)."
+    )
+    parser.add_argument(
+        "--triagem", type=float, default=1.0,
+        help="Fração dos filhos avaliada por completo a cada geração; abaixo de 1, um modelo "
+             "substituto escolhe os mais promissores (padrão: 1, todos avaliados)."
+    )
+
+    return parser.parse_args(argv)
+
+
+def run_evolution(options: dict):
+    """
+    Executa o algoritmo genético em um processo (usada também pelas execuções paralelas).
+
+    Args:
+        options (dict): Argumentos de evolutionary_cycle, mais "seed", "profile_path", "module",
+            "library_path" e "archive_path".
+
+    Returns:
+        Union[FloorPlan, List[FloorPlan]]: Resultado de evolutionary_cycle.
+    """
+
+    from elite_library import EliteLibrary
+    from genetic_algorithm import evolutionary_cycle
+    from plan_archive import PlanArchive
+    from profiles import load_profile
+
+    options = dict(options)
+    seed = options.pop("seed")
+    profile_path = options.pop("profile_path")
+    module = options.pop("module")
+    library_path = options.pop("library_path")
+    archive_path = options.pop("archive_path")
+
+    if seed is not None:
+        random.seed(seed)
+
+    profile = None
+    if profile_path or module:
+        profile = load_profile(profile_path, {"module": module} if module else None)
+    library = EliteLibrary(library_path) if library_path else None
+
+    if archive_path is None:
+        return evolutionary_cycle(profile=profile, elite_library=library, **options)
+
+    with PlanArchive(archive_path) as archive:
+        return evolutionary_cycle(profile=profile, elite_library=library, archive=archive, **options)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Ponto de entrada do programa.
+
+    Args:
+        argv (Optional[List[str]]): Argumentos da linha de comando (por padrão, os de sys.argv).
+    """
+
+    args = parse_arguments(argv)
+
+    # Solicita interativamente apenas o que não foi informado na linha de comando
+    full_name = args.nome or input("Digite o nome completo do membro com o maior número de caracteres: ")
+    try:
+        area = args.area if args.area is not None else positive_float(input("Digite a área da casa em m²: "))
+    except argparse.ArgumentTypeError as error:
+        sys.exit(f"Área inválida: {error}")
+    orientation = args.orientacao or input("Digite a orientação da casa (norte, sul, leste, oeste): ").lower()
 
     # Calcular características com base no nome
-    remainder1, remainder2, remainder3 = calculate_characteristics(full_name)
+    house_type, special_room, bedrooms, bathrooms, closets = characteristics_to_program(
+        *calculate_characteristics(full_name)
+    )
 
-    # Definir características da casa com base nos restos
-    if remainder1 == 0:
-        house_type = "2 andares e uma laje"
-    elif remainder1 == 1:
-        house_type = "2 andares e um sótão"
-    else:
-        house_type = "2 andares e um porão"
-
-    if remainder2 == 0:
-        special_room = "Sala de Música"
-    elif remainder2 == 1:
-        special_room = "Sala de Ginástica"
-    elif remainder2 == 2:
-        special_room = "Escritório"
-    else:
-        special_room = "Sala de Jogos"
-
-    if remainder3 == 0:
-        bedrooms = 3
-        bathrooms = 2
-        closets = 2
-    elif remainder3 == 1:
-        bedrooms = 2
-        bathrooms = 3
-        closets = 2
-    elif remainder3 == 2:
-        bedrooms = 3
-        bathrooms = 3
-        closets = 1
-    else:
-        bedrooms = 2
-        bathrooms = 3
-        closets = 1
+    # Programas maiores que os definidos pelo nome: andares, unidades e cômodos por unidade
+    if args.andares is not None or args.unidades != 1:
+        from profiles import house_floors, house_type_label
+
+        house_type = house_type_label(args.andares or house_floors(house_type), args.unidades)
+    bedrooms = args.quartos if args.quartos is not None else bedrooms
+    bathrooms = args.banheiros if args.banheiros is not None else bathrooms
+    closets = args.closets if args.closets is not None else closets
 
     # Exibir as características definidas
-    print(f"\nA casa terá {house_type}, um(a) {special_room}, {bedrooms} quartos, {bathrooms} banheiros e {closets} closets.")
+    per_unit = " por unidade" if args.unidades > 1 else ""
+    print(
+        f"\nA casa terá {house_type}, um(a) {special_room}, {bedrooms} quartos, {bathrooms} banheiros e "
+        f"{closets} closets{per_unit}."
+    )
+
+    options = {
+        "generations": args.geracoes,
+        "population_size": args.populacao,
+        "area": area,
+        "orientation": orientation,
+        "house_type": house_type,
+        "special_room": special_room,
+        "bedrooms": bedrooms,
+        "bathrooms": bathrooms,
+        "closets": closets,
+        "mode": args.modo,
+        "polish_iterations": args.polimento,
+        "workers": args.avaliadores,
+        "surrogate_fraction": args.triagem,
+        "seed": args.semente,
+        "profile_path": args.perfil,
+        "module": args.modulo,
+        "library_path": args.biblioteca,
+        "archive_path": args.historico,
+    }
+
+    from fitness_cache import get_fitness_cache
+
+    cache = get_fitness_cache()
+    lookups = cache.counters() if cache is not None else (0, 0)
 
     # Executar o algoritmo genético para gerar a planta
-    best_plan = evolutionary_cycle(
-        generations=1000,          # Aumentar o número de gerações
-        population_size=200,        # Aumentar o tamanho da população
-        area=area,
-        orientation=orientation,
-        house_type=house_type,
-        special_room=special_room,
-        bedrooms=bedrooms,
-        bathrooms=bathrooms,
-        closets=closets,
-    )
+    if args.processos > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        base_seed = args.semente if args.semente is not None else random.randrange(2 ** 32)
+        runs = [
+            dict(options, seed=base_seed + index, archive_path=args.historico and f"{args.historico}-{index + 1}")
+            for index in range(args.processos)
+        ]
+        with ProcessPoolExecutor(max_workers=args.processos) as executor:
+            results = list(executor.map(run_evolution, runs))
+    else:
+        results = [run_evolution(options)]
 
-    # Desenhar a planta gerada
-    draw_floor_plan(best_plan)
+        # Contadores desta execução (as execuções paralelas usam o cache de cada processo)
+        if cache is not None:
+            hits, misses = cache.counters()
+            stats = cache.stats((hits - lookups[0], misses - lookups[1]))
+            print(
+                f"Cache de fitness: {stats['cache_hits']} acertos, {stats['cache_misses']} falhas "
+                f"({stats['cache_hit_rate']:.0%})"
+            )
+
+    if args.modo == "pareto":
+        from genetic_algorithm import pareto_front
+
+        plans = pareto_front([plan for front in results for plan in front])
+    else:
+        plans = [max(results, key=lambda plan: plan.fitness)]
+
+    if args.biblioteca:
+        from elite_library import EliteLibrary
+
+        # Atualiza a biblioteca no processo principal (as execuções paralelas não a compartilham)
+        library = EliteLibrary(args.biblioteca)
+        for plan in plans:
+            library.add(plan)
+        library.save()
+
+    if args.formato in ("json", "geojson"):
+        from export import PlanWriter
+
+        output = f"{args.saida}.{args.formato}"
+        with PlanWriter(output, args.formato) as writer:
+            for plan in plans:
+                writer.write(plan)
+        print(f"Planta(s) exportada(s) em {output}")
+
+    if args.formato == "miniatura":
+        from thumbnail import thumbnail_png
+
+        output = f"{args.saida}.png"
+        with open(output, "wb") as file:
+            file.write(thumbnail_png(plans))
+        print(f"Miniatura salva em {output}")
+
+    for index, plan in enumerate(plans):
+        if len(plans) > 1:
+            print(f"\n=== Alternativa {index + 1} de {len(plans)} ===")
+
+        # Desenhar a planta gerada
+        if args.formato == "janela":
+            draw_floor_plan(plan)
+        elif args.formato in ("png", "svg"):
+            suffix = f"_{index + 1}" if len(plans) > 1 else ""
+            output = f"{args.saida}{suffix}.{args.formato}"
+            draw_floor_plan(plan, output)
+            print(f"Planta salva em {output}")
+
+        print_plan(plan)
+
+
+def print_plan(best_plan) -> None:
+    """
+    Exibe as informações da planta gerada.
+
+    Args:
+        best_plan: A planta a ser exibida.
+    """
 
-    # Exibir informações sobre a planta gerada
     print("\nInformações da planta gerada:")
     for room in best_plan.rooms:
         print(f"Cômodo: {room.type}, Andar: {room.floor}")
@@ -229,3 +338,8 @@ if __name__ == "__main__":
         print()
 
     print(f"Fitness da planta: {best_plan.fitness}")
+
+
+# Ponto de entrada do programa
+if __name__ == "__main__":
+    main(sys.argv[1:])
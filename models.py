@@ -1,9 +1,16 @@
 import math
 import random
 
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from constants import ROOMS, FURNITURES
+from adjacency import SharedWall, adjacency_graph, door_position, find_shared_walls, shared_wall_between
+from bitboard import Bitboard, CellRectangle, count_overlapping, count_overlapping_with, popcount
+from constants import ADJACENCY_TOLERANCE
+from fitness import PlanGraph, area_separation_score, circulation_score
+from fitness_cache import get_fitness_cache
+from furniture import furnish_room
+from profiles import EvaluationProfile, default_profile, house_floors, program_rooms
+from spatial_index import SpatialIndex, overlapping_pairs
 
 
 class Room:
@@ -30,158 +37,132 @@ class Room:
         self.windows: int = random.randint(1, 3)
         self.furnitures: List[dict] = self.generate_furnitures()
 
-    def generate_furnitures(self) -> List[dict]:
+    @classmethod
+    def bare(cls, room_type: str, floor: int, x: float, y: float, width: float, length: float) -> 'Room':
         """
-        Gera as mobílias para o cômodo, posicionando-as ao longo das paredes.
+        Cria um cômodo só com a geometria, sem sortear janelas (nenhuma) nem gerar mobílias:
+        nenhum critério de fitness as usa, e a avaliação nos processos paralelos não deve
+        consumir o gerador aleatório.
+
+        Args:
+            room_type (str): Tipo do cômodo.
+            floor (int): Andar do cômodo.
+            x (float): Posição X na planta.
+            y (float): Posição Y na planta.
+            width (float): Largura do cômodo.
+            length (float): Comprimento do cômodo.
 
         Returns:
-            List[dict]: Lista de mobílias com seus tipos, dimensões e posições.
+            Room: O cômodo.
         """
 
-        furnitures = []
-        occupied_spaces: List[Tuple[float, float, float, float]] = []
+        room = cls.__new__(cls)
+        room.type, room.floor, room.x, room.y, room.width, room.length = room_type, floor, x, y, width, length
+        room.door_positions = []
+        room.windows = 0
+        room.furnitures = []
+        return room
 
-        for furniture in FURNITURES.get(self.type, []):
-            furniture_type, furniture_width, furniture_length = furniture
-            if furniture_width <= self.width and furniture_length <= self.length:
-                position = self.find_position_on_walls(furniture_width, furniture_length, occupied_spaces)
-                if position:
-                    furnitures.append({
-                        "type": furniture_type,
-                        "width": furniture_width,
-                        "length": furniture_length,
-                        "position": position,
-                    })
-                    occupied_spaces.append((position[0], position[1], furniture_width, furniture_length))
-
-        return furnitures
+    def generate_furnitures(self) -> List[dict]:
+        """
+        Gera as mobílias para o cômodo, posicionando-as ao longo das paredes com o empacotador
+        de furniture.py (layouts memorizados por tipo e dimensões do cômodo).
 
-    def find_position_on_walls(self, furniture_width: float, furniture_length: float, occupied_spaces: List[Tuple[float, float, float, float]]) -> Optional[Tuple[float, float]]:
+        Returns:
+            List[dict]: Lista de mobílias com seus tipos, dimensões e posições.
         """
-        Encontra uma posição para a mobília ao longo das paredes, evitando sobreposições.
 
-        Args:
-            furniture_width (float): Largura da mobília.
-            furniture_length (float): Comprimento da mobília.
-            occupied_spaces (List[Tuple[float, float, float, float]]): Lista de espaços já ocupados.
+        return furnish_room(self.type, self.width, self.length)
+
+    def copy(self) -> 'Room':
+        """
+        Cria uma cópia independente do cômodo, sem regerar janelas e mobílias.
 
         Returns:
-            Optional[Tuple[float, float]]: Posição X e Y para a mobília ou None se não encontrar posição.
+            Room: Novo cômodo com os mesmos atributos.
         """
 
-        walls = [
-            # Parede esquerda
-            (0, random.uniform(0, self.length - furniture_length)),
-            # Parede direita
-            (self.width - furniture_width, random.uniform(0, self.length - furniture_length)),
-            # Parede inferior
-            (random.uniform(0, self.width - furniture_width), 0),
-            # Parede superior
-            (random.uniform(0, self.width - furniture_width), self.length - furniture_length)
-        ]
+        clone = Room.__new__(Room)
+        clone.__dict__.update(self.__dict__)
+        clone.door_positions = list(self.door_positions)
+        clone.furnitures = [dict(furniture) for furniture in self.furnitures]
+
+        return clone
+
+    @property
+    def spans_floors(self) -> bool:
+        """
+        Indica se o cômodo ocupa a mesma projeção em todos os andares (escadas).
 
-        for position in walls:
-            if not self.check_overlap(position, furniture_width, furniture_length, occupied_spaces):
-                return position
+        Returns:
+            bool: True para escadas, False para os demais cômodos.
+        """
 
-        return None
+        return self.type == "Escadas"
 
-    def check_overlap(self, position: Tuple[float, float], furniture_width: float, furniture_length: float, occupied_spaces: List[Tuple[float, float, float, float]]) -> bool:
+    def shares_floor(self, other_room: 'Room') -> bool:
         """
-        Verifica se a mobília sobrepõe alguma área já ocupada.
+        Verifica se dois cômodos disputam o mesmo espaço em algum andar: estão no mesmo andar,
+        ou um deles é uma escada (cuja projeção é reservada em todos os andares).
 
         Args:
-            position (Tuple[float, float]): Posição X e Y da mobília.
-            furniture_width (float): Largura da mobília.
-            furniture_length (float): Comprimento da mobília.
-            occupied_spaces (List[Tuple[float, float, float, float]]): Lista de espaços já ocupados.
+            other_room (Room): O outro cômodo.
 
         Returns:
-            bool: True se houver sobreposição, False caso contrário.
+            bool: True se os cômodos podem se sobrepor, False caso contrário.
         """
 
-        x_mob, y_mob = position
-        for (x_occ, y_occ, width_occ, length_occ) in occupied_spaces:
-            if (
-                x_mob < x_occ + width_occ and
-                x_mob + furniture_width > x_occ and
-                y_mob < y_occ + length_occ and
-                y_mob + furniture_length > y_occ
-            ):
-                return True
-        return False
+        return self.floor == other_room.floor or self.spans_floors or other_room.spans_floors
 
-    def add_doors(self, neighboring_rooms: List['Room']) -> None:
+    def add_doors(self, neighboring_rooms: List['Room'], tolerance: float = ADJACENCY_TOLERANCE) -> None:
         """
         Adiciona portas nas paredes que conectam este cômodo aos vizinhos.
 
         Args:
             neighboring_rooms (List[Room]): Lista de cômodos vizinhos.
+            tolerance (float): Distância máxima entre paredes para considerá-las coincidentes.
         """
 
         for neighbor in neighboring_rooms:
-            if self.is_adjacent(neighbor):
-                door_position = self.find_shared_wall(neighbor)
-                if door_position:
-                    self.door_positions.append(door_position)
+            door_position = self.find_shared_wall(neighbor, tolerance)
+            if door_position:
+                self.door_positions.append(door_position)
 
-    def is_adjacent(self, other_room: 'Room') -> bool:
+    def is_adjacent(self, other_room: 'Room', tolerance: float = ADJACENCY_TOLERANCE) -> bool:
         """
-        Verifica se este cômodo é adjacente a outro cômodo.
+        Verifica se este cômodo é adjacente a outro cômodo, isto é, se ambos estão no mesmo
+        andar e compartilham um trecho de parede (com tolerância) de comprimento positivo.
 
         Args:
             other_room (Room): Outro cômodo para verificar adjacência.
+            tolerance (float): Distância máxima entre paredes para considerá-las coincidentes.
 
         Returns:
             bool: True se for adjacente, False caso contrário.
         """
 
-        if self.floor != other_room.floor:
-            return False
-        # Verifica sobreposição de fronteiras
-        if (
-            self.x == other_room.x + other_room.width or
-            self.x + self.width == other_room.x or
-            self.y == other_room.y + other_room.length or
-            self.y + self.length == other_room.y
-        ):
-            return True
-        return False
+        return shared_wall_between(self, other_room, tolerance) is not None
 
-    def find_shared_wall(self, other_room: 'Room') -> Optional[Tuple[float, float, float, float]]:
+    def find_shared_wall(self, other_room: 'Room', tolerance: float = ADJACENCY_TOLERANCE) -> Optional[Tuple[float, float, float, float]]:
         """
         Encontra a posição para a porta na parede compartilhada com o outro cômodo.
+        A porta é centralizada no trecho compartilhado.
 
         Args:
             other_room (Room): Outro cômodo com o qual compartilhará a parede.
+            tolerance (float): Distância máxima entre paredes para considerá-las coincidentes.
 
         Returns:
-            Optional[Tuple[float, float, float, float]]: Posição e dimensões da porta ou None.
-        """
-
-        if self.x == other_room.x + other_room.width:
-            # Parede esquerda de self, direita de other_room
-            door_x = self.x
-            door_y = max(self.y, other_room.y) + min(self.length, other_room.length) / 2
-            return (door_x, door_y, 0.1, 0.8)
-        elif self.x + self.width == other_room.x:
-            # Parede direita de self, esquerda de other_room
-            door_x = self.x + self.width
-            door_y = max(self.y, other_room.y) + min(self.length, other_room.length) / 2
-            return (door_x, door_y, 0.1, 0.8)
-        elif self.y == other_room.y + other_room.length:
-            # Parede inferior de self, superior de other_room
-            door_x = max(self.x, other_room.x) + min(self.width, other_room.width) / 2
-            door_y = self.y
-            return (door_x, door_y, 0.8, 0.1)
-        elif self.y + self.length == other_room.y:
-            # Parede superior de self, inferior de other_room
-            door_x = max(self.x, other_room.x) + min(self.width, other_room.width) / 2
-            door_y = self.y + self.length
-            return (door_x, door_y, 0.8, 0.1)
-        else:
+            Optional[Tuple[float, float, float, float]]: Posição e dimensões da porta ou None
+                se não houver parede compartilhada larga o suficiente.
+        """
+
+        wall = shared_wall_between(self, other_room, tolerance)
+        if wall is None:
             return None
 
+        return door_position(*wall)
+
 
 class FloorPlan:
     def __init__(
@@ -193,7 +174,10 @@ class FloorPlan:
         bedrooms: int,
         bathrooms: int,
         closets: int,
-        rooms: Optional[List[Room]] = None
+        rooms: Optional[List[Room]] = None,
+        dimensions: Optional[Tuple[float, float]] = None,
+        profile: Optional[EvaluationProfile] = None,
+        evaluate: bool = True
     ):
         """
         Classe que representa a planta da casa.
@@ -201,12 +185,19 @@ class FloorPlan:
         Args:
             area (float): Área total da casa em metros quadrados.
             orientation (str): Orientação da casa (norte, sul, leste, oeste).
-            house_type (str): Tipo da casa (ex: "2 andares e uma laje").
+            house_type (str): Tipo da casa (ex: "2 andares e uma laje", "6 andares e 20 unidades"),
+                que define o número de andares e de unidades (ver profiles.program_rooms).
             special_room (str): Tipo de cômodo especial.
-            bedrooms (int): Número de quartos.
-            bathrooms (int): Número de banheiros.
-            closets (int): Número de closets.
+            bedrooms (int): Número de quartos por unidade.
+            bathrooms (int): Número de banheiros por unidade.
+            closets (int): Número de closets por unidade.
             rooms (Optional[List[Room]]): Lista de cômodos já existentes (opcional).
+            dimensions (Optional[Tuple[float, float]]): Largura e comprimento da casa (opcional).
+                Quando omitido, as dimensões são geradas aleatoriamente a partir da área.
+            profile (Optional[EvaluationProfile]): Perfil de avaliação (pesos, penalidades e faixas
+                de área dos cômodos). Quando omitido, usa o perfil padrão.
+            evaluate (bool): Se False, o fitness fica pendente (None) para ser calculado depois,
+                em lote (ver parallel_evaluation.evaluate_population).
         """
 
         self.area: float = area
@@ -217,36 +208,50 @@ class FloorPlan:
         self.bathrooms: int = bathrooms
         self.closets: int = closets
 
-        self.house_width, self.house_length = self.generate_floor_dimensions()
-        self.max_floor: int = 2 if '2 andares' in self.house_type else 1  # Número de andares
+        self.profile: EvaluationProfile = profile if profile is not None else default_profile()
+        self.required_counts = self.profile.required_counts(house_type, special_room, bedrooms, bathrooms, closets)
+
+        if dimensions is not None:
+            self.house_width, self.house_length = dimensions
+        else:
+            self.house_width, self.house_length = self.generate_floor_dimensions()
+        self.max_floor: int = house_floors(self.house_type)  # Número de andares
+
+        # Grade do modo discreto (perfil com módulo), compartilhada por todos os andares
+        self.bitboard: Optional[Bitboard] = (
+            Bitboard(self.house_width, self.house_length, self.profile.module) if self.profile.module else None
+        )
 
         self.rooms: List[Room] = rooms if rooms is not None else self.generate_random_rooms()
+        self.snap_rooms()
 
-        self.fitness: float = self.calculate_fitness()
+        self.fitness: Optional[float] = self.calculate_fitness() if evaluate else None
 
     def generate_random_rooms(self) -> List[Room]:
         """
         Gera os cômodos aleatoriamente, garantindo que estejam dentro dos limites e não se sobreponham.
+        A escada é posicionada primeiro (reservando sua projeção em todos os andares) e os demais
+        cômodos vão, preferencialmente, para o andar com menos área ocupada.
 
         Returns:
             List[Room]: Lista de cômodos gerados.
         """
 
         rooms = []
-        mandatory_rooms = [
-            ("Cozinha", 1),
-            ("Sala de Estar", 1),
-            ("Sala de Jantar", 1),
-            ("Área de Serviço", 1),
-            ("Banheiro", 1),  # Social bathroom
-            ("Quarto", self.bedrooms),
-            ("Banheiro", self.bathrooms - 1),  # Remaining bathrooms
-            ("Closet", self.closets),
-            (self.special_room, 1),
-        ]
-
-        if '2 andares' in self.house_type:
-            mandatory_rooms.append(("Escadas", 1))
+        mandatory_rooms = list(program_rooms(
+            self.house_type, self.special_room, self.bedrooms, self.bathrooms, self.closets
+        ).items())
+        staircases = [item for item in mandatory_rooms if item[0] == "Escadas"]
+        mandatory_rooms = [item for item in mandatory_rooms if item[0] != "Escadas"]
+
+        # Os cômodos maiores são posicionados antes, enquanto os andares ainda têm espaço livre
+        mandatory_rooms.sort(key=lambda item: -self.profile.room_ranges.get(item[0], (6, 10))[1])
+        mandatory_rooms = staircases + mandatory_rooms
+
+        # Índice espacial e áreas por andar mantidos a cada cômodo posicionado, de modo que cada
+        # tentativa só compara os cômodos próximos (programas grandes, com centenas de cômodos)
+        index = SpatialIndex()
+        areas = [0.0] * self.max_floor
 
         for room_type, quantity in mandatory_rooms:
             for _ in range(quantity):
@@ -254,12 +259,15 @@ class FloorPlan:
                     width, length = self.generate_room_dimensions(room_type)
                     if width > self.house_width or length > self.house_length:
                         continue  # Tenta novamente com dimensões diferentes
-                    floor = random.randint(0, self.max_floor - 1)
+                    floor = self.choose_floor(room_type, rooms, attempt, areas)
                     x = random.uniform(0, self.house_width - width)
                     y = random.uniform(0, self.house_length - length)
                     new_room = Room(room_type, floor, x, y, width, length)
-                    if not self.has_overlap(new_room, rooms):
+                    if not index.overlaps(new_room):
                         rooms.append(new_room)
+                        index.add(new_room)
+                        if not new_room.spans_floors:
+                            areas[floor] += width * length
                         break
         return rooms
 
@@ -275,11 +283,77 @@ class FloorPlan:
             bool: True se houver sobreposição, False caso contrário.
         """
 
+        # Teste de retângulos em linha (mesmo critério de check_overlap), chamado a cada tentativa de posicionamento
+        x_end = new_room.x + new_room.width
+        y_end = new_room.y + new_room.length
         for room in rooms:
-            if room.floor == new_room.floor and self.check_overlap(room, new_room):
+            if (
+                room.x < x_end and new_room.x < room.x + room.width and
+                room.y < y_end and new_room.y < room.y + room.length and
+                room.shares_floor(new_room)
+            ):
                 return True
         return False
 
+    def floor_areas(self, rooms: Optional[List[Room]] = None) -> List[float]:
+        """
+        Calcula a área ocupada em cada andar. A escada, presente em todos os andares, não é contada.
+
+        Args:
+            rooms (Optional[List[Room]]): Cômodos considerados (por padrão, os da planta).
+
+        Returns:
+            List[float]: Área ocupada por andar.
+        """
+
+        areas = [0.0] * self.max_floor
+        for room in self.rooms if rooms is None else rooms:
+            if not room.spans_floors and self.on_valid_floor(room):
+                areas[room.floor] += room.width * room.length
+        return areas
+
+    def on_valid_floor(self, room: Room) -> bool:
+        """
+        Verifica se o cômodo está em um andar da casa (escadas ocupam todos). Cômodos em andares
+        inexistentes não ocupam área em nenhum andar e contam como violação, junto com os cômodos
+        fora dos limites (ver count_out_of_bounds).
+
+        Args:
+            room (Room): O cômodo.
+
+        Returns:
+            bool: True se o andar existe, False caso contrário.
+        """
+
+        return room.spans_floors or 0 <= room.floor < self.max_floor
+
+    def choose_floor(
+        self, room_type: str, rooms: List[Room], attempt: int = 0, areas: Optional[List[float]] = None
+    ) -> int:
+        """
+        Escolhe o andar de um novo cômodo. Escadas ficam sempre no térreo (sua projeção vale para
+        todos os andares); os demais cômodos vão para o andar com menos área ocupada, e só são
+        sorteados entre os andares depois de metade das tentativas sem sucesso.
+
+        Args:
+            room_type (str): Tipo do cômodo.
+            rooms (List[Room]): Cômodos já posicionados.
+            attempt (int): Número da tentativa de posicionamento.
+            areas (Optional[List[float]]): Área ocupada por andar, quando já mantida por quem chama
+                (por padrão, calculada a partir de rooms).
+
+        Returns:
+            int: Andar escolhido.
+        """
+
+        if room_type == "Escadas" or self.max_floor == 1:
+            return 0
+        if attempt >= 50:
+            return random.randint(0, self.max_floor - 1)
+
+        areas = self.floor_areas(rooms) if areas is None else areas
+        return min(range(self.max_floor), key=lambda floor: (areas[floor], random.random()))
+
     def generate_floor_dimensions(self) -> Tuple[float, float]:
         """
         Gera as dimensões da planta com base na área total.
@@ -310,7 +384,7 @@ class FloorPlan:
             Tuple[float, float]: Largura e comprimento do cômodo.
         """
 
-        min_area, max_area = ROOMS.get(room_type, (6, 10))
+        min_area, max_area = self.profile.room_ranges.get(room_type, (6, 10))
         area = random.uniform(min_area, max_area)
 
         min_ratio = 0.5
@@ -336,10 +410,10 @@ class FloorPlan:
 
         for room_type, quantity in mandatory_rooms:
             for _ in range(quantity):
-                for _ in range(100):  # Limite de tentativas para evitar loop infinito
+                for attempt in range(100):  # Limite de tentativas para evitar loop infinito
                     width, length = self.generate_room_dimensions(room_type)
 
-                    floor = random.randint(0, self.max_floor - 1)
+                    floor = self.choose_floor(room_type, self.rooms, attempt)
 
                     x = random.uniform(0, self.house_width - width)
                     y = random.uniform(0, self.house_length - length)
@@ -369,6 +443,21 @@ class FloorPlan:
             room2.y + room2.length <= room1.y
         )
 
+    def initialize_grid(self) -> None:
+        """
+        Cria a grade binária (células de 1 m²) de cada andar e marca os cômodos posicionados.
+        """
+
+        columns = math.ceil(self.house_width)
+        rows = math.ceil(self.house_length)
+        self.grade = [[[0] * columns for _ in range(rows)] for _ in range(self.max_floor)]
+
+        for room in self.rooms:
+            if not self.on_valid_floor(room):
+                continue
+            for floor in range(self.max_floor) if room.spans_floors else (room.floor,):
+                self.mark_grid(floor, room.x, room.y, room.width, room.length)
+
     def mark_grid(self, floor: int, x: float, y: float, width: float, length: float) -> None:
         """
         Marca o espaço ocupado pelo cômodo na grade.
@@ -413,6 +502,19 @@ class FloorPlan:
             for j in range(x_start, x_end):
                 self.grade[floor][i][j] = 0  # Assumindo que self.grade é uma estrutura pré-definida
 
+    def adjacency_graph(self, tolerance: float = ADJACENCY_TOLERANCE) -> Dict[int, List[SharedWall]]:
+        """
+        Monta o grafo de adjacência dos cômodos da planta com um índice de arestas ordenadas.
+
+        Args:
+            tolerance (float): Distância máxima entre paredes para considerá-las coincidentes.
+
+        Returns:
+            Dict[int, List[SharedWall]]: Paredes compartilhadas de cada cômodo (pelo índice em self.rooms).
+        """
+
+        return adjacency_graph(self.rooms, tolerance)
+
     def find_neighbors(self, current_room: Room) -> List[Room]:
         """
         Encontra os cômodos vizinhos ao current_room.
@@ -424,12 +526,35 @@ class FloorPlan:
             List[Room]: Lista de cômodos vizinhos.
         """
 
-        neighbors = []
+        for index, room in enumerate(self.rooms):
+            if room is current_room:
+                graph = self.adjacency_graph()
+                return [self.rooms[wall.neighbor(index)] for wall in graph[index]]
+
+        # Cômodo externo à planta: compara com todos os cômodos
+        return [room for room in self.rooms if current_room.is_adjacent(room)]
+
+    def furnish(self) -> None:
+        """
+        Regera as mobílias de todos os cômodos (necessário após mutações de dimensão).
+        """
+
         for room in self.rooms:
-            if room != current_room and current_room.is_adjacent(room):
-                neighbors.append(room)
+            room.furnitures = room.generate_furnitures()
 
-        return neighbors
+    def place_doors(self) -> None:
+        """
+        Posiciona as portas em todas as paredes compartilhadas da planta. Cada porta é
+        registrada uma única vez, no cômodo de menor índice.
+        """
+
+        for room in self.rooms:
+            room.door_positions = []
+
+        for wall in find_shared_walls(self.rooms):
+            position = door_position(wall.orientation, wall.coordinate, wall.start, wall.end)
+            if position:
+                self.rooms[min(wall.room1, wall.room2)].door_positions.append(position)
 
     def fill_empty_areas(self) -> None:
         """
@@ -443,7 +568,37 @@ class FloorPlan:
 
     def calculate_fitness(self) -> float:
         """
-        Calcula o valor de fitness da planta.
+        Calcula o valor de fitness da planta. Também registra o número de violações
+        (self.constraint_violation) e o valor de cada critério (self.fitness_components).
+
+        Plantas com o mesmo genoma (ver fitness_cache.FitnessCache) reaproveitam a avaliação memorizada.
+        A geometria não é alterada: no modo discreto, os cômodos já foram encaixados na grade ao
+        criar a planta e após cada operador genético (ver snap_rooms).
+
+        Returns:
+            float: Valor de fitness da planta.
+        """
+
+        cache = get_fitness_cache()
+        if cache is None:
+            return self.evaluate()
+
+        key = cache.key(self)
+        cached = cache.get(key)
+        if cached is not None:
+            fitness, self.constraint_violation, components = cached
+            self.fitness_components = dict(components)
+            return fitness
+
+        fitness = self.evaluate()
+        cache.put(key, (fitness, self.constraint_violation, dict(self.fitness_components)))
+
+        return fitness
+
+    def evaluate(self) -> float:
+        """
+        Avalia a planta (sem consultar o cache): verifica as restrições e, se a planta for
+        válida, soma os critérios ativos do perfil.
 
         Returns:
             float: Valor de fitness da planta.
@@ -455,39 +610,114 @@ class FloorPlan:
         num_out_of_bounds = self.count_out_of_bounds()
         num_missing_rooms = self.check_all_rooms_present()
 
+        self.constraint_violation: int = num_overlaps + num_out_of_bounds + num_missing_rooms
+        self.fitness_components: Dict[str, float] = {}
+
         if num_overlaps > 0 or num_out_of_bounds > 0 or num_missing_rooms > 0:
             # Penaliza fortemente plantas inválidas
-            fitness -= (num_overlaps * 1000 + num_out_of_bounds * 1000 + num_missing_rooms * 1000)
+            fitness -= (
+                num_overlaps * self.profile.overlap_penalty +
+                num_out_of_bounds * self.profile.out_of_bounds_penalty +
+                num_missing_rooms * self.profile.missing_room_penalty
+            )
             return fitness  # Retorna cedo pois a planta é inválida
 
         # Se a planta é válida, avalia outros critérios
-        fitness += self.evaluate_area_utilization()
-        fitness += self.evaluate_area_separation()
-        fitness += self.evaluate_natural_light()
-        fitness += self.evaluate_external_connections()
-        fitness += self.evaluate_staircase_position()
+        # O grafo de cômodos é montado uma única vez e compartilhado pelos termos que o usam
+        graph = PlanGraph(self)
+
+        evaluators = {
+            "area_utilization": self.evaluate_area_utilization,
+            "area_separation": lambda: self.evaluate_area_separation(graph),
+            "circulation": lambda: self.evaluate_circulation(graph),
+            "natural_light": self.evaluate_natural_light,
+            "external_connections": self.evaluate_external_connections,
+            "staircase_position": self.evaluate_staircase_position,
+        }
+
+        # Avalia apenas os critérios ativos no perfil
+        weights = self.profile.objective_weights
+        for objective in self.profile.objectives:
+            self.fitness_components[objective] = evaluators[objective]()
+            fitness += weights[objective] * self.fitness_components[objective]
 
         return fitness
 
+    def objectives(self) -> List[float]:
+        """
+        Retorna os critérios ativos do perfil como objetivos separados (a maximizar), na ordem de
+        fitness.OBJECTIVES. Plantas inválidas têm todos os objetivos iguais a zero.
+
+        Returns:
+            List[float]: Valor de cada objetivo.
+        """
+
+        return [self.fitness_components.get(name, 0.0) for name in self.profile.objectives]
+
+    def snap_rooms(self) -> None:
+        """
+        No modo discreto, encaixa a posição e as dimensões de cada cômodo na grade do módulo.
+        Chamado na criação da planta e por quem altera a geometria dos cômodos (cruzamento,
+        mutação e reparo), nunca pela avaliação, para que o genoma lido seja o avaliado.
+        """
+
+        if self.bitboard is None:
+            return
+
+        for room in self.rooms:
+            room.x, room.y, room.width, room.length = self.bitboard.snap(room.x, room.y, room.width, room.length)
+
+    def room_masks(self) -> List[int]:
+        """
+        Monta as máscaras de ocupação (bitsets) dos cômodos no modo discreto. As máscaras ficam
+        em cache enquanto a geometria dos cômodos não mudar, de modo que a área ocupada e o grafo
+        de cômodos de uma avaliação as montam uma única vez.
+
+        Returns:
+            List[int]: Máscara de cada cômodo, na ordem de self.rooms.
+        """
+
+        key = tuple((room.x, room.y, room.width, room.length) for room in self.rooms)
+        if getattr(self, "_masks_key", None) != key:
+            self._masks_key = key
+            self._masks = [self.bitboard.mask(room) for room in self.rooms]
+
+        return self._masks
+
     def count_overlaps(self) -> int:
         """
-        Conta o número de sobreposições entre os cômodos.
+        Conta o número de sobreposições entre os cômodos. No modo discreto, os cômodos (já
+        encaixados na grade) viram retângulos de células inteiras, comparados andar por andar, e as
+        escadas com todos os cômodos: o teste é exato e dispensa os bitsets. No contínuo, só os
+        pares vizinhos em um índice espacial são comparados (ver spatial_index).
 
         Returns:
             int: Número de sobreposições.
         """
 
-        overlaps = 0
-        for i, room1 in enumerate(self.rooms):
-            for room2 in self.rooms[i+1:]:
-                if room1.floor == room2.floor and self.check_overlap(room1, room2):
-                    overlaps += 1
+        if self.bitboard is None:
+            return len(overlapping_pairs(self.rooms))
+
+        by_floor: Dict[int, List[CellRectangle]] = {}
+        spanning: List[CellRectangle] = []
+        for room in self.rooms:
+            rectangle = self.bitboard.rectangle(room)
+            if room.spans_floors:
+                spanning.append(rectangle)
+            else:
+                by_floor.setdefault(room.floor, []).append(rectangle)
+
+        overlaps = sum(count_overlapping(rectangles) for rectangles in by_floor.values())
+        for index, rectangle in enumerate(spanning):
+            overlaps += count_overlapping_with(rectangle, spanning[index + 1:])
+            overlaps += sum(count_overlapping_with(rectangle, rectangles) for rectangles in by_floor.values())
 
         return overlaps
 
     def count_out_of_bounds(self) -> int:
         """
-        Conta quantos cômodos estão fora dos limites da planta.
+        Conta quantos cômodos estão fora dos limites da planta, inclusive os que estão em um andar
+        que a casa não tem (ver on_valid_floor).
 
         Returns:
             int: Número de cômodos fora dos limites.
@@ -497,7 +727,8 @@ class FloorPlan:
         for room in self.rooms:
             if (room.x < 0 or room.y < 0 or
                 room.x + room.width > self.house_width or
-                    room.y + room.length > self.house_length):
+                    room.y + room.length > self.house_length or
+                    not self.on_valid_floor(room)):
                 out_of_bounds += 1
 
         return out_of_bounds
@@ -510,71 +741,70 @@ class FloorPlan:
             int: Número de cômodos faltantes.
         """
 
-        required_types = {
-            "Cozinha": 1,
-            "Sala de Estar": 1,
-            "Sala de Jantar": 1,
-            "Área de Serviço": 1,
-            "Banheiro": self.bathrooms,
-            "Quarto": self.bedrooms,
-            "Closet": self.closets,
-            self.special_room: 1,
-        }
-
-        if '2 andares' in self.house_type:
-            required_types["Escadas"] = 1
-
-        present_types = {}
-        for room in self.rooms:
-            present_types[room.type] = present_types.get(room.type, 0) + 1
-
-        missing = 0
-        for room_type, quantity in required_types.items():
-            if present_types.get(room_type, 0) < quantity:
-                missing += quantity - present_types.get(room_type, 0)
-
-        return missing
+        return self.profile.missing_rooms([room.type for room in self.rooms], self.required_counts)
 
     def evaluate_area_utilization(self) -> float:
         """
-        Avalia a porcentagem de área utilizada na planta.
+        Avalia a porcentagem de área utilizada na planta (no modo discreto, pela contagem de bits
+        da ocupação de cada andar).
 
         Returns:
             float: Porcentagem de área utilizada.
         """
 
+        total_area = self.house_width * self.house_length * self.max_floor
+
+        if self.bitboard is not None:
+            occupied = [0] * self.max_floor
+            for room, mask in zip(self.rooms, self.room_masks()):
+                if not self.on_valid_floor(room):
+                    continue
+                for floor in range(self.max_floor) if room.spans_floors else (room.floor,):
+                    occupied[floor] |= mask
+            cells = sum(popcount(floor_mask) for floor_mask in occupied)
+            return cells * self.bitboard.module ** 2 / total_area * 100
+
+        self.initialize_grid()
+
         area_used = 0
         for floor in range(self.max_floor):
             area_used += sum(sum(row) for row in self.grade[floor])  # Assumindo que self.grade é uma grade binária
 
-        total_area = self.house_width * self.house_length * self.max_floor
-
         return (area_used / total_area) * 100
 
-    def evaluate_area_separation(self) -> float:
+    def evaluate_area_separation(self, graph: Optional[PlanGraph] = None) -> float:
         """
-        Avalia a separação entre áreas sociais e íntimas.
+        Avalia a separação entre áreas sociais e íntimas pela distância no grafo de cômodos.
+
+        Args:
+            graph (Optional[PlanGraph]): Grafo da planta já montado (opcional).
 
         Returns:
             float: Pontuação da separação de áreas.
         """
 
-        score = 0
+        return area_separation_score(
+            graph or PlanGraph(self),
+            self.profile.parameters["separation_reward"],
+            self.profile.parameters["separation_penalty"]
+        )
 
-        social_areas = ["Sala de Estar", "Sala de Jantar", "Cozinha"]
-        private_areas = ["Quarto", "Banheiro", "Closet"]
+    def evaluate_circulation(self, graph: Optional[PlanGraph] = None) -> float:
+        """
+        Avalia a circulação a partir da entrada (alcance e profundidade dos caminhos no grafo de cômodos).
 
-        for room in self.rooms:
-            if room.type in social_areas:
-                for other_room in self.rooms:
-                    if other_room.type in private_areas:
-                        distance = self.calculate_distance(room, other_room)
-                        if distance < 3:
-                            score -= 10  # Penaliza se áreas sociais e íntimas estão próximas
-            else:
-                score += 10  # Valoriza áreas privadas isoladas
+        Args:
+            graph (Optional[PlanGraph]): Grafo da planta já montado (opcional).
 
-        return score
+        Returns:
+            float: Pontuação da circulação.
+        """
+
+        return circulation_score(
+            graph or PlanGraph(self),
+            self.profile.parameters["circulation_reward"],
+            self.profile.parameters["circulation_depth_penalty"]
+        )
 
     def calculate_distance(self, room1: Room, room2: Room) -> float:
         """
@@ -609,7 +839,7 @@ class FloorPlan:
         score = 0
         for room in self.rooms:
             if self.is_near_external_walls(room):
-                score += 20  # Valoriza cômodos próximos às paredes externas
+                score += self.profile.parameters["natural_light_reward"]  # Valoriza cômodos próximos às paredes externas
 
         return score
 
@@ -649,7 +879,7 @@ class FloorPlan:
         for room in self.rooms:
             if room.type in exterior_connected_rooms:
                 if self.is_near_external_walls(room):
-                    score += 30  # Valoriza cômodos conectados externamente
+                    score += self.profile.parameters["external_connection_reward"]  # Valoriza cômodos conectados externamente
 
         return score
 
@@ -669,7 +899,9 @@ class FloorPlan:
 
         for staircase in staircases:
             distance_to_center = self.calculate_distance_to_center(staircase, center_x, center_y)
-            score += max(0, 10 - distance_to_center) * 10  # Valoriza escadas próximas ao centro
+            # Valoriza escadas próximas ao centro
+            radius = self.profile.parameters["staircase_radius"]
+            score += max(0, radius - distance_to_center) * self.profile.parameters["staircase_reward"]
 
         return score
 
@@ -0,0 +1,108 @@
+from typing import List, Optional
+
+import numpy as np
+
+
+def dominance_matrix(objectives: np.ndarray, violations: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Calcula a matriz de dominância (com restrições) entre todos os indivíduos.
+
+    O indivíduo i domina j quando: ambos são válidos e i é melhor ou igual em todos os objetivos
+    (a maximizar) e estritamente melhor em ao menos um; ou quando i tem menos violações de
+    restrição que j.
+
+    Args:
+        objectives (np.ndarray): Matriz (n, m) com os objetivos de cada indivíduo.
+        violations (Optional[np.ndarray]): Vetor (n,) com o número de violações de cada indivíduo.
+
+    Returns:
+        np.ndarray: Matriz booleana (n, n) em que [i, j] indica que i domina j.
+    """
+
+    better_or_equal = np.all(objectives[:, None, :] >= objectives[None, :, :], axis=2)
+    strictly_better = np.any(objectives[:, None, :] > objectives[None, :, :], axis=2)
+    dominates = better_or_equal & strictly_better
+
+    if violations is None:
+        return dominates
+
+    feasible = violations == 0
+    both_feasible = feasible[:, None] & feasible[None, :]
+    return np.where(both_feasible, dominates, violations[:, None] < violations[None, :])
+
+
+def fast_non_dominated_sort(objectives: np.ndarray, violations: Optional[np.ndarray] = None) -> List[np.ndarray]:
+    """
+    Ordena a população em frentes de não-dominância (NSGA-II).
+
+    Args:
+        objectives (np.ndarray): Matriz (n, m) com os objetivos de cada indivíduo.
+        violations (Optional[np.ndarray]): Vetor (n,) com o número de violações de cada indivíduo.
+
+    Returns:
+        List[np.ndarray]: Índices dos indivíduos de cada frente, da melhor para a pior.
+    """
+
+    dominates = dominance_matrix(objectives, violations)
+    domination_count = dominates.sum(axis=0)
+    assigned = np.zeros(len(objectives), dtype=bool)
+
+    fronts = []
+    while not assigned.all():
+        front = np.flatnonzero((domination_count == 0) & ~assigned)
+        assigned[front] = True
+        domination_count = domination_count - dominates[front].sum(axis=0)
+        fronts.append(front)
+
+    return fronts
+
+
+def crowding_distance(objectives: np.ndarray) -> np.ndarray:
+    """
+    Calcula a distância de aglomeração (crowding distance) dos indivíduos de uma frente.
+
+    Args:
+        objectives (np.ndarray): Matriz (k, m) com os objetivos dos indivíduos da frente.
+
+    Returns:
+        np.ndarray: Vetor (k,) com a distância de cada indivíduo; os extremos recebem infinito.
+    """
+
+    size, num_objectives = objectives.shape
+    distances = np.zeros(size)
+    if size <= 2:
+        distances[:] = np.inf
+        return distances
+
+    order = np.argsort(objectives, axis=0)
+    sorted_objectives = np.take_along_axis(objectives, order, axis=0)
+    spread = sorted_objectives[-1] - sorted_objectives[0]
+    spread[spread == 0] = 1
+
+    gaps = (sorted_objectives[2:] - sorted_objectives[:-2]) / spread
+    for objective in range(num_objectives):
+        distances[order[1:-1, objective]] += gaps[:, objective]
+        distances[order[[0, -1], objective]] = np.inf
+
+    return distances
+
+
+def rank_population(objectives: np.ndarray, violations: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Ordena a população pelo critério do NSGA-II: frente (crescente) e, dentro da frente,
+    distância de aglomeração (decrescente).
+
+    Args:
+        objectives (np.ndarray): Matriz (n, m) com os objetivos de cada indivíduo.
+        violations (Optional[np.ndarray]): Vetor (n,) com o número de violações de cada indivíduo.
+
+    Returns:
+        np.ndarray: Índices dos indivíduos, do melhor para o pior.
+    """
+
+    ranking = []
+    for front in fast_non_dominated_sort(objectives, violations):
+        distances = crowding_distance(objectives[front])
+        ranking.append(front[np.argsort(-distances, kind="stable")])
+
+    return np.concatenate(ranking) if ranking else np.array([], dtype=int)
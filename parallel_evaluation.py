@@ -0,0 +1,324 @@
+import math
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from fitness import OBJECTIVES
+from fitness_cache import CacheKey, get_fitness_cache
+
+if TYPE_CHECKING:
+    from models import FloorPlan
+    from profiles import EvaluationProfile
+
+# Nome dos blocos de memória compartilhada e capacidade (plantas, cômodos): é tudo o que um
+# processo precisa para mapear os buffers da população
+BufferSpec = Tuple[Tuple[str, ...], int, int]
+
+# Programa da execução: área, orientação, tipo de casa, cômodo especial, quartos, banheiros e closets
+Program = Tuple[float, str, str, str, int, int, int]
+
+# Colunas do array de resultados: fitness, número de violações e um critério por coluna (NaN se inativo)
+RESULT_COLUMNS = 2 + len(OBJECTIVES)
+
+
+class SharedPopulation:
+    # Nome, se há uma linha por cômodo (ou por planta), colunas e tipo de cada array
+    ARRAYS = (
+        ("geometry", True, (5,), np.float64),  # x, y, largura, comprimento e andar
+        ("types", True, (), np.int16),  # Índice do tipo na tabela de tipos
+        ("counts", False, (), np.int16),  # Número de cômodos
+        ("dimensions", False, (2,), np.float64),  # Largura e comprimento da casa
+        ("results", False, (RESULT_COLUMNS,), np.float64),  # Escrito pelos processos de avaliação
+    )
+
+    def __init__(self, plans: int, rooms: int, names: Optional[Sequence[str]] = None):
+        """
+        Buffers da população em memória compartilhada (multiprocessing.shared_memory), vistos
+        como arrays NumPy. O processo principal escreve os genomas, os processos de avaliação
+        mapeiam os mesmos blocos e escrevem o fitness no array de resultados: nenhum FloorPlan
+        é serializado.
+
+        Args:
+            plans (int): Capacidade, em plantas.
+            rooms (int): Capacidade, em cômodos por planta.
+            names (Optional[Sequence[str]]): Nomes de blocos já criados, para mapeá-los em outro
+                processo. Quando omitido, os blocos são criados.
+        """
+
+        self.plans: int = plans
+        self.rooms: int = rooms
+        self.owner: bool = names is None
+        self.blocks: List[shared_memory.SharedMemory] = []
+        self.arrays: Dict[str, np.ndarray] = {}
+
+        for index, (name, per_room, columns, dtype) in enumerate(self.ARRAYS):
+            shape = ((plans, rooms) if per_room else (plans,)) + columns
+            size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+            if self.owner:
+                block = shared_memory.SharedMemory(create=True, size=size)
+            else:
+                block = shared_memory.SharedMemory(name=names[index])
+            self.blocks.append(block)
+            self.arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    @property
+    def spec(self) -> BufferSpec:
+        """
+        Descrição dos buffers enviada aos processos de avaliação.
+
+        Returns:
+            BufferSpec: Nomes dos blocos e capacidade.
+        """
+
+        return tuple(block.name for block in self.blocks), self.plans, self.rooms
+
+    def write(self, plans: Sequence['FloorPlan'], type_index: Dict[str, int]) -> None:
+        """
+        Escreve os genomas das plantas nas primeiras posições dos buffers.
+
+        Args:
+            plans (Sequence[FloorPlan]): As plantas (no máximo self.plans, com até self.rooms cômodos).
+            type_index (Dict[str, int]): Tabela de tipos de cômodo, completada com os tipos novos.
+        """
+
+        # Uma atribuição por planta (e não por cômodo) em cada array
+        geometry, types, counts = self.arrays["geometry"], self.arrays["types"], self.arrays["counts"]
+        for index, plan in enumerate(plans):
+            count = len(plan.rooms)
+            if count:
+                geometry[index, :count] = [(room.x, room.y, room.width, room.length, room.floor) for room in plan.rooms]
+                types[index, :count] = [type_index.setdefault(room.type, len(type_index)) for room in plan.rooms]
+            counts[index] = count
+        self.arrays["dimensions"][:len(plans)] = [(plan.house_width, plan.house_length) for plan in plans]
+
+    def close(self) -> None:
+        """
+        Libera os mapeamentos (e, no processo que criou os blocos, os próprios blocos).
+        """
+
+        self.arrays.clear()
+        for block in self.blocks:
+            block.close()
+            if self.owner:
+                block.unlink()
+        self.blocks.clear()
+
+
+# Estado de cada processo de avaliação: programa, perfil e buffers já mapeados
+_WORKER: Dict[str, object] = {}
+
+
+def _initialize_worker(program: Program, profile: 'EvaluationProfile') -> None:
+    """
+    Inicializa um processo de avaliação. O programa e o perfil são enviados uma única vez.
+
+    Args:
+        program (Program): Programa da execução.
+        profile (EvaluationProfile): Perfil de avaliação.
+    """
+
+    _WORKER.update(program=program, profile=profile, buffers=None)
+
+
+def _worker_buffers(spec: BufferSpec) -> SharedPopulation:
+    """
+    Mapeia os buffers da população no processo de avaliação, reaproveitando o mapeamento
+    enquanto os buffers não forem realocados.
+
+    Args:
+        spec (BufferSpec): Descrição dos buffers.
+
+    Returns:
+        SharedPopulation: Os buffers mapeados.
+    """
+
+    buffers: Optional[SharedPopulation] = _WORKER.get("buffers")
+    if buffers is None or buffers.spec != spec:
+        if buffers is not None:
+            buffers.close()
+        names, plans, rooms = spec
+        buffers = SharedPopulation(plans, rooms, names)
+        _WORKER["buffers"] = buffers
+
+    return buffers
+
+
+def _evaluate_range(spec: BufferSpec, type_names: Tuple[str, ...], start: int, stop: int) -> int:
+    """
+    Avalia as plantas start..stop-1 dos buffers compartilhados e escreve os resultados no lugar.
+
+    Args:
+        spec (BufferSpec): Descrição dos buffers.
+        type_names (Tuple[str, ...]): Tabela de tipos de cômodo.
+        start (int): Primeira planta.
+        stop (int): Posição seguinte à última planta.
+
+    Returns:
+        int: Número de plantas avaliadas.
+    """
+
+    from models import FloorPlan, Room
+
+    area, orientation, house_type, special_room, bedrooms, bathrooms, closets = _WORKER["program"]
+    buffers = _worker_buffers(spec)
+    geometry, types, counts = buffers.arrays["geometry"], buffers.arrays["types"], buffers.arrays["counts"]
+    dimensions, results = buffers.arrays["dimensions"], buffers.arrays["results"]
+
+    for index in range(start, stop):
+        count = counts[index]
+        # Os genomas escritos já estão encaixados na grade: os cômodos entram depois da criação da
+        # planta (sem novo encaixe) e só com a geometria (ver Room.bare)
+        plan = FloorPlan(
+            area, orientation, house_type, special_room, bedrooms, bathrooms, closets, rooms=[],
+            dimensions=tuple(dimensions[index].tolist()), profile=_WORKER["profile"], evaluate=False,
+        )
+        plan.rooms = [
+            Room.bare(type_names[type_id], int(floor), x, y, width, length)
+            for type_id, (x, y, width, length, floor) in zip(types[index, :count].tolist(), geometry[index, :count].tolist())
+        ]
+
+        results[index, 0] = plan.evaluate()
+        results[index, 1] = plan.constraint_violation
+        results[index, 2:] = [plan.fitness_components.get(objective, math.nan) for objective in OBJECTIVES]
+
+    return stop - start
+
+
+def _release(executor: ProcessPoolExecutor, population: List[SharedPopulation]) -> None:
+    """
+    Encerra os processos de avaliação e libera os buffers (usada também pelo finalizador).
+
+    Args:
+        executor (ProcessPoolExecutor): O pool de processos.
+        population (List[SharedPopulation]): Lista com os buffers atuais (vazia se não houver).
+    """
+
+    executor.shutdown(wait=True, cancel_futures=True)
+    for buffers in population:
+        buffers.close()
+    population.clear()
+
+
+class ParallelEvaluator:
+    def __init__(self, workers: int, program: Program, profile: 'EvaluationProfile', chunks_per_worker: int = 2):
+        """
+        Avaliação de fitness de uma geração inteira em processos paralelos. As plantas são escritas
+        em buffers compartilhados (SharedPopulation) e cada processo recebe apenas um intervalo de
+        índices; os resultados voltam pelo array compartilhado e alimentam o cache de fitness.
+
+        Args:
+            workers (int): Número de processos de avaliação.
+            program (Program): Programa da execução (igual para todas as plantas avaliadas).
+            profile (EvaluationProfile): Perfil de avaliação.
+            chunks_per_worker (int): Intervalos enviados a cada processo por lote, para equilibrar a carga.
+        """
+
+        self.workers: int = workers
+        self.chunks_per_worker: int = chunks_per_worker
+        self.type_index: Dict[str, int] = {}
+        self._population: List[SharedPopulation] = []
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_initialize_worker, initargs=(program, profile)
+        )
+        # Garante a liberação dos blocos compartilhados mesmo se close() não for chamado
+        self._finalizer = weakref.finalize(self, _release, self._executor, self._population)
+
+    def _buffers(self, plans: int, rooms: int) -> SharedPopulation:
+        """
+        Retorna buffers com capacidade suficiente, realocando-os (com folga) se necessário.
+
+        Args:
+            plans (int): Plantas necessárias.
+            rooms (int): Cômodos por planta necessários.
+
+        Returns:
+            SharedPopulation: Os buffers.
+        """
+
+        if self._population:
+            buffers = self._population[0]
+            if buffers.plans >= plans and buffers.rooms >= rooms:
+                return buffers
+            plans, rooms = max(plans, buffers.plans), max(rooms, buffers.rooms)
+            buffers.close()
+            self._population.clear()
+
+        buffers = SharedPopulation(plans, rooms + rooms // 2 + 1)
+        self._population.append(buffers)
+        return buffers
+
+    def evaluate(self, plans: Sequence['FloorPlan']) -> None:
+        """
+        Avalia as plantas no lugar (fitness, violações e critérios), como FloorPlan.calculate_fitness:
+        avaliações em cache são reaproveitadas e apenas as demais são enviadas aos processos.
+
+        Args:
+            plans (Sequence[FloorPlan]): As plantas a serem avaliadas.
+        """
+
+        cache = get_fitness_cache()
+        pending: List['FloorPlan'] = []
+        keys: List[Optional[CacheKey]] = []
+        for plan in plans:
+            key = cache.key(plan) if cache is not None else None
+            cached = cache.get(key) if cache is not None else None
+            if cached is not None:
+                plan.fitness, plan.constraint_violation, components = cached
+                plan.fitness_components = dict(components)
+            else:
+                pending.append(plan)
+                keys.append(key)
+
+        if not pending:
+            return
+
+        buffers = self._buffers(len(pending), max(len(plan.rooms) for plan in pending))
+        buffers.write(pending, self.type_index)
+        type_names = tuple(self.type_index)
+
+        # Intervalos contíguos de índices: nenhuma planta é serializada
+        size = max(1, math.ceil(len(pending) / (self.workers * self.chunks_per_worker)))
+        futures = [
+            self._executor.submit(_evaluate_range, buffers.spec, type_names, start, min(start + size, len(pending)))
+            for start in range(0, len(pending), size)
+        ]
+        for future in futures:
+            future.result()
+
+        results = buffers.arrays["results"]
+        for index, (plan, key) in enumerate(zip(pending, keys)):
+            row = results[index].tolist()
+            plan.fitness, plan.constraint_violation = row[0], int(row[1])
+            plan.fitness_components = {
+                objective: value for objective, value in zip(OBJECTIVES, row[2:]) if not math.isnan(value)
+            }
+            if cache is not None:
+                cache.put(key, (plan.fitness, plan.constraint_violation, dict(plan.fitness_components)))
+
+    def close(self) -> None:
+        """
+        Encerra os processos de avaliação e libera a memória compartilhada.
+        """
+
+        self._finalizer()
+
+
+def evaluate_population(plans: Sequence['FloorPlan'], evaluator: Optional[ParallelEvaluator] = None) -> None:
+    """
+    Avalia um lote de plantas criadas com avaliação adiada (FloorPlan(..., evaluate=False)),
+    em paralelo se houver um avaliador ou, caso contrário, no próprio processo.
+
+    Args:
+        plans (Sequence[FloorPlan]): As plantas.
+        evaluator (Optional[ParallelEvaluator]): Avaliador paralelo (opcional).
+    """
+
+    if evaluator is not None:
+        evaluator.evaluate(plans)
+        return
+
+    for plan in plans:
+        plan.fitness = plan.calculate_fitness()
@@ -0,0 +1,303 @@
+import json
+import math
+import os
+from typing import IO, TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from fitness import OBJECTIVES
+
+if TYPE_CHECKING:
+    from models import FloorPlan
+
+# Origem de cada avaliação, guardada como índice nesta tabela
+ORIGINS = ("initial", "repaired", "offspring", "mutant", "immigrant", "polished")
+
+# Colunas fixas do histórico e seus tipos; cada critério de fitness.OBJECTIVES vira mais uma coluna float64
+BASE_COLUMNS = (
+    ("generation", "<i4"),  # -1 para a população inicial
+    ("origin", "<i1"),
+    ("fitness", "<f8"),
+    ("violations", "<i4"),
+    ("rooms", "<i2"),
+    ("house_width", "<f4"),
+    ("house_length", "<f4"),
+)
+
+METADATA_FILE = "archive.json"
+
+
+def archive_columns() -> List[Tuple[str, str]]:
+    """
+    Lista as colunas do histórico: as fixas e uma por critério (NaN quando inativo no perfil).
+
+    Returns:
+        List[Tuple[str, str]]: Nome e tipo (NumPy, little-endian) de cada coluna.
+    """
+
+    return list(BASE_COLUMNS) + [(objective, "<f8") for objective in OBJECTIVES]
+
+
+class PlanArchive:
+    def __init__(self, path: str, buffer_rows: int = 4096):
+        """
+        Histórico colunar, somente de acréscimo, de todas as plantas avaliadas por uma execução.
+
+        Cada coluna é um arquivo binário próprio (`<coluna>.bin`) no diretório `path`, e os
+        tipos ficam em `archive.json`. As linhas são acumuladas em buffers NumPy de tamanho
+        fixo e acrescentadas aos arquivos quando o buffer enche, de modo que a memória usada
+        não depende do número de plantas. Abrir um histórico existente continua a partir do
+        fim dele; se open() não for chamado (diretamente ou com `with`), o primeiro record() abre
+        o histórico. A leitura é feita por ArchiveReader, com arrays mapeados em memória.
+
+        Args:
+            path (str): Diretório do histórico (criado se não existir).
+            buffer_rows (int): Número de linhas acumuladas antes de cada escrita em disco.
+        """
+
+        if buffer_rows <= 0:
+            raise ValueError("buffer_rows deve ser positivo")
+
+        self.path: str = path
+        self.buffer_rows: int = buffer_rows
+        self.columns: List[Tuple[str, str]] = archive_columns()
+        self.rows: int = 0  # Linhas já escritas (em disco ou no buffer)
+        self._buffers: Dict[str, np.ndarray] = {
+            name: np.empty(buffer_rows, dtype=dtype) for name, dtype in self.columns
+        }
+        self._pending: int = 0
+        self._files: Dict[str, IO[bytes]] = {}
+
+    def __enter__(self) -> 'PlanArchive':
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """
+        Cria (ou reabre para acréscimo) o diretório do histórico.
+        """
+
+        os.makedirs(self.path, exist_ok=True)
+        metadata_path = os.path.join(self.path, METADATA_FILE)
+        if os.path.exists(metadata_path):
+            with open(metadata_path, encoding="utf-8") as file:
+                columns = [tuple(column) for column in json.load(file)["columns"]]
+            if columns != self.columns:
+                raise ValueError(f"O histórico em {self.path} tem colunas diferentes das atuais")
+        else:
+            with open(metadata_path, "w", encoding="utf-8") as file:
+                json.dump({"version": 1, "columns": self.columns, "origins": ORIGINS}, file, ensure_ascii=False)
+
+        # Descarta as linhas incompletas de uma escrita interrompida, para manter as colunas alinhadas
+        self.rows = archive_rows(self.path, self.columns)
+        for name, dtype in self.columns:
+            file = open(os.path.join(self.path, f"{name}.bin"), "ab")
+            file.truncate(self.rows * np.dtype(dtype).itemsize)
+            self._files[name] = file
+
+    def record(self, plans: Iterable['FloorPlan'], generation: int, origin: str) -> None:
+        """
+        Acrescenta um lote de plantas avaliadas ao histórico, abrindo-o se ainda não estiver aberto.
+
+        Args:
+            plans (Iterable[FloorPlan]): Plantas já avaliadas.
+            generation (int): Geração em que foram avaliadas (-1 para a população inicial).
+            origin (str): Origem da avaliação (um dos valores de ORIGINS).
+        """
+
+        origin_index = ORIGINS.index(origin)
+        if not self._files:
+            self.open()
+
+        buffers = self._buffers
+        for plan in plans:
+            row = self._pending
+            buffers["generation"][row] = generation
+            buffers["origin"][row] = origin_index
+            buffers["fitness"][row] = plan.fitness
+            buffers["violations"][row] = plan.constraint_violation
+            buffers["rooms"][row] = len(plan.rooms)
+            buffers["house_width"][row] = plan.house_width
+            buffers["house_length"][row] = plan.house_length
+            for objective in OBJECTIVES:
+                buffers[objective][row] = plan.fitness_components.get(objective, math.nan)
+
+            self._pending += 1
+            self.rows += 1
+            if self._pending == self.buffer_rows:
+                self.flush()
+
+    def flush(self) -> None:
+        """
+        Acrescenta as linhas acumuladas aos arquivos das colunas.
+        """
+
+        if self._pending == 0:
+            return
+
+        for name, _ in self.columns:
+            self._files[name].write(self._buffers[name][:self._pending].tobytes())
+            self._files[name].flush()
+        self._pending = 0
+
+    def close(self) -> None:
+        """
+        Escreve as linhas pendentes e fecha os arquivos.
+        """
+
+        self.flush()
+        for file in self._files.values():
+            file.close()
+        self._files = {}
+
+
+def archive_rows(path: str, columns: List[Tuple[str, str]]) -> int:
+    """
+    Conta as linhas completas de um histórico. Após uma interrupção no meio de uma escrita,
+    as colunas podem ter tamanhos diferentes; vale a menor, e o restante é ignorado.
+
+    Args:
+        path (str): Diretório do histórico.
+        columns (List[Tuple[str, str]]): Nome e tipo de cada coluna.
+
+    Returns:
+        int: Número de linhas.
+    """
+
+    counts = []
+    for name, dtype in columns:
+        file_path = os.path.join(path, f"{name}.bin")
+        size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+        counts.append(size // np.dtype(dtype).itemsize)
+
+    return min(counts) if counts else 0
+
+
+class ArchiveReader:
+    def __init__(self, path: str):
+        """
+        Leitura de um histórico escrito por PlanArchive. Cada coluna é um numpy.memmap somente
+        de leitura: as consultas usam operações NumPy e apenas as páginas tocadas são lidas do disco.
+
+        Args:
+            path (str): Diretório do histórico.
+        """
+
+        with open(os.path.join(path, METADATA_FILE), encoding="utf-8") as file:
+            metadata = json.load(file)
+
+        self.path: str = path
+        self.columns: List[Tuple[str, str]] = [tuple(column) for column in metadata["columns"]]
+        self.origins: Tuple[str, ...] = tuple(metadata["origins"])
+        self.rows: int = archive_rows(path, self.columns)
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """
+        Retorna uma coluna inteira, mapeada em memória.
+
+        Args:
+            name (str): Nome da coluna.
+
+        Returns:
+            np.ndarray: A coluna (somente leitura).
+        """
+
+        if name not in self._arrays:
+            dtypes = dict(self.columns)
+            if name not in dtypes:
+                raise KeyError(f"Coluna desconhecida: {name}")
+            if self.rows == 0:
+                self._arrays[name] = np.empty(0, dtype=dtypes[name])
+            else:
+                self._arrays[name] = np.memmap(
+                    os.path.join(self.path, f"{name}.bin"), dtype=dtypes[name], mode="r", shape=(self.rows,)
+                )
+
+        return self._arrays[name]
+
+    def valid(self) -> np.ndarray:
+        """
+        Máscara das plantas sem violações.
+
+        Returns:
+            np.ndarray: Array booleano com uma posição por linha.
+        """
+
+        return self["violations"] == 0
+
+    def origin(self, origin: str) -> np.ndarray:
+        """
+        Máscara das avaliações de uma origem.
+
+        Args:
+            origin (str): Um dos valores de ORIGINS.
+
+        Returns:
+            np.ndarray: Array booleano com uma posição por linha.
+        """
+
+        return self["origin"] == self.origins.index(origin)
+
+    def best(self, count: int = 10, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Índices das linhas de maior fitness, sem ordenar o histórico inteiro.
+
+        Args:
+            count (int): Número de linhas.
+            mask (Optional[np.ndarray]): Máscara opcional (ex.: valid()) das linhas consideradas.
+
+        Returns:
+            np.ndarray: Índices, do maior para o menor fitness.
+        """
+
+        indices = np.arange(self.rows) if mask is None else np.flatnonzero(mask)
+        fitness = np.asarray(self["fitness"][indices])
+        count = min(count, len(indices))
+        if count == 0:
+            return indices[:0]
+
+        top = np.argpartition(-fitness, count - 1)[:count]
+        return indices[top[np.argsort(-fitness[top])]]
+
+    def by_generation(self, name: str = "fitness", mask: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Resume uma coluna por geração (execuções acrescentadas ao mesmo histórico são somadas).
+
+        Args:
+            name (str): Nome da coluna.
+            mask (Optional[np.ndarray]): Máscara opcional das linhas consideradas.
+
+        Returns:
+            Dict[str, np.ndarray]: Arrays "generation", "count", "mean", "min" e "max", com uma
+                posição por geração presente.
+        """
+
+        generations = np.asarray(self["generation"])
+        values = np.asarray(self[name], dtype=np.float64)
+        if mask is not None:
+            generations, values = generations[mask], values[mask]
+        if len(values) == 0:
+            empty = np.empty(0)
+            return {"generation": empty.astype(np.int32), "count": empty.astype(np.int64), "mean": empty, "min": empty, "max": empty}
+
+        unique, inverse = np.unique(generations, return_inverse=True)
+        counts = np.bincount(inverse)
+        minimum = np.full(len(unique), np.inf)
+        maximum = np.full(len(unique), -np.inf)
+        np.minimum.at(minimum, inverse, values)
+        np.maximum.at(maximum, inverse, values)
+
+        return {
+            "generation": unique,
+            "count": counts,
+            "mean": np.bincount(inverse, weights=values) / counts,
+            "min": minimum,
+            "max": maximum,
+        }
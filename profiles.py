@@ -0,0 +1,291 @@
+import hashlib
+import json
+import re
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from constants import CONSTRAINT_PENALTIES, FITNESS_PARAMETERS, OBJECTIVE_WEIGHTS, ROOMS
+from fitness import OBJECTIVES
+
+# Número de andares e de unidades (apartamentos) no texto do tipo da casa, ex.: "6 andares e 20 unidades"
+FLOORS_PATTERN = re.compile(r"(\d+)\s*andar(?:es)?\b")
+UNITS_PATTERN = re.compile(r"(\d+)\s*unidades?\b")
+
+# Cômodos de cada unidade, além dos quartos, banheiros e closets
+UNIT_ROOMS = ("Cozinha", "Sala de Estar", "Sala de Jantar", "Área de Serviço")
+
+
+def house_floors(house_type: str) -> int:
+    """
+    Lê o número de andares do tipo da casa ("2 andares e uma laje", "6 andares"); sem número, a casa é térrea.
+
+    Args:
+        house_type (str): Tipo da casa.
+
+    Returns:
+        int: Número de andares (pelo menos 1).
+    """
+
+    match = FLOORS_PATTERN.search(house_type)
+    return max(int(match.group(1)), 1) if match else 1
+
+
+def house_units(house_type: str) -> int:
+    """
+    Lê o número de unidades (apartamentos) do tipo da casa; sem número, a casa é uma única unidade.
+
+    Args:
+        house_type (str): Tipo da casa.
+
+    Returns:
+        int: Número de unidades (pelo menos 1).
+    """
+
+    match = UNITS_PATTERN.search(house_type)
+    return max(int(match.group(1)), 1) if match else 1
+
+
+def house_type_label(floors: int, units: int = 1) -> str:
+    """
+    Monta o tipo da casa a partir do número de andares e de unidades (o inverso de house_floors e house_units).
+
+    Args:
+        floors (int): Número de andares.
+        units (int): Número de unidades.
+
+    Returns:
+        str: Tipo da casa, ex.: "6 andares e 20 unidades".
+    """
+
+    label = f"{floors} andar" if floors == 1 else f"{floors} andares"
+    return label if units == 1 else f"{label} e {units} unidades"
+
+
+def program_rooms(house_type: str, special_room: str, bedrooms: int, bathrooms: int, closets: int) -> Dict[str, int]:
+    """
+    Quantidade de cada tipo de cômodo do programa. Cada unidade tem cozinha, salas, área de
+    serviço, quartos, banheiros e closets; o cômodo especial é único (de uso comum em edifícios) e
+    as casas de mais de um andar têm uma escada, cuja projeção ocupa todos os andares.
+
+    Args:
+        house_type (str): Tipo da casa (define andares e unidades, ver house_floors e house_units).
+        special_room (str): Cômodo especial.
+        bedrooms (int): Número de quartos por unidade.
+        bathrooms (int): Número de banheiros por unidade.
+        closets (int): Número de closets por unidade.
+
+    Returns:
+        Dict[str, int]: Quantidade de cada tipo, na ordem de geração (área comum antes dos quartos).
+    """
+
+    units = house_units(house_type)
+    rooms = {room_type: units for room_type in UNIT_ROOMS}
+    rooms.update({"Banheiro": bathrooms * units, "Quarto": bedrooms * units, "Closet": closets * units})
+    rooms[special_room] = rooms.get(special_room, 0) + 1
+
+    if house_floors(house_type) > 1:
+        rooms["Escadas"] = 1
+
+    return rooms
+
+
+class EvaluationProfile:
+    def __init__(
+        self,
+        name: str,
+        objective_weights: Dict[str, float],
+        parameters: Dict[str, float],
+        penalties: Dict[str, float],
+        room_ranges: Dict[str, Tuple[float, float]],
+        module: Optional[float] = None
+    ):
+        """
+        Perfil de avaliação compilado: pesos, parâmetros e faixas de área dos cômodos convertidos,
+        no carregamento, em estruturas prontas para a avaliação (ids de tipo, vetores de
+        quantidades obrigatórias), de modo que trocar de perfil não tem custo por avaliação.
+
+        Args:
+            name (str): Nome do perfil.
+            objective_weights (Dict[str, float]): Peso de cada critério de fitness.OBJECTIVES.
+            parameters (Dict[str, float]): Parâmetros internos dos critérios.
+            penalties (Dict[str, float]): Penalidade por violação de cada restrição.
+            room_ranges (Dict[str, Tuple[float, float]]): Área mínima e máxima de cada tipo de cômodo.
+            module (Optional[float]): Lado da célula (em metros) do modo discreto. Quando informado,
+                os cômodos são encaixados nessa grade e a avaliação usa bitsets (ver bitboard.Bitboard).
+        """
+
+        unknown = set(objective_weights) - set(OBJECTIVES)
+        if unknown:
+            raise ValueError(f"Critérios desconhecidos no perfil {name}: {sorted(unknown)}")
+
+        self.name: str = name
+        self.objective_weights: Dict[str, float] = {
+            objective: float(objective_weights.get(objective, 0.0)) for objective in OBJECTIVES
+        }
+        # Critérios ativos (peso diferente de zero), na ordem de fitness.OBJECTIVES
+        self.objectives: Tuple[str, ...] = tuple(
+            objective for objective in OBJECTIVES if self.objective_weights[objective] != 0
+        )
+        self.parameters: Dict[str, float] = dict(parameters)
+        self.overlap_penalty: float = penalties["overlap"]
+        self.out_of_bounds_penalty: float = penalties["out_of_bounds"]
+        self.missing_room_penalty: float = penalties["missing_room"]
+
+        if module is not None and module <= 0:
+            raise ValueError(f"Módulo inválido no perfil {name}: {module}")
+        self.module: Optional[float] = float(module) if module is not None else None
+
+        self.room_ranges: Dict[str, Tuple[float, float]] = {
+            room_type: (float(minimum), float(maximum)) for room_type, (minimum, maximum) in room_ranges.items()
+        }
+
+        # Tabela de ids de tipo; o último id agrupa tipos desconhecidos
+        self.type_ids: Dict[str, int] = {room_type: index for index, room_type in enumerate(self.room_ranges)}
+        self.unknown_type_id: int = len(self.type_ids)
+        self._required_counts: Dict[Tuple[Any, ...], np.ndarray] = {}
+
+        # Impressão digital do conteúdo do perfil (usada, por exemplo, como parte da chave do cache de fitness).
+        # É um SHA-256 da representação do conteúdo, e não hash(), que muda a cada processo.
+        self.fingerprint: str = hashlib.sha256(repr((
+            tuple(self.objective_weights.items()),
+            tuple(sorted(self.parameters.items())),
+            (self.overlap_penalty, self.out_of_bounds_penalty, self.missing_room_penalty),
+            tuple(sorted(self.room_ranges.items())),
+            self.module,
+        )).encode()).hexdigest()
+
+    def type_id(self, room_type: str) -> int:
+        """
+        Retorna o id numérico de um tipo de cômodo.
+
+        Args:
+            room_type (str): Tipo do cômodo.
+
+        Returns:
+            int: Id do tipo (unknown_type_id para tipos fora do perfil).
+        """
+
+        return self.type_ids.get(room_type, self.unknown_type_id)
+
+    def required_counts(
+        self, house_type: str, special_room: str, bedrooms: int, bathrooms: int, closets: int
+    ) -> np.ndarray:
+        """
+        Monta (uma única vez por programa) o vetor de quantidades obrigatórias (ver program_rooms),
+        indexado pelo id de tipo.
+
+        Args:
+            house_type (str): Tipo da casa.
+            special_room (str): Cômodo especial.
+            bedrooms (int): Número de quartos por unidade.
+            bathrooms (int): Número de banheiros por unidade.
+            closets (int): Número de closets por unidade.
+
+        Returns:
+            np.ndarray: Quantidade obrigatória de cada tipo de cômodo.
+        """
+
+        key = (house_type, special_room, bedrooms, bathrooms, closets)
+        if key in self._required_counts:
+            return self._required_counts[key]
+
+        counts = np.zeros(self.unknown_type_id + 1, dtype=np.int64)
+        for room_type, quantity in program_rooms(*key).items():
+            if room_type not in self.type_ids:
+                raise ValueError(f"O perfil {self.name} não define a faixa de área de {room_type}")
+            counts[self.type_ids[room_type]] += quantity
+
+        self._required_counts[key] = counts
+        return counts
+
+    def missing_rooms(self, room_types: Sequence[str], required_counts: np.ndarray) -> int:
+        """
+        Conta os cômodos obrigatórios faltantes com uma única comparação vetorizada.
+
+        Args:
+            room_types (Sequence[str]): Tipos dos cômodos presentes na planta.
+            required_counts (np.ndarray): Vetor retornado por required_counts.
+
+        Returns:
+            int: Número de cômodos faltantes.
+        """
+
+        ids = np.fromiter((self.type_id(room_type) for room_type in room_types), dtype=np.intp, count=len(room_types))
+        present = np.bincount(ids, minlength=len(required_counts))
+
+        return int(np.maximum(required_counts - present, 0).sum())
+
+
+def compile_profile(data: Dict[str, Any], name: str = "padrão") -> EvaluationProfile:
+    """
+    Compila a descrição de um perfil. Chaves ausentes usam os valores padrão de constants.py;
+    as faixas de área informadas substituem apenas os tipos listados.
+
+    Formato:
+        {
+            "name": "compacto",
+            "objectives": {"area_utilization": 2.0, "natural_light": 1.0, ...},
+            "parameters": {"natural_light_reward": 20, ...},
+            "penalties": {"overlap": 1000, "out_of_bounds": 1000, "missing_room": 1000},
+            "rooms": {"Quarto": [10, 20], ...},
+            "module": 0.5
+        }
+
+    Args:
+        data (Dict[str, Any]): Descrição do perfil.
+        name (str): Nome usado quando a descrição não define "name".
+
+    Returns:
+        EvaluationProfile: Perfil compilado.
+    """
+
+    room_ranges = dict(ROOMS)
+    room_ranges.update({room_type: tuple(limits) for room_type, limits in data.get("rooms", {}).items()})
+
+    return EvaluationProfile(
+        name=data.get("name", name),
+        objective_weights=data.get("objectives", OBJECTIVE_WEIGHTS),
+        parameters={**FITNESS_PARAMETERS, **data.get("parameters", {})},
+        penalties={**CONSTRAINT_PENALTIES, **data.get("penalties", {})},
+        room_ranges=room_ranges,
+        module=data.get("module"),
+    )
+
+
+def load_profile(path: Optional[str] = None, overrides: Optional[Dict[str, Any]] = None) -> EvaluationProfile:
+    """
+    Carrega e compila um arquivo de perfil (JSON).
+
+    Args:
+        path (Optional[str]): Caminho do arquivo. Quando omitido, parte do perfil padrão.
+        overrides (Optional[Dict[str, Any]]): Chaves que substituem as do arquivo (ex.: {"module": 0.5}).
+
+    Returns:
+        EvaluationProfile: Perfil compilado.
+    """
+
+    data: Dict[str, Any] = {}
+    if path is not None:
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+
+    return compile_profile({**data, **(overrides or {})}, name=path or "padrão")
+
+
+_DEFAULT_PROFILE: Optional[EvaluationProfile] = None
+
+
+def default_profile() -> EvaluationProfile:
+    """
+    Retorna o perfil padrão (valores de constants.py), compilado uma única vez.
+
+    Returns:
+        EvaluationProfile: Perfil padrão.
+    """
+
+    global _DEFAULT_PROFILE
+    if _DEFAULT_PROFILE is None:
+        _DEFAULT_PROFILE = compile_profile({})
+
+    return _DEFAULT_PROFILE
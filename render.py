@@ -0,0 +1,287 @@
+import random
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from constants import ROOMS
+
+if TYPE_CHECKING:
+    from models import FloorPlan
+
+# Camadas do desenho, na ordem em que são sobrepostas
+LAYERS = ("rooms", "doors", "windows", "furniture")
+
+# Um retângulo por linha: planta, andar, canto, dimensões e índice do rótulo (-1 sem rótulo)
+ITEM_DTYPE = np.dtype([
+    ("plan", "<i4"), ("floor", "<i2"), ("x", "<f8"), ("y", "<f8"),
+    ("width", "<f8"), ("length", "<f8"), ("label", "<i4"),
+])
+
+# Paleta qualitativa Set3 (ColorBrewer) usada para os tipos de cômodo, e o cinza dos demais rótulos
+SET3 = (
+    (141, 211, 199), (255, 255, 179), (190, 186, 218), (251, 128, 114), (128, 177, 211), (253, 180, 98),
+    (179, 222, 105), (252, 205, 229), (217, 217, 217), (188, 128, 189), (204, 235, 197), (255, 237, 111),
+)
+GRAY = (128, 128, 128)
+
+# Espessura e comprimento das janelas desenhadas, em metros
+WINDOW_DEPTH = 0.1
+WINDOW_SIZE = 1.0
+
+
+class RenderGeometry:
+    def __init__(self, plans: Sequence['FloorPlan'], rng: Optional[np.random.Generator] = None):
+        """
+        Geometria de desenho de um lote de plantas, extraída em uma única passagem: cada camada
+        (LAYERS) é um array estruturado (ITEM_DTYPE) com todos os retângulos de todas as plantas e
+        andares, e os rótulos (tipos de cômodo e de mobília) são índices em uma tabela comum.
+        Qualquer saída (matplotlib, raster) consome os mesmos arrays.
+
+        As janelas não têm posição no modelo: cada uma é sorteada em uma parede do cômodo, como
+        no desenho original, com um gerador derivado do módulo random (respeitando --semente).
+
+        Args:
+            plans (Sequence[FloorPlan]): As plantas.
+            rng (Optional[np.random.Generator]): Gerador usado para posicionar as janelas.
+        """
+
+        rng = rng if rng is not None else np.random.default_rng(random.getrandbits(64))
+        self.envelopes: np.ndarray = np.array(
+            [(plan.house_width, plan.house_length, plan.max_floor) for plan in plans], dtype=float
+        ).reshape(-1, 3)  # Largura, comprimento e número de andares de cada planta
+        self.orientations: List[str] = [plan.orientation for plan in plans]
+
+        label_index = {label: index for index, label in enumerate(ROOMS)}
+        rooms, doors, furniture, windows = [], [], [], []
+        furniture_rooms = []  # Cômodo (linha de rooms) de cada mobília, cuja posição é relativa ao cômodo
+        for plan_index, plan in enumerate(plans):
+            for room in plan.rooms:
+                row = len(rooms)
+                label = label_index.setdefault(room.type, len(label_index))
+                rooms.append((plan_index, room.floor, room.x, room.y, room.width, room.length, label))
+                doors.extend((plan_index, room.floor, *door, -1) for door in room.door_positions)
+                windows.append(room.windows)
+                for item in room.furnitures:
+                    label = label_index.setdefault(item["type"], len(label_index))
+                    furniture.append((plan_index, room.floor, *item["position"], item["width"], item["length"], label))
+                    furniture_rooms.append(row)
+        self.labels: List[str] = list(label_index)
+
+        self.layers: Dict[str, np.ndarray] = {
+            "rooms": np.array(rooms, dtype=ITEM_DTYPE),
+            "doors": np.array(doors, dtype=ITEM_DTYPE),
+            "furniture": np.array(furniture, dtype=ITEM_DTYPE),
+        }
+
+        room_items = self.layers["rooms"]
+        placed = self.layers["furniture"]
+        parents = room_items[np.array(furniture_rooms, dtype=int)]
+        placed["x"] += parents["x"]
+        placed["y"] += parents["y"]
+
+        self.layers["windows"] = _place_windows(room_items, np.array(windows, dtype=int), rng)
+
+    @property
+    def plan_count(self) -> int:
+        """
+        Número de plantas.
+
+        Returns:
+            int: Número de plantas no lote.
+        """
+
+        return len(self.envelopes)
+
+    def groups(self, layer: str) -> Dict[Tuple[int, int], np.ndarray]:
+        """
+        Separa uma camada por planta e andar (uma ordenação, sem percorrer os itens em Python).
+
+        Args:
+            layer (str): Nome da camada (um dos valores de LAYERS).
+
+        Returns:
+            Dict[Tuple[int, int], np.ndarray]: Itens de cada (planta, andar) presente na camada.
+        """
+
+        items = self.layers[layer]
+        if len(items) == 0:
+            return {}
+
+        items = items[np.lexsort((items["floor"], items["plan"]))]
+        keys = np.stack([items["plan"], items["floor"]], axis=1)
+        starts = np.flatnonzero(np.r_[True, np.any(keys[1:] != keys[:-1], axis=1)])
+        bounds = np.r_[starts, len(items)]
+
+        return {
+            (int(keys[start, 0]), int(keys[start, 1])): items[start:stop]
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        }
+
+
+def _place_windows(rooms: np.ndarray, counts: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    Posiciona as janelas de todos os cômodos de uma vez: cada janela fica em uma parede sorteada
+    (esquerda, direita, inferior ou superior), em uma posição sorteada ao longo dela.
+
+    Args:
+        rooms (np.ndarray): Cômodos (ITEM_DTYPE).
+        counts (np.ndarray): Número de janelas de cada cômodo.
+        rng (np.random.Generator): Gerador aleatório.
+
+    Returns:
+        np.ndarray: Janelas (ITEM_DTYPE).
+    """
+
+    owners = rooms[np.repeat(np.arange(len(rooms)), np.maximum(counts, 0))]
+    windows = np.zeros(len(owners), dtype=ITEM_DTYPE)
+    windows["plan"], windows["floor"], windows["label"] = owners["plan"], owners["floor"], -1
+
+    wall = rng.integers(0, 4, len(owners))
+    offset = rng.random(len(owners))
+    vertical = wall < 2  # Paredes esquerda e direita
+
+    along_x = owners["x"] + offset * (owners["width"] - WINDOW_SIZE)
+    along_y = owners["y"] + offset * (owners["length"] - WINDOW_SIZE)
+    windows["x"] = np.select(
+        [wall == 0, wall == 1], [owners["x"], owners["x"] + owners["width"] - WINDOW_DEPTH], along_x
+    )
+    windows["y"] = np.select(
+        [vertical, wall == 2], [along_y, owners["y"]], owners["y"] + owners["length"] - WINDOW_DEPTH
+    )
+    windows["width"] = np.where(vertical, WINDOW_DEPTH, WINDOW_SIZE)
+    windows["length"] = np.where(vertical, WINDOW_SIZE, WINDOW_DEPTH)
+
+    return windows
+
+
+def rectangle_vertices(items: np.ndarray) -> np.ndarray:
+    """
+    Vértices dos retângulos de uma camada, no formato das coleções de polígonos do matplotlib.
+
+    Args:
+        items (np.ndarray): Itens (ITEM_DTYPE).
+
+    Returns:
+        np.ndarray: Array (itens, 4, 2).
+    """
+
+    x0, y0 = items["x"], items["y"]
+    x1, y1 = x0 + items["width"], y0 + items["length"]
+    return np.stack([np.stack([x0, y0], -1), np.stack([x1, y0], -1), np.stack([x1, y1], -1), np.stack([x0, y1], -1)], 1)
+
+
+def room_colors(geometry: RenderGeometry) -> np.ndarray:
+    """
+    Cores RGBA de cada rótulo: a paleta Set3 amostrada uniformemente para os tipos de cômodo
+    conhecidos (as mesmas cores de plt.cm.Set3, sem importar o matplotlib) e cinza para os demais.
+
+    Args:
+        geometry (RenderGeometry): A geometria (define a tabela de rótulos).
+
+    Returns:
+        np.ndarray: Array (rótulos, 4), com valores entre 0 e 1.
+    """
+
+    palette = np.array(SET3, dtype=float) / 255
+    samples = np.minimum((np.linspace(0, 1, len(ROOMS)) * len(SET3)).astype(int), len(SET3) - 1)
+
+    colors = np.tile(GRAY + (255,), (len(geometry.labels), 1)) / 255
+    colors[:len(ROOMS), :3] = palette[samples]
+    return colors
+
+
+# Estilo de cada camada no matplotlib: cor de preenchimento (None usa a cor do rótulo), espessura da
+# borda, transparência e tamanho da fonte dos rótulos (None não escreve rótulos)
+_STYLES = {
+    "rooms": (None, 2.0, 1.0, 8),
+    "doors": ("brown", 1.0, 1.0, None),
+    "windows": ("lightblue", 1.0, 1.0, None),
+    "furniture": ("gray", 1.0, 0.5, 6),
+}
+
+
+def draw_geometry(geometry: RenderGeometry, axes: Dict[Tuple[int, int], object]) -> None:
+    """
+    Desenha a geometria em eixos do matplotlib: uma coleção de polígonos por camada e por eixo
+    (em vez de um Rectangle por item) e um texto por rótulo.
+
+    Args:
+        geometry (RenderGeometry): A geometria.
+        axes (Dict[Tuple[int, int], object]): Eixo de cada (planta, andar) a ser desenhado.
+    """
+
+    from matplotlib.collections import PolyCollection
+
+    colors = room_colors(geometry)
+    for layer in LAYERS:
+        facecolor, linewidth, alpha, fontsize = _STYLES[layer]
+        for key, items in geometry.groups(layer).items():
+            ax = axes.get(key)
+            if ax is None:
+                continue
+
+            collection = PolyCollection(
+                rectangle_vertices(items), facecolors=colors[items["label"]] if facecolor is None else facecolor,
+                edgecolors="black", linewidths=linewidth, alpha=alpha,
+            )
+            ax.add_collection(collection)
+
+            if fontsize is None:
+                continue
+            centers_x = (items["x"] + items["width"] / 2).tolist()
+            centers_y = (items["y"] + items["length"] / 2).tolist()
+            for x, y, label in zip(centers_x, centers_y, items["label"].tolist()):
+                ax.text(x, y, geometry.labels[label], ha="center", va="center", wrap=True, fontsize=fontsize)
+
+
+def draw_floor_plans(plans: Sequence['FloorPlan'], output: Optional[str] = None) -> None:
+    """
+    Desenha várias plantas em uma única figura, uma linha por planta e uma coluna por andar.
+
+    Args:
+        plans (Sequence[FloorPlan]): As plantas.
+        output (Optional[str]): Arquivo de saída (o formato é definido pela extensão, ex.: .png, .svg).
+            Quando omitido, a figura é exibida em uma janela.
+    """
+
+    import matplotlib
+
+    if output is not None:
+        # Renderização sem interface gráfica
+        matplotlib.use("Agg")
+
+    import matplotlib.pyplot as plt
+
+    geometry = RenderGeometry(plans)
+    columns = max(int(geometry.envelopes[:, 2].max(initial=1)), 1)
+    rows = max(geometry.plan_count, 1)
+    fig, grid = plt.subplots(rows, columns, figsize=(10 * columns, 10 * rows), squeeze=False)
+
+    axes = {}
+    for plan_index, (width, length, floors) in enumerate(geometry.envelopes.tolist()):
+        for floor in range(columns):
+            ax = grid[plan_index, floor]
+            if floor >= floors:
+                ax.axis("off")
+                continue
+
+            title = f"Planta do Andar {floor}"
+            ax.set_title(title if rows == 1 else f"Alternativa {plan_index + 1} - {title}")
+            ax.set_xlim(0, width)
+            ax.set_ylim(0, length)
+            ax.set_aspect("equal")
+            ax.invert_yaxis()
+
+            # Adiciona a orientação da casa
+            orientation_text = f"N\n^\n|\n \n{geometry.orientations[plan_index].capitalize()}"
+            ax.text(1.02, 0.5, orientation_text, transform=ax.transAxes, va="center", ha="left")
+            axes[(plan_index, floor)] = ax
+
+    draw_geometry(geometry, axes)
+    plt.tight_layout()
+
+    if output is not None:
+        fig.savefig(output)
+        plt.close(fig)
+    else:
+        plt.show()
@@ -0,0 +1,179 @@
+import math
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from genetic_algorithm import Evolution
+
+# Prioridades dos pedidos: interativos (um cliente aguardando) passam na frente dos pedidos em lote
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = {INTERACTIVE: 0, BATCH: 1}
+
+# Motivos do fim de uma fatia de execução (run_slice)
+FINISHED = "finished"
+EXPIRED = "expired"
+PREEMPTED = "preempted"
+CANCELLED = "cancelled"
+
+# Menor população usada ao reduzir um pedido para caber no orçamento
+MIN_POPULATION = 10
+
+
+class Budget:
+    def __init__(self, seconds: Optional[float] = None, evaluations: Optional[int] = None):
+        """
+        Orçamento de um pedido: tempo de execução (sem contar o tempo na fila) e/ou número de
+        plantas avaliadas. Sem limites, o pedido roda todas as gerações pedidas.
+
+        Args:
+            seconds (Optional[float]): Tempo máximo de execução, em segundos.
+            evaluations (Optional[int]): Número máximo de avaliações.
+        """
+
+        if seconds is not None and seconds <= 0:
+            raise ValueError("O orçamento de tempo deve ser positivo")
+        if evaluations is not None and evaluations <= 0:
+            raise ValueError("O orçamento de avaliações deve ser positivo")
+
+        self.seconds: Optional[float] = seconds
+        self.evaluations: Optional[int] = evaluations
+
+    def expired(self, elapsed: float, evaluations: int) -> bool:
+        """
+        Verifica se o orçamento acabou.
+
+        Args:
+            elapsed (float): Tempo de execução já usado, em segundos.
+            evaluations (int): Avaliações já feitas.
+
+        Returns:
+            bool: True se algum dos limites foi atingido.
+        """
+
+        return (
+            (self.seconds is not None and elapsed >= self.seconds) or
+            (self.evaluations is not None and evaluations >= self.evaluations)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Representação JSON do orçamento.
+
+        Returns:
+            Dict[str, Any]: Limites de tempo e de avaliações (None se ausentes).
+        """
+
+        return {"seconds": self.seconds, "evaluations": self.evaluations}
+
+
+class ThroughputEstimate:
+    def __init__(self, seconds_per_evaluation: float = 0.005, smoothing: float = 0.3):
+        """
+        Estimativa, por média móvel exponencial, do tempo de execução por planta avaliada (o
+        ciclo inteiro: cruzamento, reparo, avaliação e seleção), usada para converter orçamentos
+        de tempo em avaliações.
+
+        Args:
+            seconds_per_evaluation (float): Estimativa inicial.
+            smoothing (float): Peso de cada nova medição.
+        """
+
+        self.seconds_per_evaluation: float = seconds_per_evaluation
+        self.smoothing: float = smoothing
+
+    def update(self, elapsed: float, evaluations: int) -> None:
+        """
+        Incorpora a medição de uma fatia de execução.
+
+        Args:
+            elapsed (float): Duração da fatia, em segundos.
+            evaluations (int): Avaliações feitas na fatia.
+        """
+
+        if evaluations > 0 and elapsed > 0:
+            measured = elapsed / evaluations
+            self.seconds_per_evaluation += self.smoothing * (measured - self.seconds_per_evaluation)
+
+
+def fit_to_budget(
+    params: Dict[str, Any], budget: Budget, throughput: Optional[ThroughputEstimate] = None
+) -> Dict[str, Any]:
+    """
+    Reduz a população e o número de gerações de um pedido para que ele caiba no orçamento.
+    Uma execução avalia cerca de population_size * (1 + mutation_rate) plantas por geração,
+    mais a população inicial; população e gerações são reduzidas pelo mesmo fator (raiz
+    quadrada da razão entre o orçamento e o pedido), e as gerações são então ajustadas ao
+    que sobra. Pedidos que já cabem não são alterados.
+
+    Args:
+        params (Dict[str, Any]): Argumentos de evolutionary_cycle.
+        budget (Budget): Orçamento.
+        throughput (Optional[ThroughputEstimate]): Converte o orçamento de tempo em avaliações.
+
+    Returns:
+        Dict[str, Any]: Cópia dos argumentos com "population_size" e "generations" ajustados.
+    """
+
+    limits = []
+    if budget.evaluations is not None:
+        limits.append(budget.evaluations)
+    if budget.seconds is not None:
+        throughput = throughput or ThroughputEstimate()
+        limits.append(budget.seconds / throughput.seconds_per_evaluation)
+    if not limits:
+        return dict(params)
+
+    available = min(limits)
+    per_generation = 1 + params.get("mutation_rate", 0.1)
+    population_size, generations = params["population_size"], params["generations"]
+    requested = population_size * (per_generation * generations + 1)
+    if requested <= available:
+        return dict(params)
+
+    scale = math.sqrt(available / requested)
+    population_size = max(MIN_POPULATION, min(population_size, int(population_size * scale)))
+    generations = max(1, min(generations, int((available / population_size - 1) / per_generation)))
+
+    return dict(params, population_size=population_size, generations=generations)
+
+
+def run_slice(
+    evolution: 'Evolution', generations: int, budget: Budget, elapsed: float = 0.0,
+    interrupt: Optional[Callable[[], Optional[str]]] = None,
+    on_generation: Optional[Callable[[int, Dict[str, float]], None]] = None
+) -> Tuple[str, float]:
+    """
+    Avança o ciclo evolutivo, uma geração por vez, até completar as gerações pedidas, esgotar
+    o orçamento ou ser interrompido. As interrupções só acontecem em fronteiras de geração,
+    quando o estado pode ser salvo (Evolution.checkpoint) e retomado depois.
+
+    Args:
+        evolution (Evolution): O ciclo, novo ou retomado.
+        generations (int): Total de gerações do pedido.
+        budget (Budget): Orçamento do pedido.
+        elapsed (float): Tempo de execução já usado em fatias anteriores, em segundos.
+        interrupt (Optional[Callable[[], Optional[str]]]): Consultada a cada geração; retorna
+            PREEMPTED ou CANCELLED para interromper a fatia, ou None para continuar.
+        on_generation (Optional[Callable[[int, Dict[str, float]], None]]): Recebe o número da
+            geração e as estatísticas (ver Evolution.step).
+
+    Returns:
+        Tuple[str, float]: Motivo do fim da fatia (FINISHED, EXPIRED, PREEMPTED ou CANCELLED) e
+            o tempo de execução total usado até aqui.
+    """
+
+    start = time.perf_counter() - elapsed
+    while evolution.generation < generations:
+        if budget.expired(time.perf_counter() - start, evolution.evaluations):
+            return EXPIRED, time.perf_counter() - start
+
+        reason = interrupt() if interrupt is not None else None
+        if reason is not None:
+            return reason, time.perf_counter() - start
+
+        stats = evolution.step()
+        if on_generation is not None:
+            on_generation(evolution.generation - 1, stats)
+
+    return FINISHED, time.perf_counter() - start
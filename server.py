@@ -0,0 +1,740 @@
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import random
+import signal
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from scheduler import (
+    BATCH, EXPIRED, INTERACTIVE, PREEMPTED, PRIORITIES, Budget, ThroughputEstimate, fit_to_budget, run_slice,
+)
+from scheduler import CANCELLED as CANCEL_REQUESTED
+from utils import calculate_characteristics, characteristics_to_program
+
+# Estados de um pedido de geração
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+FINISHED_STATES = (DONE, CANCELLED, FAILED)
+
+# Pedidos terminados ficam disponíveis (consulta, miniatura e deduplicação) por este tempo, em segundos,
+# e no máximo esta quantidade; os mais antigos são descartados junto com os seus eventos do Manager
+FINISHED_JOB_TTL = 3600.0
+MAX_FINISHED_JOBS = 1000
+
+HTTP_REASONS = {
+    200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 500: "Internal Server Error",
+}
+
+
+def run_generation_job(
+    job_id: str, params: Dict[str, Any], progress_queue, cancel_event, preempt_event=None,
+    checkpoint: Optional[bytes] = None, elapsed: float = 0.0
+) -> Dict[str, Any]:
+    """
+    Executa (ou retoma) um pedido de geração em um processo do pool, até o fim das gerações,
+    o fim do orçamento, o cancelamento ou a preempção (ver scheduler.run_slice).
+
+    O progresso de cada geração é enviado para progress_queue. Cancelamento e preempção são
+    atendidos na fronteira de geração seguinte: o cancelamento retorna o melhor resultado até
+    o momento, e a preempção retorna o estado do ciclo (Evolution.checkpoint) para ser retomado.
+
+    Args:
+        job_id (str): Identificador do pedido.
+        params (Dict[str, Any]): Argumentos de evolutionary_cycle, mais "seed", "priority",
+            "time_budget" e "evaluation_budget".
+        progress_queue: Fila (multiprocessing.Manager) para as estatísticas de cada geração.
+        cancel_event: Evento (multiprocessing.Manager) de cancelamento.
+        preempt_event: Evento (multiprocessing.Manager) de preempção (opcional).
+        checkpoint (Optional[bytes]): Estado salvo por uma execução preemptada.
+        elapsed (float): Tempo de execução já usado pelo pedido, em segundos.
+
+    Returns:
+        Dict[str, Any]: Motivo do fim da fatia ("reason"), tempo de execução e avaliações
+            acumulados ("elapsed", "evaluations"), avaliações da fatia ("slice_evaluations") e
+            o resultado ("result", no formato de export.plan_to_dict) ou, se preemptado, o
+            estado salvo ("checkpoint").
+    """
+
+    from export import plan_to_dict
+    from genetic_algorithm import Evolution
+
+    params = dict(params)
+    seed = params.pop("seed")
+    generations = params.pop("generations")
+    params.pop("priority")
+    budget = Budget(params.pop("time_budget"), params.pop("evaluation_budget"))
+
+    if checkpoint is not None:
+        evolution = Evolution.restore(checkpoint)
+    else:
+        if seed is not None:
+            random.seed(seed)
+        evolution = Evolution(**params)
+    evaluations = evolution.evaluations
+
+    def interrupt() -> Optional[str]:
+        if cancel_event.is_set():
+            return CANCEL_REQUESTED
+        if preempt_event is not None and preempt_event.is_set():
+            return PREEMPTED
+        return None
+
+    def on_generation(generation: int, stats: Dict[str, float]) -> None:
+        progress_queue.put((job_id, dict(stats, generation=generation + 1, generations=generations)))
+
+    reason, elapsed = run_slice(evolution, generations, budget, elapsed, interrupt, on_generation)
+    report = {
+        "reason": reason,
+        "elapsed": elapsed,
+        "evaluations": evolution.evaluations,
+        "slice_evaluations": evolution.evaluations - evaluations,
+    }
+
+    if reason == PREEMPTED:
+        report["checkpoint"] = evolution.checkpoint()
+        return report
+
+    result = evolution.finish()
+    report["result"] = [plan_to_dict(plan) for plan in result] if isinstance(result, list) else plan_to_dict(result)
+    return report
+
+
+def parse_plan_request(body: Dict[str, Any]) -> Tuple[Dict[str, Any], Tuple[Any, ...]]:
+    """
+    Valida o corpo de um pedido de geração e monta os argumentos de evolutionary_cycle.
+
+    O programa da casa pode ser informado pelo nome ("name") ou diretamente ("house_type",
+    "special_room", "bedrooms", "bathrooms", "closets"). Opcionalmente, "priority"
+    ("interactive" ou "batch"), "time_budget" (segundos) e "evaluation_budget" (plantas avaliadas).
+
+    Args:
+        body (Dict[str, Any]): Corpo JSON do pedido.
+
+    Returns:
+        Tuple[Dict[str, Any], Tuple[Any, ...]]: Argumentos da execução e chave de deduplicação.
+    """
+
+    if "area" not in body or "orientation" not in body:
+        raise ValueError("Os campos 'area' e 'orientation' são obrigatórios")
+
+    if "name" in body:
+        program = characteristics_to_program(*calculate_characteristics(str(body["name"])))
+    else:
+        try:
+            program = (
+                str(body["house_type"]), str(body["special_room"]),
+                int(body["bedrooms"]), int(body["bathrooms"]), int(body["closets"]),
+            )
+        except KeyError as error:
+            raise ValueError(f"Campo obrigatório ausente: {error.args[0]}")
+
+    orientation = str(body["orientation"]).lower()
+    if orientation not in ("norte", "sul", "leste", "oeste"):
+        raise ValueError(f"Orientação inválida: {orientation}")
+
+    mode = body.get("mode", "weighted")
+    if mode not in ("weighted", "pareto"):
+        raise ValueError(f"Modo de otimização desconhecido: {mode}")
+
+    priority = body.get("priority", INTERACTIVE)
+    if priority not in PRIORITIES:
+        raise ValueError(f"Prioridade desconhecida: {priority}")
+
+    # Valida o orçamento (Budget rejeita limites não positivos)
+    budget = Budget(
+        float(body["time_budget"]) if body.get("time_budget") is not None else None,
+        int(body["evaluation_budget"]) if body.get("evaluation_budget") is not None else None,
+    )
+
+    house_type, special_room, bedrooms, bathrooms, closets = program
+    params = {
+        "generations": int(body.get("generations", 200)),
+        "population_size": int(body.get("population_size", 100)),
+        "area": float(body["area"]),
+        "orientation": orientation,
+        "house_type": house_type,
+        "special_room": special_room,
+        "bedrooms": bedrooms,
+        "bathrooms": bathrooms,
+        "closets": closets,
+        "mode": mode,
+        "polish_iterations": int(body.get("polish_iterations", 500)),
+        "seed": body.get("seed"),
+        "priority": priority,
+        "time_budget": budget.seconds,
+        "evaluation_budget": budget.evaluations,
+    }
+
+    if params["area"] <= 0 or params["generations"] <= 0 or params["population_size"] < 2:
+        raise ValueError("Área, gerações e população devem ser positivas")
+    if params["polish_iterations"] < 0:
+        raise ValueError("O número de movimentos de refinamento não pode ser negativo")
+
+    key = tuple(sorted(params.items()))
+    return params, key
+
+
+class GenerationJob:
+    def __init__(
+        self, job_id: str, key: Tuple[Any, ...], params: Dict[str, Any], cancel_event, preempt_event=None
+    ):
+        """
+        Pedido de geração acompanhado pelo serviço.
+
+        Args:
+            job_id (str): Identificador do pedido.
+            key (Tuple[Any, ...]): Chave de deduplicação.
+            params (Dict[str, Any]): Argumentos da execução.
+            cancel_event: Evento (multiprocessing.Manager) de cancelamento.
+            preempt_event: Evento (multiprocessing.Manager) de preempção, usado em pedidos em lote.
+        """
+
+        self.id: str = job_id
+        self.key: Tuple[Any, ...] = key
+        self.params: Dict[str, Any] = params
+        self.priority: str = params.get("priority", INTERACTIVE)
+        self.cancel_event = cancel_event
+        self.preempt_event = preempt_event
+        self.preempt_requested: bool = False
+        self.status: str = QUEUED
+        self.progress: Optional[Dict[str, Any]] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.subscribers: List[asyncio.Queue] = []
+        self.requesters: int = 1  # Clientes que pediram a execução (pedidos idênticos a compartilham)
+        self.cancel_requested: bool = False
+        self.finished_at: Optional[float] = None  # Instante do término (time.monotonic)
+
+        # Execução em fatias: estado salvo na preempção e uso acumulado do orçamento
+        self.checkpoint: Optional[bytes] = None
+        self.slices: int = 0
+        self.preemptions: int = 0
+        self.elapsed: float = 0.0
+        self.evaluations: int = 0
+        self.budget_expired: bool = False
+
+    @property
+    def queue_entry(self) -> Tuple[int, int, 'GenerationJob']:
+        """
+        Entrada na fila de prioridades: prioridade e, entre pedidos de mesma prioridade, a ordem de chegada.
+
+        Returns:
+            Tuple[int, int, GenerationJob]: A entrada.
+        """
+
+        return PRIORITIES[self.priority], int(self.id), self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Representação JSON do pedido.
+
+        Returns:
+            Dict[str, Any]: Estado, progresso e resultado do pedido.
+        """
+
+        return {
+            "id": self.id,
+            "status": self.status,
+            "priority": self.priority,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error,
+            "execution": {
+                "population_size": self.params["population_size"],
+                "generations": self.params["generations"],
+                "elapsed": self.elapsed,
+                "evaluations": self.evaluations,
+                "preemptions": self.preemptions,
+                "budget_expired": self.budget_expired,
+            },
+        }
+
+    def publish(self, event: str, data: Dict[str, Any]) -> None:
+        """
+        Envia um evento para todos os inscritos no fluxo de progresso.
+
+        Args:
+            event (str): Nome do evento.
+            data (Dict[str, Any]): Dados do evento.
+        """
+
+        for subscriber in self.subscribers:
+            subscriber.put_nowait((event, data))
+
+
+class GenerationService:
+    def __init__(self, max_workers: int = 2):
+        """
+        Serviço de geração de plantas: enfileira pedidos, executa-os em um pool limitado de
+        processos, deduplica pedidos idênticos, transmite o progresso e permite cancelamento.
+
+        Pedidos interativos passam na frente dos pedidos em lote e, se todos os processos
+        estiverem ocupados, pedidos em lote em execução são preemptados na fronteira de geração
+        seguinte e voltam para a fila com o estado salvo. Pedidos com orçamento têm população e
+        gerações reduzidas para caber nele (ver scheduler.fit_to_budget) e, se o orçamento
+        acabar antes, retornam a melhor planta até o momento. Pedidos terminados são descartados
+        após FINISHED_JOB_TTL segundos ou além de MAX_FINISHED_JOBS, os mais antigos primeiro.
+
+        Args:
+            max_workers (int): Número máximo de gerações simultâneas.
+        """
+
+        self.max_workers: int = max_workers
+        self.jobs: Dict[str, GenerationJob] = {}
+        self.jobs_by_key: Dict[Tuple[Any, ...], GenerationJob] = {}
+        self.finished: "OrderedDict[str, GenerationJob]" = OrderedDict()  # Em ordem de término
+        self.queue: "asyncio.PriorityQueue[Tuple[int, int, GenerationJob]]" = asyncio.PriorityQueue()
+        self.throughput = ThroughputEstimate()
+        self._ids = itertools.count(1)
+        self._manager = multiprocessing.Manager()
+        self._progress = self._manager.Queue()
+        self._executor = ProcessPoolExecutor(max_workers=max_workers)
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """
+        Inicia os despachantes da fila e o leitor de progresso.
+        """
+
+        self._tasks = [asyncio.create_task(self._dispatch()) for _ in range(self.max_workers)]
+        self._tasks.append(asyncio.create_task(self._pump_progress()))
+
+    async def stop(self) -> None:
+        """
+        Cancela os pedidos em andamento e encerra o pool de processos, aguardando os processos
+        em uma thread para não bloquear o laço de eventos.
+        """
+
+        for job in self.jobs.values():
+            if job.status not in FINISHED_STATES:
+                job.cancel_event.set()
+
+        for task in self._tasks:
+            task.cancel()
+        self._progress.put(None)
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown, True)
+        await loop.run_in_executor(None, self._manager.shutdown)
+
+    def submit(self, params: Dict[str, Any], key: Tuple[Any, ...]) -> Tuple[GenerationJob, bool]:
+        """
+        Enfileira um pedido, reaproveitando um pedido idêntico ainda válido (que passa a contar
+        mais um cliente; ver cancel).
+
+        Args:
+            params (Dict[str, Any]): Argumentos da execução.
+            key (Tuple[Any, ...]): Chave de deduplicação.
+
+        Returns:
+            Tuple[GenerationJob, bool]: O pedido e se ele foi reaproveitado.
+        """
+
+        self._evict_finished()
+
+        existing = self.jobs_by_key.get(key)
+        if existing is not None and existing.status not in (CANCELLED, FAILED) and not existing.cancel_requested:
+            existing.requesters += 1
+            return existing, True
+
+        preempt_event = self._manager.Event() if params.get("priority") == BATCH else None
+        job = GenerationJob(str(next(self._ids)), key, params, self._manager.Event(), preempt_event)
+        self.jobs[job.id] = job
+        self.jobs_by_key[key] = job
+        self.queue.put_nowait(job.queue_entry)
+
+        if job.priority == INTERACTIVE:
+            self._preempt_batch_jobs()
+
+        return job, False
+
+    def _preempt_batch_jobs(self) -> None:
+        """
+        Pede a preempção de pedidos em lote em execução (os mais recentes primeiro) quando há
+        pedidos interativos na fila e nenhum processo livre para eles.
+        """
+
+        waiting = sum(1 for job in self.jobs.values() if job.status == QUEUED and job.priority == INTERACTIVE)
+        running = [job for job in self.jobs.values() if job.status == RUNNING]
+        batch = [job for job in running if job.priority == BATCH]
+        needed = waiting - (self.max_workers - len(running)) - sum(job.preempt_requested for job in batch)
+
+        for job in reversed(batch):
+            if needed <= 0:
+                break
+            if not job.preempt_requested:
+                job.preempt_requested = True
+                job.preempt_event.set()
+                needed -= 1
+
+    def cancel(self, job: GenerationJob) -> bool:
+        """
+        Desiste de um pedido em nome de um cliente. Como pedidos idênticos compartilham a execução,
+        ela só é cancelada quando todos os clientes que a pediram desistem. Pedidos em execução
+        param ao fim da geração corrente.
+
+        Args:
+            job (GenerationJob): O pedido.
+
+        Returns:
+            bool: True se o cancelamento foi pedido, False se o pedido já terminou ou ainda tem outros clientes.
+        """
+
+        if job.status in FINISHED_STATES or job.cancel_requested:
+            return False
+
+        job.requesters -= 1
+        if job.requesters > 0:
+            return False
+
+        job.cancel_requested = True
+        job.cancel_event.set()
+        if job.status == QUEUED:
+            self._finish(job, CANCELLED)
+        return True
+
+    def _finish(self, job: GenerationJob, status: str) -> None:
+        """
+        Registra o término de um pedido e avisa os inscritos.
+
+        Args:
+            job (GenerationJob): O pedido.
+            status (str): Estado final.
+        """
+
+        job.status = status
+        job.finished_at = time.monotonic()
+        job.publish(status, job.to_dict())
+        self.finished[job.id] = job
+        self._evict_finished()
+
+    def _evict_finished(self) -> None:
+        """
+        Descarta os pedidos terminados há mais de FINISHED_JOB_TTL segundos e os mais antigos além
+        de MAX_FINISHED_JOBS, liberando os seus eventos do Manager.
+        """
+
+        deadline = time.monotonic() - FINISHED_JOB_TTL
+        while self.finished:
+            job = next(iter(self.finished.values()))
+            if len(self.finished) <= MAX_FINISHED_JOBS and job.finished_at > deadline:
+                break
+            del self.finished[job.id]
+            self.jobs.pop(job.id, None)
+            if self.jobs_by_key.get(job.key) is job:
+                del self.jobs_by_key[job.key]
+            job.cancel_event = job.preempt_event = None
+
+    async def _dispatch(self) -> None:
+        """
+        Retira pedidos da fila e os executa no pool de processos.
+        """
+
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, job = await self.queue.get()
+            if job.status != QUEUED:
+                continue
+
+            # Na primeira fatia, ajusta população e gerações ao orçamento
+            if job.slices == 0:
+                budget = Budget(job.params["time_budget"], job.params["evaluation_budget"])
+                job.params = fit_to_budget(job.params, budget, self.throughput)
+
+            job.status = RUNNING
+            job.publish(RUNNING, {"id": job.id})
+            try:
+                report = await loop.run_in_executor(
+                    self._executor, run_generation_job, job.id, job.params, self._progress, job.cancel_event,
+                    job.preempt_event, job.checkpoint, job.elapsed
+                )
+            except Exception as error:  # Erros da geração são reportados ao cliente
+                job.error = f"{type(error).__name__}: {error}"
+                self._finish(job, FAILED)
+                continue
+
+            job.slices += 1
+            self.throughput.update(report["elapsed"] - job.elapsed, report["slice_evaluations"])
+            job.elapsed, job.evaluations = report["elapsed"], report["evaluations"]
+
+            if report["reason"] == PREEMPTED:
+                # Volta para a fila com o estado salvo; o pedido interativo fica com o processo
+                job.checkpoint = report["checkpoint"]
+                job.preemptions += 1
+                job.preempt_requested = False
+                job.preempt_event.clear()
+                job.status = QUEUED
+                job.publish("preempted", {"id": job.id, "evaluations": job.evaluations})
+                self.queue.put_nowait(job.queue_entry)
+                continue
+
+            job.checkpoint = None
+            job.result = report["result"]
+            job.budget_expired = report["reason"] == EXPIRED
+            self._finish(job, CANCELLED if job.cancel_event.is_set() else DONE)
+
+    async def _pump_progress(self) -> None:
+        """
+        Repassa as estatísticas enviadas pelos processos para os inscritos de cada pedido.
+        """
+
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await loop.run_in_executor(None, self._progress.get)
+            if message is None:
+                return
+
+            job_id, stats = message
+            job = self.jobs.get(job_id)
+            if job is not None and job.status == RUNNING:
+                job.progress = stats
+                job.publish("progress", stats)
+
+
+class GenerationServer:
+    def __init__(self, service: GenerationService):
+        """
+        Servidor HTTP mínimo (asyncio) sobre o serviço de geração.
+
+        Rotas:
+            POST /plans               Enfileira um pedido (JSON) e retorna seu id.
+            GET /plans/<id>           Estado, progresso e resultado do pedido.
+            GET /plans/<id>/events    Progresso por server-sent events até o término.
+            DELETE /plans/<id>        Cancela o pedido.
+            GET /health               Verificação de disponibilidade.
+
+        Args:
+            service (GenerationService): O serviço de geração.
+        """
+
+        self.service: GenerationService = service
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Atende uma conexão HTTP.
+
+        Args:
+            reader (asyncio.StreamReader): Fluxo de leitura.
+            writer (asyncio.StreamWriter): Fluxo de escrita.
+        """
+
+        try:
+            request_line = (await reader.readline()).decode("latin-1").strip()
+            if not request_line:
+                return
+            method, path, _ = request_line.split(" ", 2)
+
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            body = b""
+            if "content-length" in headers:
+                body = await reader.readexactly(int(headers["content-length"]))
+
+            await self.route(method, path.split("?", 1)[0].rstrip("/"), body, writer)
+        except (ValueError, asyncio.IncompleteReadError) as error:
+            await self.respond(writer, 400, {"error": str(error)})
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        """
+        Encaminha uma requisição para a rota correspondente.
+
+        Args:
+            method (str): Método HTTP.
+            path (str): Caminho requisitado.
+            body (bytes): Corpo da requisição.
+            writer (asyncio.StreamWriter): Fluxo de escrita.
+        """
+
+        parts = [part for part in path.split("/") if part]
+
+        if parts == ["health"]:
+            await self.respond(writer, 200, {"status": "ok", "jobs": len(self.service.jobs)})
+            return
+
+        if parts == ["plans"]:
+            if method != "POST":
+                await self.respond(writer, 405, {"error": "Use POST"})
+                return
+            try:
+                params, key = parse_plan_request(json.loads(body or b"{}"))
+            except (ValueError, TypeError) as error:
+                await self.respond(writer, 400, {"error": str(error)})
+                return
+            job, deduplicated = self.service.submit(params, key)
+            await self.respond(writer, 202, {"id": job.id, "status": job.status, "deduplicated": deduplicated})
+            return
+
+        if len(parts) in (2, 3) and parts[0] == "plans":
+            job = self.service.jobs.get(parts[1])
+            if job is None:
+                await self.respond(writer, 404, {"error": "Pedido não encontrado"})
+            elif len(parts) == 3 and parts[2] == "events" and method == "GET":
+                await self.stream_events(job, writer)
+            elif len(parts) == 3 and parts[2] == "thumbnail.png" and method == "GET":
+                await self.send_thumbnail(job, writer)
+            elif len(parts) == 2 and method == "GET":
+                await self.respond(writer, 200, job.to_dict())
+            elif len(parts) == 2 and method == "DELETE":
+                cancelled = self.service.cancel(job)
+                await self.respond(writer, 200, {
+                    "id": job.id, "status": job.status, "cancelled": cancelled, "requesters": job.requesters,
+                })
+            else:
+                await self.respond(writer, 405, {"error": "Método não suportado"})
+            return
+
+        await self.respond(writer, 404, {"error": "Rota não encontrada"})
+
+    async def respond(self, writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any]) -> None:
+        """
+        Envia uma resposta JSON.
+
+        Args:
+            writer (asyncio.StreamWriter): Fluxo de escrita.
+            status (int): Código HTTP.
+            payload (Dict[str, Any]): Corpo da resposta.
+        """
+
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        await self.respond_bytes(writer, status, "application/json; charset=utf-8", body)
+
+    async def respond_bytes(self, writer: asyncio.StreamWriter, status: int, content_type: str, body: bytes) -> None:
+        """
+        Envia uma resposta com um corpo binário.
+
+        Args:
+            writer (asyncio.StreamWriter): Fluxo de escrita.
+            status (int): Código HTTP.
+            content_type (str): Tipo do conteúdo.
+            body (bytes): Corpo da resposta.
+        """
+
+        writer.write(
+            f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+
+    async def send_thumbnail(self, job: GenerationJob, writer: asyncio.StreamWriter) -> None:
+        """
+        Envia a miniatura PNG do resultado de um pedido concluído (ver thumbnail.py): uma linha por
+        alternativa, com os andares lado a lado.
+
+        Args:
+            job (GenerationJob): O pedido.
+            writer (asyncio.StreamWriter): Fluxo de escrita.
+        """
+
+        if job.result is None:
+            await self.respond(writer, 409, {"error": "O pedido ainda não tem resultado", "status": job.status})
+            return
+
+        from export import plan_from_dict
+        from thumbnail import thumbnail_png
+
+        results = job.result if isinstance(job.result, list) else [job.result]
+        plans = [plan_from_dict(result) for result in results]
+        await self.respond_bytes(writer, 200, "image/png", thumbnail_png(plans))
+
+    async def stream_events(self, job: GenerationJob, writer: asyncio.StreamWriter) -> None:
+        """
+        Transmite o progresso do pedido por server-sent events até o seu término.
+
+        Args:
+            job (GenerationJob): O pedido.
+            writer (asyncio.StreamWriter): Fluxo de escrita.
+        """
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+
+        async def send(event: str, data: Dict[str, Any]) -> None:
+            writer.write(f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8"))
+            await writer.drain()
+
+        # Estado atual primeiro, para quem se inscreve no meio da execução
+        if job.status in FINISHED_STATES:
+            await send(job.status, job.to_dict())
+            return
+        if job.progress is not None:
+            await send("progress", job.progress)
+
+        subscriber: asyncio.Queue = asyncio.Queue()
+        job.subscribers.append(subscriber)
+        try:
+            while True:
+                event, data = await subscriber.get()
+                await send(event, data)
+                if event in FINISHED_STATES:
+                    return
+        finally:
+            job.subscribers.remove(subscriber)
+
+
+async def serve(host: str, port: int, max_workers: int) -> None:
+    """
+    Inicia o serviço e atende conexões até ser interrompido.
+
+    Args:
+        host (str): Endereço de escuta.
+        port (int): Porta de escuta.
+        max_workers (int): Número máximo de gerações simultâneas.
+    """
+
+    service = GenerationService(max_workers)
+    service.start()
+    server = await asyncio.start_server(GenerationServer(service).handle, host, port)
+
+    # Encerra de forma ordenada com Ctrl+C ou SIGTERM (ex.: enviado por agendadores de tarefas)
+    stop_requested = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signal_number, stop_requested.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Sinais não suportados pelo laço de eventos (ex.: Windows)
+
+    print(f"Servidor de geração em http://{host}:{port} ({max_workers} processos)", flush=True)
+    try:
+        async with server:
+            await stop_requested.wait()
+    finally:
+        await service.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serviço HTTP local de geração de plantas.")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço de escuta (padrão: 127.0.0.1).")
+    parser.add_argument("--porta", type=int, default=8000, help="Porta de escuta (padrão: 8000).")
+    parser.add_argument("--processos", type=int, default=2, help="Gerações simultâneas (padrão: 2).")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.porta, args.processos))
+    except KeyboardInterrupt:
+        pass
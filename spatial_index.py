@@ -0,0 +1,220 @@
+import math
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+if TYPE_CHECKING:
+    from models import Room
+
+# Lado padrão (em metros) das células do índice: próximo do lado de um cômodo típico
+CELL_SIZE = 4.0
+
+# Andar das células dos cômodos que ocupam todos os andares (escadas)
+SPANNING = -1
+
+# Abaixo deste número de cômodos, a comparação direta de todos os pares é mais rápida que o índice
+MIN_INDEXED_ROOMS = 24
+
+
+def overlap(room1: 'Room', room2: 'Room') -> bool:
+    """
+    Verifica se dois cômodos se sobrepõem (interiores com área em comum) em algum andar, com o
+    mesmo critério de FloorPlan.has_overlap.
+
+    Args:
+        room1 (Room): Primeiro cômodo.
+        room2 (Room): Segundo cômodo.
+
+    Returns:
+        bool: True se houver sobreposição, False caso contrário.
+    """
+
+    return (
+        room1.x < room2.x + room2.width and room2.x < room1.x + room1.width and
+        room1.y < room2.y + room2.length and room2.y < room1.y + room1.length and
+        room1.shares_floor(room2)
+    )
+
+
+def cell_size_for(rooms: Sequence['Room']) -> float:
+    """
+    Escolhe o lado das células para um conjunto de cômodos: a média do maior lado dos cômodos,
+    de modo que cada cômodo ocupe poucas células e cada célula guarde poucos cômodos.
+
+    Args:
+        rooms (Sequence[Room]): Os cômodos.
+
+    Returns:
+        float: Lado das células, em metros.
+    """
+
+    if not rooms:
+        return CELL_SIZE
+    return max(sum(max(room.width, room.length) for room in rooms) / len(rooms), 1.0)
+
+
+class SpatialIndex:
+    def __init__(self, cell_size: float = CELL_SIZE):
+        """
+        Índice espacial de cômodos em uma grade uniforme (hash de células): cada cômodo é
+        registrado nas células do seu andar que o seu retângulo cobre, e as consultas comparam
+        apenas os cômodos das células vizinhas, em vez de todos. As escadas, que ocupam todos os
+        andares, ficam em células próprias (SPANNING), consultadas junto com as de cada andar.
+
+        Args:
+            cell_size (float): Lado das células, em metros.
+        """
+
+        self.cell_size: float = cell_size
+        self.rooms: List['Room'] = []
+        self.cells: Dict[Tuple[int, int, int], List[int]] = {}
+        self.floors: Set[int] = {SPANNING}  # Andares com cômodos registrados
+
+    def _keys(self, room: 'Room', floors: Iterable[int], margin: float = 0.0) -> Iterator[Tuple[int, int, int]]:
+        """
+        Percorre as células dos andares informados cobertas pelo retângulo do cômodo (bordas
+        incluídas), ampliado pela margem.
+
+        Args:
+            room (Room): O cômodo.
+            floors (Iterable[int]): Andares das células.
+            margin (float): Ampliação do retângulo em todas as direções.
+
+        Returns:
+            Iterator[Tuple[int, int, int]]: Andar, coluna e linha de cada célula.
+        """
+
+        size = self.cell_size
+        column_start = math.floor((room.x - margin) / size)
+        column_end = math.floor((room.x + room.width + margin) / size)
+        row_start = math.floor((room.y - margin) / size)
+        row_end = math.floor((room.y + room.length + margin) / size)
+        for floor in floors:
+            for column in range(column_start, column_end + 1):
+                for row in range(row_start, row_end + 1):
+                    yield floor, column, row
+
+    def _query_floors(self, room: 'Room') -> Iterable[int]:
+        """
+        Andares cujas células podem guardar cômodos que disputam espaço com o cômodo consultado.
+
+        Args:
+            room (Room): O cômodo consultado.
+
+        Returns:
+            Iterable[int]: Todos os andares registrados (escadas) ou o andar do cômodo e SPANNING.
+        """
+
+        return self.floors if room.spans_floors else (room.floor, SPANNING)
+
+    def add(self, room: 'Room') -> int:
+        """
+        Registra um cômodo no índice.
+
+        Args:
+            room (Room): O cômodo (a sua geometria não deve mudar enquanto estiver no índice).
+
+        Returns:
+            int: Posição do cômodo no índice (ordem de inserção).
+        """
+
+        index = len(self.rooms)
+        floor = SPANNING if room.spans_floors else room.floor
+        self.rooms.append(room)
+        self.floors.add(floor)
+        for key in self._keys(room, (floor,)):
+            self.cells.setdefault(key, []).append(index)
+        return index
+
+    def nearby(self, room: 'Room', margin: float = 0.0) -> Set[int]:
+        """
+        Lista os cômodos do índice cujas células encostam no retângulo do cômodo (ampliado pela
+        margem), no mesmo andar (ou em qualquer um, para escadas). É um superconjunto dos cômodos
+        que o sobrepõem ou que estão a até `margin` metros dele em um andar em comum.
+
+        Args:
+            room (Room): O cômodo consultado (não precisa estar no índice).
+            margin (float): Distância adicional considerada.
+
+        Returns:
+            Set[int]: Posições dos cômodos candidatos.
+        """
+
+        found: Set[int] = set()
+        for key in self._keys(room, self._query_floors(room), margin):
+            found.update(self.cells.get(key, ()))
+        return found
+
+    def first_overlap(self, room: 'Room') -> Optional['Room']:
+        """
+        Procura um cômodo do índice sobreposto ao cômodo informado (ver overlap).
+
+        Args:
+            room (Room): O cômodo consultado.
+
+        Returns:
+            Optional[Room]: Um cômodo sobreposto, ou None se não houver.
+        """
+
+        # Um cômodo em várias células pode ser testado mais de uma vez; o teste é mais barato que a deduplicação
+        cells, rooms = self.cells, self.rooms
+        for key in self._keys(room, self._query_floors(room)):
+            for index in cells.get(key, ()):
+                if overlap(room, rooms[index]):
+                    return rooms[index]
+        return None
+
+    def overlaps(self, room: 'Room') -> bool:
+        """
+        Verifica se o cômodo sobrepõe algum cômodo do índice (ver overlap).
+
+        Args:
+            room (Room): O cômodo consultado.
+
+        Returns:
+            bool: True se houver sobreposição, False caso contrário.
+        """
+
+        return self.first_overlap(room) is not None
+
+
+def nearby_pairs(rooms: Sequence['Room'], margin: float = 0.0) -> Iterator[Tuple[int, int]]:
+    """
+    Percorre, sem repetição, os pares (i < j) de cômodos cujas células encostam (ver
+    SpatialIndex.nearby): um superconjunto dos pares sobrepostos ou a até `margin` metros.
+    Com poucos cômodos, percorre todos os pares.
+
+    Args:
+        rooms (Sequence[Room]): Os cômodos.
+        margin (float): Distância adicional considerada.
+
+    Returns:
+        Iterator[Tuple[int, int]]: Índices dos pares candidatos.
+    """
+
+    if len(rooms) < MIN_INDEXED_ROOMS:
+        for index1 in range(len(rooms)):
+            for index2 in range(index1 + 1, len(rooms)):
+                yield index1, index2
+        return
+
+    index = SpatialIndex(cell_size_for(rooms) + margin)
+    for room in rooms:
+        index.add(room)
+
+    for index1, room in enumerate(rooms):
+        for index2 in sorted(index.nearby(room, margin)):
+            if index2 > index1:
+                yield index1, index2
+
+
+def overlapping_pairs(rooms: Sequence['Room']) -> List[Tuple[int, int]]:
+    """
+    Lista os pares (i < j) de cômodos que se sobrepõem em algum andar (ver overlap).
+
+    Args:
+        rooms (Sequence[Room]): Os cômodos.
+
+    Returns:
+        List[Tuple[int, int]]: Índices dos pares sobrepostos, em ordem.
+    """
+
+    return [(index1, index2) for index1, index2 in nearby_pairs(rooms) if overlap(rooms[index1], rooms[index2])]
@@ -0,0 +1,393 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from constants import ADJACENCY_TOLERANCE
+from models import FloorPlan
+from nsga2 import rank_population
+
+# Nomes das características usadas pelo modelo substituto, na ordem das colunas de plan_features
+FEATURES = (
+    "bias", "overlaps", "out_of_bounds", "missing_rooms", "valid",
+    "area_utilization", "near_walls", "near_walls_external", "staircase", "adjacent_pairs",
+    "floor_imbalance", "rooms",
+)
+
+# Características multiplicadas pela validade: plantas inválidas só recebem as penalidades
+_VALID_ONLY = slice(5, None)
+
+# Contagens de violações (sobreposições, cômodos fora dos limites e faltantes), exatas
+_VIOLATIONS = slice(1, 4)
+
+
+def _room_arrays(plans: List[FloorPlan]) -> Tuple[np.ndarray, ...]:
+    """
+    Monta os arrays (plantas, cômodos) com a geometria dos cômodos, completados com cômodos vazios.
+
+    Args:
+        plans (List[FloorPlan]): As plantas.
+
+    Returns:
+        Tuple[np.ndarray, ...]: x, y, largura, comprimento, andar, máscara de cômodos presentes,
+            máscara de escadas e máscara de salas de estar e cozinhas.
+    """
+
+    max_rooms = max(max((len(plan.rooms) for plan in plans), default=0), 1)
+    geometry = np.zeros((len(plans), max_rooms, 5))
+    present = np.zeros((len(plans), max_rooms), dtype=bool)
+    stairs = np.zeros((len(plans), max_rooms), dtype=bool)
+    external = np.zeros((len(plans), max_rooms), dtype=bool)
+
+    for index, plan in enumerate(plans):
+        count = len(plan.rooms)
+        if count:
+            geometry[index, :count] = [(room.x, room.y, room.width, room.length, room.floor) for room in plan.rooms]
+            stairs[index, :count] = [room.type == "Escadas" for room in plan.rooms]
+            external[index, :count] = [room.type in ("Sala de Estar", "Cozinha") for room in plan.rooms]
+        present[index, :count] = True
+
+    x, y, width, length, floor = np.moveaxis(geometry, -1, 0)
+    return x, y, width, length, floor, present, stairs, external
+
+
+def _candidate_pairs(
+    x: np.ndarray, y: np.ndarray, right: np.ndarray, top: np.ndarray, floor: np.ndarray,
+    present: np.ndarray, stairs: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Lista, sem repetição, os pares de cômodos que podem se sobrepor ou se encostar: os que dividem
+    alguma célula de uma grade uniforme por planta e andar (como em spatial_index.SpatialIndex, mas
+    vetorizada para o lote inteiro), com os retângulos ampliados por ADJACENCY_TOLERANCE. Assim, o
+    custo acompanha o número de cômodos vizinhos, e não o quadrado do número de cômodos.
+
+    Args:
+        x, y, right, top, floor (np.ndarray): Arrays (plantas, cômodos) com a geometria dos cômodos.
+        present (np.ndarray): Máscara de cômodos presentes.
+        stairs (np.ndarray): Máscara de escadas (registradas em todos os andares da planta).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Planta, primeiro e segundo cômodo (i < j) de cada par.
+    """
+
+    plans, rooms = x.shape
+    margin = ADJACENCY_TOLERANCE
+
+    # Lado das células de cada planta: a média do maior lado dos cômodos (ver spatial_index.cell_size_for)
+    sides = np.where(present, np.maximum(right - x, top - y), 0).sum(axis=1)
+    size = np.maximum(sides / np.maximum(present.sum(axis=1), 1), 1.0)[:, None]
+    column_start = np.floor((x - margin) / size).astype(np.intp)
+    row_start = np.floor((y - margin) / size).astype(np.intp)
+    columns = np.floor((right + margin) / size).astype(np.intp) - column_start + 1
+    rows = np.floor((top + margin) / size).astype(np.intp) - row_start + 1
+    floors = np.where(present, floor, 0).max(axis=1).astype(np.intp) + 1
+    first_floor = np.where(stairs, 0, floor).astype(np.intp)
+    floor_count = np.where(stairs, floors[:, None], 1)
+
+    # Uma entrada por cômodo e célula coberta
+    counts = np.where(present, columns * rows * floor_count, 0).ravel()
+    owner = np.repeat(np.arange(plans * rooms), counts)
+    local = np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+    cell_rows, cell_columns = rows.ravel()[owner], columns.ravel()[owner]
+    row = row_start.ravel()[owner] + local % cell_rows
+    column = column_start.ravel()[owner] + local // cell_rows % cell_columns
+    level = first_floor.ravel()[owner] + local // (cell_rows * cell_columns)
+
+    # Ordena as entradas por célula (e por cômodo dentro da célula) e forma os pares de cada célula
+    order = np.lexsort((owner, row, column, level, owner // rooms))
+    owner, row, column, level = owner[order], row[order], column[order], level[order]
+    new_cell = np.ones(len(owner), dtype=bool)
+    new_cell[1:] = (
+        (owner[1:] // rooms != owner[:-1] // rooms) | (level[1:] != level[:-1]) |
+        (column[1:] != column[:-1]) | (row[1:] != row[:-1])
+    )
+    starts = np.flatnonzero(new_cell)
+    ends = np.append(starts[1:], len(owner))[np.cumsum(new_cell) - 1]
+    partners = ends - np.arange(len(owner)) - 1
+
+    first = np.repeat(np.arange(len(owner)), partners)
+    second = first + 1 + np.arange(len(first)) - np.repeat(np.cumsum(partners) - partners, partners)
+    # Pares que dividem várias células aparecem uma vez por célula
+    pairs = np.sort(owner[first] * (plans * rooms) + owner[second])
+    pairs = pairs[np.append(True, pairs[1:] != pairs[:-1])] if len(pairs) else pairs
+    first, second = np.divmod(pairs, plans * rooms)
+
+    return first // rooms, first % rooms, second % rooms
+
+
+def plan_features(plans: List[FloorPlan]) -> np.ndarray:
+    """
+    Calcula, de forma vetorizada para um lote de plantas, as características geométricas baratas
+    usadas pelo modelo substituto: contagens de violações (como em FloorPlan.evaluate), área
+    ocupada sem a grade, cômodos junto às paredes externas, termo da escada, pares de cômodos
+    encostados (em vez do grafo de cômodos) e desequilíbrio entre andares. Os pares de cômodos
+    vêm de _candidate_pairs, sem comparar todos os pares.
+
+    Args:
+        plans (List[FloorPlan]): As plantas (avaliadas ou não).
+
+    Returns:
+        np.ndarray: Array (plantas, len(FEATURES)).
+    """
+
+    x, y, width, length, floor, present, stairs, external = _room_arrays(plans)
+    house_width = np.array([plan.house_width for plan in plans])[:, None]
+    house_length = np.array([plan.house_length for plan in plans])[:, None]
+    floors = np.array([plan.max_floor for plan in plans])
+    right, top = x + width, y + length
+
+    # Pares candidatos no mesmo andar (as escadas ocupam todos os andares)
+    plan, first, second = _candidate_pairs(x, y, right, top, floor, present, stairs)
+    first, second = (plan, first), (plan, second)
+    shares_floor = (floor[first] == floor[second]) | stairs[first] | stairs[second]
+
+    overlap_x = np.minimum(right[first], right[second]) - np.maximum(x[first], x[second])
+    overlap_y = np.minimum(top[first], top[second]) - np.maximum(y[first], y[second])
+    overlaps = np.bincount(plan[shares_floor & (overlap_x > 0) & (overlap_y > 0)], minlength=len(plans))
+
+    touch_x = (np.abs(right[first] - x[second]) <= ADJACENCY_TOLERANCE) | \
+        (np.abs(right[second] - x[first]) <= ADJACENCY_TOLERANCE)
+    touch_y = (np.abs(top[first] - y[second]) <= ADJACENCY_TOLERANCE) | \
+        (np.abs(top[second] - y[first]) <= ADJACENCY_TOLERANCE)
+    touching = shares_floor & ((touch_x & (overlap_y > 0)) | (touch_y & (overlap_x > 0)))
+    adjacent = np.bincount(plan[touching], minlength=len(plans))
+
+    # Cômodos em andares que a casa não tem contam como fora dos limites (ver FloorPlan.on_valid_floor)
+    off_floor = ~stairs & ((floor < 0) | (floor >= floors[:, None]))
+    out_of_bounds = np.count_nonzero(
+        present & ((x < 0) | (y < 0) | (right > house_width) | (top > house_length) | off_floor), axis=1
+    )
+    missing = np.array([plan.check_all_rooms_present() for plan in plans])
+
+    # Área ocupada (recortada ao envelope), como em evaluate_area_utilization, mas sem a grade
+    clipped = (
+        np.clip(np.minimum(right, house_width) - np.maximum(x, 0), 0, None) *
+        np.clip(np.minimum(top, house_length) - np.maximum(y, 0), 0, None)
+    )
+    occupied = np.where(present & ~off_floor, clipped * np.where(stairs, floors[:, None], 1), 0).sum(axis=1)
+    utilization = occupied / (house_width[:, 0] * house_length[:, 0] * floors) * 100
+
+    # Cômodos junto às paredes externas (margem de 1 metro, como em is_near_external_walls)
+    near = present & ((x <= 1) | (right >= house_width - 1) | (y <= 1) | (top >= house_length - 1))
+
+    # Termo da escada: max(0, raio - distância ao centro), somado sobre as escadas
+    radius = np.array([plan.profile.parameters["staircase_radius"] for plan in plans])[:, None]
+    distance = np.hypot(x + width / 2 - house_width / 2, y + length / 2 - house_length / 2)
+    staircase = np.where(stairs & present, np.maximum(0, radius - distance), 0).sum(axis=1)
+
+    # Desequilíbrio de área entre os andares (os cômodos que ocupam todos os andares não contam)
+    ground = np.where(present & ~stairs & (floor == 0), width * length, 0).sum(axis=1)
+    upper = np.where(present & ~stairs & (floor > 0), width * length, 0).sum(axis=1)
+    imbalance = np.where(floors > 1, np.abs(ground - upper) / np.maximum(ground + upper, 1e-9), 0)
+
+    valid = (overlaps + out_of_bounds + missing == 0).astype(float)
+    features = np.column_stack([
+        np.ones(len(plans)), overlaps, out_of_bounds, missing, valid,
+        utilization, near.sum(axis=1), (near & external).sum(axis=1), staircase, adjacent,
+        imbalance, present.sum(axis=1),
+    ]).astype(float)
+    features[:, _VALID_ONLY] *= valid[:, None]
+
+    return features
+
+
+def rank_correlation(predicted: np.ndarray, actual: np.ndarray) -> float:
+    """
+    Correlação de postos (Spearman) entre a previsão e o fitness real.
+
+    Args:
+        predicted (np.ndarray): Valores previstos.
+        actual (np.ndarray): Valores reais.
+
+    Returns:
+        float: Correlação entre -1 e 1 (0 se algum dos lados for constante ou houver menos de 3 valores).
+    """
+
+    if len(actual) < 3:
+        return 0.0
+
+    ranks1 = np.argsort(np.argsort(predicted)).astype(float)
+    ranks2 = np.argsort(np.argsort(actual)).astype(float)
+    if ranks1.std() == 0 or ranks2.std() == 0:
+        return 0.0
+
+    return float(np.corrcoef(ranks1, ranks2)[0, 1])
+
+
+class SurrogateModel:
+    def __init__(self, ridge: float = 1.0, decay: float = 0.98, min_samples: int = 100):
+        """
+        Modelo substituto do fitness: regressão ridge sobre as características de plan_features,
+        treinada de forma incremental com as avaliações completas já feitas. Guarda apenas as
+        equações normais (XᵀX e XᵀY), com esquecimento exponencial para acompanhar a população.
+        Y tem uma coluna para o fitness e uma para cada objetivo ativo do perfil (ver
+        FloorPlan.objectives), previstos juntos com a mesma matriz XᵀX.
+
+        Args:
+            ridge (float): Regularização da regressão.
+            decay (float): Fator aplicado às equações normais a cada lote observado.
+            min_samples (int): Amostras necessárias antes de o modelo ser usado na triagem.
+        """
+
+        size = len(FEATURES)
+        self.ridge: float = ridge
+        self.decay: float = decay
+        self.min_samples: int = min_samples
+        self.samples: int = 0
+        self._gram = np.zeros((size, size))
+        self._moments: Optional[np.ndarray] = None  # (características, 1 + objetivos), criado no primeiro lote
+        self.weights: Optional[np.ndarray] = None
+
+    @property
+    def ready(self) -> bool:
+        """
+        Indica se o modelo já viu amostras suficientes para a triagem.
+
+        Returns:
+            bool: True se o modelo pode ser usado.
+        """
+
+        return self.weights is not None and self.samples >= self.min_samples
+
+    def observe(self, plans: List[FloorPlan], features: Optional[np.ndarray] = None) -> None:
+        """
+        Incorpora as avaliações completas de um lote de plantas e reajusta os pesos.
+
+        Args:
+            plans (List[FloorPlan]): Plantas já avaliadas.
+            features (Optional[np.ndarray]): Características já calculadas (opcional).
+        """
+
+        if not plans:
+            return
+
+        features = plan_features(plans) if features is None else features
+        targets = np.array([[plan.fitness, *plan.objectives()] for plan in plans], dtype=float)
+        if self._moments is None:
+            self._moments = np.zeros((len(FEATURES), targets.shape[1]))
+
+        self._gram = self.decay * self._gram + features.T @ features
+        self._moments = self.decay * self._moments + features.T @ targets
+        self.samples += len(plans)
+        self.weights = np.linalg.solve(self._gram + self.ridge * np.eye(len(FEATURES)), self._moments)
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """
+        Prevê o fitness a partir das características.
+
+        Args:
+            features (np.ndarray): Array (plantas, len(FEATURES)).
+
+        Returns:
+            np.ndarray: Fitness previsto de cada planta.
+        """
+
+        return features @ self.weights[:, 0]
+
+    def predict_objectives(self, features: np.ndarray) -> np.ndarray:
+        """
+        Prevê os objetivos ativos do perfil a partir das características.
+
+        Args:
+            features (np.ndarray): Array (plantas, len(FEATURES)).
+
+        Returns:
+            np.ndarray: Array (plantas, objetivos) com os objetivos previstos.
+        """
+
+        return features @ self.weights[:, 1:]
+
+
+class SurrogateScreen:
+    def __init__(
+        self, fraction: float, audit_fraction: float = 0.1, model: Optional[SurrogateModel] = None,
+        mode: str = "weighted"
+    ):
+        """
+        Triagem dos filhos pelo modelo substituto: apenas a fração mais promissora (e uma pequena
+        amostra aleatória das demais, usada para medir a precisão do modelo e evitar que ele se
+        feche em um único tipo de planta) recebe a avaliação completa.
+
+        No modo "weighted", os filhos são ordenados pelo fitness previsto. No modo "pareto", pela
+        ordem do NSGA-II (nsga2.rank_population) aplicada aos objetivos previstos e às violações,
+        que as características contam exatamente: frente prevista e, dentro dela, aglomeração.
+
+        Args:
+            fraction (float): Fração dos filhos avaliada por completo (entre 0 e 1).
+            audit_fraction (float): Fração dos filhos descartados que é avaliada mesmo assim.
+            model (Optional[SurrogateModel]): Modelo substituto (por padrão, um novo).
+            mode (str): Modo de otimização do ciclo, "weighted" ou "pareto".
+        """
+
+        if not 0 < fraction <= 1:
+            raise ValueError("A fração avaliada deve estar entre 0 (exclusive) e 1")
+
+        self.mode: str = mode
+        self.fraction: float = fraction
+        self.audit_fraction: float = audit_fraction
+        self.model: SurrogateModel = model if model is not None else SurrogateModel()
+        self.last_stats: Dict[str, float] = {}
+
+    def select(
+        self, candidates: List[FloorPlan], rng
+    ) -> Tuple[List[FloorPlan], Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Escolhe os filhos que serão avaliados por completo.
+
+        Args:
+            candidates (List[FloorPlan]): Filhos ainda não avaliados.
+            rng: Gerador aleatório (módulo random) usado para sortear a amostra de auditoria.
+
+        Returns:
+            Tuple[List[FloorPlan], Optional[np.ndarray], Optional[np.ndarray]]: Os filhos escolhidos,
+                na ordem original, a previsão do modelo para eles (o fitness ou, no modo "pareto",
+                a posição prevista com o sinal trocado) e as suas características, a serem
+                repassadas a SurrogateModel.observe após a avaliação (ambas None se o modelo ainda
+                não estiver pronto).
+        """
+
+        if not self.model.ready or self.fraction >= 1 or not candidates:
+            return candidates, None, None
+
+        features = plan_features(candidates)
+        if self.mode == "pareto":
+            order = rank_population(self.model.predict_objectives(features), features[:, _VIOLATIONS].sum(axis=1))
+            predicted = np.empty(len(candidates))
+            predicted[order] = -np.arange(len(candidates), dtype=float)
+        else:
+            predicted = self.model.predict(features)
+            order = np.argsort(-predicted)
+        keep = max(1, int(round(len(candidates) * self.fraction)))
+        rejected = order[keep:].tolist()
+        audit = rng.sample(rejected, min(len(rejected), int(round(len(rejected) * self.audit_fraction))))
+        chosen = np.sort(np.concatenate([order[:keep], np.array(audit, dtype=int)]))
+
+        return [candidates[index] for index in chosen], predicted[chosen], features[chosen]
+
+    def record(self, plans: List[FloorPlan], candidates: int, predicted: Optional[np.ndarray]) -> None:
+        """
+        Registra o resultado de uma triagem: a precisão do modelo é medida com as previsões feitas
+        antes da avaliação completa (plantas escolhidas e amostra de auditoria), comparadas ao
+        fitness real ou, no modo "pareto", à ordem do NSGA-II das plantas avaliadas. A correlação
+        só aparece nas estatísticas quando houve triagem.
+
+        Args:
+            plans (List[FloorPlan]): Filhos escolhidos, já avaliados.
+            candidates (int): Número de filhos antes da triagem.
+            predicted (Optional[np.ndarray]): Previsão do modelo para os filhos escolhidos.
+        """
+
+        self.last_stats = {
+            "surrogate_fraction": len(plans) / candidates if candidates else 1.0,
+            "surrogate_samples": self.model.samples,
+        }
+        if predicted is None:
+            return
+
+        if self.mode == "pareto":
+            objectives = np.array([plan.objectives() for plan in plans], dtype=float)
+            violations = np.array([plan.constraint_violation for plan in plans], dtype=float)
+            actual = np.empty(len(plans))
+            actual[rank_population(objectives, violations)] = -np.arange(len(plans), dtype=float)
+        else:
+            actual = np.array([plan.fitness for plan in plans])
+        self.last_stats["surrogate_rank_correlation"] = rank_correlation(predicted, actual)
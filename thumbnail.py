@@ -0,0 +1,229 @@
+import struct
+import zlib
+from typing import TYPE_CHECKING, List, Sequence
+
+import numpy as np
+
+from render import RenderGeometry, room_colors
+
+if TYPE_CHECKING:
+    from models import FloorPlan
+
+# Cores (RGB) do fundo, das paredes e das portas
+BACKGROUND = (255, 255, 255)
+WALL = (40, 40, 40)
+DOOR = (165, 42, 42)
+
+# Índices dessas cores na paleta (0 é o fundo); os rótulos da geometria vêm em seguida
+WALL_INDEX, DOOR_INDEX, FIRST_LABEL = 1, 2, 3
+
+# Pixels entre os andares (colunas) e entre as plantas (linhas) de uma miniatura
+GAP = 2
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _pixel_boxes(items: np.ndarray, scales: np.ndarray, heights: np.ndarray, widths: np.ndarray) -> np.ndarray:
+    """
+    Converte os retângulos de uma camada inteira (todas as plantas e andares) em intervalos de
+    pixels nas imagens das plantas, com pelo menos um pixel de lado. Cada andar ocupa um painel
+    da imagem, deslocado para a direita.
+
+    Args:
+        items (np.ndarray): Itens (render.ITEM_DTYPE).
+        scales (np.ndarray): Pixels por metro de cada planta.
+        heights (np.ndarray): Altura, em pixels, dos andares de cada planta.
+        widths (np.ndarray): Largura, em pixels, dos andares de cada planta.
+
+    Returns:
+        np.ndarray: Array (itens, 4) com x0, y0, x1 e y1 (exclusivos) de cada retângulo.
+    """
+
+    plan = items["plan"]
+    scale, height, width = scales[plan], heights[plan], widths[plan]
+
+    x0 = np.clip(np.floor(items["x"] * scale), 0, width - 1)
+    y0 = np.clip(np.floor(items["y"] * scale), 0, height - 1)
+    x1 = np.clip(np.ceil((items["x"] + items["width"]) * scale), x0 + 1, width)
+    y1 = np.clip(np.ceil((items["y"] + items["length"]) * scale), y0 + 1, height)
+    left = items["floor"] * (width + GAP)
+
+    return np.stack([x0 + left, y0, x1 + left, y1], axis=1).astype(int)
+
+
+def palette(geometry: RenderGeometry) -> np.ndarray:
+    """
+    Paleta RGB das imagens de índices: fundo, parede, porta e a cor de cada rótulo da geometria.
+
+    Args:
+        geometry (RenderGeometry): A geometria (define a tabela de rótulos).
+
+    Returns:
+        np.ndarray: Array (cores, 3), uint8.
+    """
+
+    colors = np.round(room_colors(geometry)[:, :3] * 255).astype(np.uint8)
+    return np.concatenate([np.array([BACKGROUND, WALL, DOOR], dtype=np.uint8), colors])
+
+
+def colorize(canvas: np.ndarray, colors: np.ndarray) -> np.ndarray:
+    """
+    Aplica a paleta a uma imagem de índices. As cores são empacotadas em inteiros de 32 bits,
+    de modo que a consulta é um único numpy.take sobre a imagem.
+
+    Args:
+        canvas (np.ndarray): Imagem de índices (altura, largura).
+        colors (np.ndarray): Paleta (cores, 3), uint8.
+
+    Returns:
+        np.ndarray: Imagem (altura, largura, 3), uint8.
+    """
+
+    packed = np.zeros((len(colors), 4), dtype=np.uint8)
+    packed[:, :3] = colors
+    rgba = packed.view(np.uint32).ravel().take(canvas).view(np.uint8).reshape(canvas.shape + (4,))
+    return np.ascontiguousarray(rgba[..., :3])
+
+
+def _plan_canvases(geometry: RenderGeometry, size: int) -> List[np.ndarray]:
+    """
+    Pinta a imagem de índices (ver palette) de cada planta, com os andares lado a lado. Cada
+    cômodo é pintado com a cor da parede e o seu interior com a cor do tipo, deixando uma parede
+    de um pixel no contorno, e as portas são pintadas por cima. As coordenadas em pixels de todos
+    os itens são calculadas de uma vez; cada retângulo é então uma atribuição escalar a uma fatia.
+
+    Args:
+        geometry (RenderGeometry): Geometria das plantas.
+        size (int): Tamanho, em pixels, do maior lado de cada andar.
+
+    Returns:
+        List[np.ndarray]: Uma imagem de índices por planta.
+    """
+
+    house_width, house_length, floors = geometry.envelopes.T
+    scales = size / np.maximum(np.maximum(house_width, house_length), 1e-9)
+    heights = np.maximum(np.round(house_length * scales), 1).astype(int)
+    widths = np.maximum(np.round(house_width * scales), 1).astype(int)
+    floors = np.maximum(floors, 1).astype(int)
+
+    canvases = [
+        np.zeros((height, count * width + (count - 1) * GAP), dtype=np.uint16)
+        for height, width, count in zip(heights.tolist(), widths.tolist(), floors.tolist())
+    ]
+
+    for layer in ("rooms", "doors"):
+        items = geometry.layers[layer]
+        items = items[items["floor"] < floors[items["plan"]]]
+        boxes = _pixel_boxes(items, scales, heights, widths).tolist()
+        if layer == "rooms":
+            labels = (items["label"] + FIRST_LABEL).tolist()
+            for plan, (x0, y0, x1, y1), label in zip(items["plan"].tolist(), boxes, labels):
+                canvas = canvases[plan]
+                canvas[y0:y1, x0:x1] = WALL_INDEX
+                canvas[y0 + 1:y1 - 1, x0 + 1:x1 - 1] = label
+        else:
+            for plan, (x0, y0, x1, y1) in zip(items["plan"].tolist(), boxes):
+                canvases[plan][y0:y1, x0:x1] = DOOR_INDEX
+
+    return canvases
+
+
+def plan_thumbnails(geometry: RenderGeometry, size: int = 128) -> List[np.ndarray]:
+    """
+    Gera a miniatura de cada planta da geometria: os andares lado a lado, com o maior lado da
+    casa ocupando `size` pixels.
+
+    Args:
+        geometry (RenderGeometry): Geometria das plantas (ver render.RenderGeometry).
+        size (int): Tamanho, em pixels, do maior lado de cada andar.
+
+    Returns:
+        List[np.ndarray]: Uma imagem RGB (altura, largura, 3), uint8, por planta.
+    """
+
+    colors = palette(geometry)
+    return [colorize(canvas, colors) for canvas in _plan_canvases(geometry, size)]
+
+
+def _stack(canvases: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Empilha imagens de índices, separadas por GAP pixels de fundo; as mais estreitas são
+    completadas com fundo.
+
+    Args:
+        canvases (Sequence[np.ndarray]): Imagens de índices.
+
+    Returns:
+        np.ndarray: A imagem resultante.
+    """
+
+    width = max(canvas.shape[1] for canvas in canvases)
+    height = sum(canvas.shape[0] for canvas in canvases) + GAP * (len(canvases) - 1)
+
+    result = np.zeros((height, width), dtype=np.uint16)
+    top = 0
+    for canvas in canvases:
+        result[top:top + canvas.shape[0], :canvas.shape[1]] = canvas
+        top += canvas.shape[0] + GAP
+
+    return result
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    """
+    Monta um bloco PNG: tamanho, tipo, dados e CRC.
+
+    Args:
+        kind (bytes): Tipo do bloco (ex.: b"IHDR").
+        data (bytes): Dados do bloco.
+
+    Returns:
+        bytes: O bloco.
+    """
+
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def encode_png(image: np.ndarray, level: int = 6) -> bytes:
+    """
+    Codifica uma imagem RGB como PNG (8 bits por canal, sem filtros, compressão zlib).
+
+    Args:
+        image (np.ndarray): Imagem (altura, largura, 3), uint8.
+        level (int): Nível de compressão do zlib (0 a 9).
+
+    Returns:
+        bytes: O arquivo PNG.
+    """
+
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    height, width = image.shape[:2]
+
+    # Cada linha começa com o byte do filtro (0, nenhum)
+    rows = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    rows[:, 1:] = image.reshape(height, width * 3)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        PNG_SIGNATURE + _chunk(b"IHDR", header) +
+        _chunk(b"IDAT", zlib.compress(rows.tobytes(), level)) + _chunk(b"IEND", b"")
+    )
+
+
+def thumbnail_png(plans: Sequence['FloorPlan'], size: int = 128) -> bytes:
+    """
+    Gera um PNG com as miniaturas de várias plantas, uma linha por planta e os andares lado a lado.
+
+    Args:
+        plans (Sequence[FloorPlan]): As plantas.
+        size (int): Tamanho, em pixels, do maior lado de cada andar.
+
+    Returns:
+        bytes: O arquivo PNG.
+    """
+
+    if not plans:
+        raise ValueError("Nenhuma planta para a miniatura")
+
+    geometry = RenderGeometry(plans)
+    return encode_png(colorize(_stack(_plan_canvases(geometry, size)), palette(geometry)))
@@ -1,4 +1,9 @@
-from typing import List, Tuple
+import unicodedata
+from itertools import islice
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
 
 LETTER_TABLE = {
     'a': 1, 'e': 3, 'i': 2, 'n': 1, 'r': 14, 'v': 13, 'y': 10,
@@ -7,6 +12,29 @@ LETTER_TABLE = {
     'd': 4, 'h': 5, 'm': 6, 'q': 7, 'u': 8, 'w': 9
 }
 
+# Program options, indexed by the corresponding remainder
+HOUSE_TYPES = ("2 andares e uma laje", "2 andares e um sótão", "2 andares e um porão")
+SPECIAL_ROOMS = ("Sala de Música", "Sala de Ginástica", "Escritório", "Sala de Jogos")
+ROOM_COUNTS = ((3, 2, 2), (2, 3, 2), (3, 3, 1), (2, 3, 1))  # Bedrooms, bathrooms and closets
+
+# Divisors applied to the letter sums of the first three name parts
+DIVISORS = (3, 4, 4)
+
+
+def normalize_name(full_name: str) -> str:
+    """
+    Lowercase the name and strip accents, so that "José" is scored as "jose".
+    Characters without an ASCII decomposition (which score zero anyway) are dropped.
+
+    Args:
+        full_name (str): The name (or several names) to be normalized.
+
+    Returns:
+        str: The normalized name.
+    """
+    # Decompõe os caracteres acentuados e descarta as marcas combinantes (não ASCII)
+    return unicodedata.normalize("NFKD", full_name.lower()).encode("ascii", "ignore").decode("ascii")
+
 
 def calculate_characteristics(full_name: str) -> Tuple[int, int, int]:
     """
@@ -18,8 +46,8 @@ def calculate_characteristics(full_name: str) -> Tuple[int, int, int]:
     Returns:
         Tuple[int, int, int]: A tuple containing three integers representing the characteristics.
     """
-    # Converte o nome completo para minúsculas e divide em partes
-    names: List[str] = full_name.lower().split()
+    # Converte o nome completo para minúsculas (sem acentos) e divide em partes
+    names: List[str] = normalize_name(full_name).split()
     results: List[int] = []
 
     # Calcula a soma dos valores das letras para cada parte do nome
@@ -33,3 +61,118 @@ def calculate_characteristics(full_name: str) -> Tuple[int, int, int]:
     remainder3 = results[2] % 4 if len(results) > 2 else 0
 
     return remainder1, remainder2, remainder3
+
+
+def characteristics_to_program(remainder1: int, remainder2: int, remainder3: int) -> Tuple[str, str, int, int, int]:
+    """
+    Map the name characteristics to the house program.
+
+    Args:
+        remainder1 (int): Remainder that defines the house type.
+        remainder2 (int): Remainder that defines the special room.
+        remainder3 (int): Remainder that defines the number of bedrooms, bathrooms and closets.
+
+    Returns:
+        Tuple[str, str, int, int, int]: House type, special room, bedrooms, bathrooms and closets.
+    """
+    bedrooms, bathrooms, closets = ROOM_COUNTS[remainder3]
+
+    return HOUSE_TYPES[remainder1], SPECIAL_ROOMS[remainder2], bedrooms, bathrooms, closets
+
+
+def _letter_values() -> 'np.ndarray':
+    """
+    Build the byte-indexed lookup table of letter values (zero for any other byte).
+
+    Returns:
+        np.ndarray: Array of 256 letter values.
+    """
+    import numpy as np
+
+    values = np.zeros(256, dtype=np.int64)
+    for letter, value in LETTER_TABLE.items():
+        values[ord(letter)] = value
+    return values
+
+
+def bulk_characteristics(names: Iterable[str]) -> 'np.ndarray':
+    """
+    Vectorized calculate_characteristics for many names at once.
+
+    The whole batch is normalized as a single string; the first three parts of every name are
+    then concatenated into a single byte buffer, scored with a NumPy lookup table and summed
+    per part with a cumulative sum.
+
+    Args:
+        names (Iterable[str]): The full names to be analyzed (without NUL characters).
+
+    Returns:
+        np.ndarray: Array (n, 3) with the three remainders of each name.
+    """
+    import numpy as np
+
+    names = list(names)
+    if not names:
+        return np.zeros((0, 3), dtype=np.int64)
+
+    parts: List[str] = []
+    for name in normalize_name("\0".join(names)).split("\0"):
+        name_parts = name.split()[:3]
+        parts.extend(name_parts + [""] * (3 - len(name_parts)))
+
+    lengths = np.fromiter(map(len, parts), dtype=np.int64, count=len(parts))
+    buffer = np.frombuffer("".join(parts).encode("ascii"), dtype=np.uint8)
+
+    cumulative = np.concatenate(([0], np.cumsum(_letter_values()[buffer])))
+    ends = np.cumsum(lengths)
+    sums = (cumulative[ends] - cumulative[ends - lengths]).reshape(-1, 3)
+
+    return sums % np.array(DIVISORS)
+
+
+def bulk_programs(characteristics: 'np.ndarray') -> Tuple['np.ndarray', ...]:
+    """
+    Vectorized characteristics_to_program.
+
+    Args:
+        characteristics (np.ndarray): Array (n, 3) returned by bulk_characteristics.
+
+    Returns:
+        Tuple[np.ndarray, ...]: Arrays of house types, special rooms, bedrooms, bathrooms and closets.
+    """
+    import numpy as np
+
+    counts = np.array(ROOM_COUNTS)[characteristics[:, 2]]
+
+    return (
+        np.array(HOUSE_TYPES)[characteristics[:, 0]],
+        np.array(SPECIAL_ROOMS)[characteristics[:, 1]],
+        counts[:, 0],
+        counts[:, 1],
+        counts[:, 2],
+    )
+
+
+def iter_programs_from_file(
+    path: str, chunk_size: int = 100000
+) -> Iterator[Tuple[List[str], Tuple['np.ndarray', ...]]]:
+    """
+    Stream the programs of the names in a text file (one name per line), chunk by chunk,
+    so that files with millions of names never have to fit in memory.
+
+    Args:
+        path (str): Path of the input file (UTF-8). Blank lines are skipped.
+        chunk_size (int): Number of names per chunk.
+
+    Returns:
+        Iterator[Tuple[List[str], Tuple[np.ndarray, ...]]]: The names of each chunk and their
+            program arrays (see bulk_programs).
+    """
+    with open(path, encoding="utf-8") as file:
+        lines = (line.strip() for line in file)
+        names = (line for line in lines if line)
+        while True:
+            chunk = list(islice(names, chunk_size))
+            if not chunk:
+                break
+            yield chunk, bulk_programs(bulk_characteristics(chunk))